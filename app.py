@@ -1,8 +1,15 @@
 import streamlit as st
 import os
 from travel_planner import TravelPlanner
-from map_generator import MapGenerator
+from notifications import notifier, streamlit_sink, ThreadBoundSink
+from metrics import metrics
+import profiling
+from session_store import ContentStore
+from cost_engine import itinerary_costs, what_if_grid, format_range, CostRange, TIERS
+from utils import budget_tier
+import contextlib
 import time
+import uuid
 
 # Page configuration
 st.set_page_config(
@@ -12,21 +19,114 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
+# Initialize session state; payloads live in the shared store, sessions only hold their keys
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+# Planner notifications for this session (the core itself is UI-agnostic); those raised on
+# worker threads, which can't draw on the page, wait here until the script thread flushes them
+if 'notification_sink' not in st.session_state:
+    st.session_state.notification_sink = ThreadBoundSink(streamlit_sink)
 if 'itinerary_generated' not in st.session_state:
     st.session_state.itinerary_generated = False
-if 'itinerary_data' not in st.session_state:
-    st.session_state.itinerary_data = None
-if 'map_data' not in st.session_state:
-    st.session_state.map_data = None
+if 'itinerary_key' not in st.session_state:
+    st.session_state.itinerary_key = None
+if 'map_key' not in st.session_state:
+    st.session_state.map_key = None
+if 'last_timings' not in st.session_state:
+    st.session_state.last_timings = None
+
+@st.cache_resource
+def get_travel_planner():
+    """Process-wide planner, shared by every session and rerun along with its caches and HTTP pool"""
+    return TravelPlanner()
+
+@st.cache_resource
+def get_map_generator():
+    """Process-wide map generator, created the first time someone actually generates a map"""
+    from map_generator import MapGenerator
+    return MapGenerator()
+
+# Session map key for a map too big for the session store; it is re-rendered (or served by the map cache) on display
+MAP_NOT_STORED = 'not-stored'
+
+@st.cache_resource
+def get_session_store():
+    """Process-wide store of itinerary and map payloads, deduplicated across sessions"""
+    store = ContentStore(
+        max_bytes=int(float(os.getenv("SESSION_STORE_MAX_MB", "64")) * 1024 * 1024),
+        ttl=float(os.getenv("SESSION_STORE_TTL", "86400")),
+    )
+    # Exported as travel_planner_session_store{stat="bytes_per_session"} and so on
+    metrics.gauges('session_store', store.stats)
+    return store
+
+@st.cache_resource
+def get_metrics_exporter():
+    """Serve Prometheus metrics on METRICS_PORT, once per process; ``None`` when not configured"""
+    port = os.getenv("METRICS_PORT")
+    return metrics.start_http_server(int(port)) if port else None
+
+def debug_panel_enabled():
+    """The timing panel is shown with METRICS_DEBUG_PANEL=1 or ?debug=1 in the URL"""
+    if os.getenv("METRICS_DEBUG_PANEL", "").lower() in ("1", "true", "yes"):
+        return True
+    return st.query_params.get("debug") == "1"
+
+def display_timings(spans):
+    """Sidebar breakdown of the stages timed during this session's last generation"""
+    
+    with st.expander("⏱️ Timing breakdown", expanded=True):
+        if not spans:
+            st.caption("Generate an itinerary to see where the time goes.")
+            return
+        lines = [
+            f"{'  ' * span['depth']}{span['stage']:<{24 - 2 * span['depth']}} {span['seconds'] * 1000:8.1f} ms"
+            for span in spans if span['seconds'] is not None
+        ]
+        st.code("\n".join(lines), language=None)
+
+def display_store_stats(stats):
+    """Sidebar summary of what the shared session store holds"""
+    
+    st.caption(
+        f"🗄️ Session store: {stats['bytes'] / 1024:.0f} KB in {stats['entries']} entries, "
+        f"{stats['sessions']} sessions, {stats['bytes_per_session'] / 1024:.1f} KB per session, "
+        f"dedup {stats['dedup_ratio']:.1f}x, {stats['evictions']} evicted"
+    )
+
+def load_session_results():
+    """Fetch this session's itinerary and map from the shared store
+    
+    Returns ``(itinerary_data, map_data)``. If the itinerary was evicted the
+    session is reset; an evicted map is re-rendered (or served by the map cache).
+    """
+    store = get_session_store()
+    itinerary_data = store.get_itinerary(st.session_state.itinerary_key)
+    if itinerary_data is None:
+        st.session_state.itinerary_generated = False
+        st.session_state.itinerary_key = None
+        st.session_state.map_key = None
+        store.forget(st.session_state.session_id)
+        st.info("Your previous itinerary has expired. Please generate it again.")
+        return None, None
+    
+    map_data = store.get_html(st.session_state.map_key)
+    if map_data is None and st.session_state.map_key:
+        with st.spinner("🗺️ Building your map..."):
+            map_data = get_map_generator().generate_map(itinerary_data.get('destination', ''), itinerary_data)
+        st.session_state.map_key = (store.put_html(map_data) or MAP_NOT_STORED) if map_data else None
+        # Storing the map may have pushed the itinerary out; it is at hand, so keep it newest
+        store.put_itinerary(itinerary_data)
+    
+    store.track(st.session_state.session_id, st.session_state.itinerary_key, st.session_state.map_key)
+    return itinerary_data, map_data
 
 def main():
+    get_metrics_exporter()
     st.title("🌍 AI-Powered Travel Planner")
     st.markdown("Plan your perfect trip with AI-generated personalized itineraries!")
-    
-    # Initialize travel planner
-    travel_planner = TravelPlanner()
-    map_generator = MapGenerator()
+    # Messages from geocoding that finished after the previous run
+    st.session_state.notification_sink.flush()
     
     # Sidebar for user inputs
     with st.sidebar:
@@ -99,6 +199,10 @@ def main():
             type="primary",
             use_container_width=True
         )
+        
+        if debug_panel_enabled():
+            display_timings(st.session_state.last_timings)
+            display_store_stats(get_session_store().stats())
     
     # Main content area
     if generate_button:
@@ -110,11 +214,14 @@ def main():
             st.warning("Please select at least one interest to personalize your itinerary.")
             return
         
-        # Show loading state
-        with st.spinner("🤖 AI is crafting your perfect itinerary..."):
-            try:
-                # Generate itinerary
-                itinerary_data = travel_planner.generate_itinerary(
+        try:
+            # Time every stage of this request for the debug panel; ?profile=1 asks for a profile
+            # too, which is only taken when the server runs with PROFILE_REQUESTS=query
+            profile = profiling.requested() if st.query_params.get("profile") == "1" else contextlib.nullcontext()
+            with profile, metrics.trace() as spans:
+                # Generate itinerary, rendering each day as soon as it is complete
+                itinerary_data = stream_itinerary(
+                    get_travel_planner(),
                     destination=destination,
                     budget=budget,
                     num_people=num_people,
@@ -124,29 +231,138 @@ def main():
                 
                 if itinerary_data:
                     # Generate map data
-                    map_data = map_generator.generate_map(destination, itinerary_data)
-                    
-                    # Store in session state
-                    st.session_state.itinerary_data = itinerary_data
-                    st.session_state.map_data = map_data
-                    st.session_state.itinerary_generated = True
-                    
-                    st.success("✅ Your personalized itinerary is ready!")
-                    time.sleep(1)
-                    st.rerun()
-                else:
-                    st.error("Failed to generate itinerary. Please try again.")
-                    
-            except Exception as e:
-                st.error(f"An error occurred: {str(e)}")
+                    with st.spinner("🗺️ Building your map..."):
+                        map_generator = get_map_generator()
+                        with map_generator.shared_deadline():
+                            itinerary_data = map_generator.optimize_routes(destination, itinerary_data)
+                            map_data = map_generator.generate_map(destination, itinerary_data)
+            st.session_state.notification_sink.flush()
+            st.session_state.last_timings = spans
+            if os.getenv("METRICS_FILE"):
+                metrics.write_file(os.getenv("METRICS_FILE"))
+            
+            if itinerary_data:
+                # Store the payloads in the shared store; the session keeps only their keys
+                # The map goes in first, so if the store is full it is evicted before the itinerary:
+                # a missing map is simply re-rendered, a missing itinerary means generating again
+                store = get_session_store()
+                map_key = (store.put_html(map_data) or MAP_NOT_STORED) if map_data else None
+                itinerary_key = store.put_itinerary(itinerary_data)
+                if itinerary_key is None:
+                    st.error("This itinerary is too large to keep. Please try a shorter trip.")
+                    return
+                st.session_state.itinerary_key = itinerary_key
+                st.session_state.map_key = map_key
+                st.session_state.itinerary_generated = True
+                store.track(st.session_state.session_id, st.session_state.itinerary_key, st.session_state.map_key)
+                
+                st.success("✅ Your personalized itinerary is ready!")
+                time.sleep(1)
+                st.rerun()
+            else:
+                st.error("Failed to generate itinerary. Please try again.")
+                
+        except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
     
     # Display results if available
-    if st.session_state.itinerary_generated and st.session_state.itinerary_data:
-        display_itinerary(st.session_state.itinerary_data, st.session_state.map_data)
+    if st.session_state.itinerary_generated and st.session_state.itinerary_key:
+        itinerary_data, map_data = load_session_results()
+        if itinerary_data:
+            display_itinerary(itinerary_data, map_data)
+
+def stream_itinerary(travel_planner, destination, budget, num_people, num_days, interests):
+    """Render each day while the itinerary is generated and return the finished plan"""
+    
+    st.subheader("🤖 AI is crafting your perfect itinerary...")
+    live_slot = st.empty()
+    live_area = live_slot.container()
+    itinerary_data = None
+    
+    for event in travel_planner.stream_itinerary(destination, budget, num_people, num_days, interests):
+        if event.kind == 'reset':
+            # The days shown so far are being replaced; a new container clears them
+            live_area = live_slot.container()
+        elif event.kind == 'day':
+            with live_area:
+                display_day(event.key, event.value)
+        elif event.kind == 'done':
+            itinerary_data = event.value
+    
+    return itinerary_data
+
+def display_day(day, activities, route=None, cost=None):
+    """Display one day of the itinerary"""
+    
+    with st.expander(f"🗓️ {day}", expanded=True):
+        if route and route['saved_km'] > 0:
+            st.caption(f"🚶 Route: {route['optimized_km']:.1f} km, {route['saved_km']:.1f} km shorter than the original order")
+        if cost and cost['priced']:
+            st.caption(f"💵 Activities: {format_range(cost['cost'])} per person")
+        
+        for activity in activities:
+            # Main activity header
+            st.markdown(f"**📍 {activity['name']}**")
+            st.markdown(f"⏰ **Time:** {activity.get('time', 'Flexible timing')}")
+            
+            # Detailed description
+            st.markdown(f"📝 **Description:** {activity.get('description', 'No description available')}")
+            
+            # Specific places to visit
+            if activity.get('specific_places'):
+                st.markdown("🏛️ **Places to Visit:**")
+                for place in activity['specific_places']:
+                    st.markdown(f"   • {place}")
+            
+            # Food items to try
+            if activity.get('food_items'):
+                st.markdown("🍽️ **Famous Food to Try:**")
+                for food in activity['food_items']:
+                    st.markdown(f"   • {food}")
+            
+            # Nearby restaurants
+            if activity.get('nearby_restaurants'):
+                st.markdown("🏪 **Recommended Restaurants:**")
+                for restaurant in activity['nearby_restaurants']:
+                    st.markdown(f"   • {restaurant}")
+            
+            # Cost information
+            if activity.get('estimated_cost'):
+                st.markdown(f"💰 **Estimated cost:** {activity['estimated_cost']}")
+            
+            st.markdown("---")
+
+def display_what_if(itinerary_data, costs):
+    """Compare costs for other budgets, group sizes and trip lengths without regenerating the plan"""
+    
+    grid = what_if_grid(costs if costs['per_person'].high else None, itinerary_data.get('budget'))
+    
+    st.subheader("💵 What If...?")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        plan_tier = budget_tier(itinerary_data.get('budget'))
+        tier = st.selectbox(
+            "Budget", TIERS, index=TIERS.index(plan_tier) if plan_tier in TIERS else 1,
+            format_func=str.capitalize, key="what_if_tier"
+        )
+    with col2:
+        people = st.slider("People", 1, len(grid['people']), int(itinerary_data.get('num_people') or 1), key="what_if_people")
+    with col3:
+        days = st.slider("Days", 1, len(grid['days']), int(itinerary_data.get('num_days') or 1), key="what_if_days")
+    
+    index = (grid['tiers'].index(tier), people - 1, days - 1)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Estimated Total Cost", format_range(CostRange(*grid['estimate'][index])))
+    if grid['itemized'] is not None:
+        with col2:
+            st.metric("Itemized Activities & Food", format_range(CostRange(*grid['itemized'][index])))
 
 def display_itinerary(itinerary_data, map_data):
     """Display the generated itinerary and map"""
     
+    costs = itinerary_costs(itinerary_data)
+    
     # Create tabs for different sections
     tab1, tab2, tab3, tab4 = st.tabs(["📅 Day-by-Day Itinerary", "🗺️ Interactive Map", "🏛️ Famous Places", "📋 Trip Summary"])
     
@@ -155,39 +371,9 @@ def display_itinerary(itinerary_data, map_data):
         
         # Display daily itinerary with enhanced details
         if 'daily_plan' in itinerary_data:
+            routes = itinerary_data.get('route_summary', {}).get('days', {})
             for day, activities in itinerary_data['daily_plan'].items():
-                with st.expander(f"🗓️ {day}", expanded=True):
-                    for activity in activities:
-                        # Main activity header
-                        st.markdown(f"**📍 {activity['name']}**")
-                        st.markdown(f"⏰ **Time:** {activity.get('time', 'Flexible timing')}")
-                        
-                        # Detailed description
-                        st.markdown(f"📝 **Description:** {activity.get('description', 'No description available')}")
-                        
-                        # Specific places to visit
-                        if activity.get('specific_places'):
-                            st.markdown("🏛️ **Places to Visit:**")
-                            for place in activity['specific_places']:
-                                st.markdown(f"   • {place}")
-                        
-                        # Food items to try
-                        if activity.get('food_items'):
-                            st.markdown("🍽️ **Famous Food to Try:**")
-                            for food in activity['food_items']:
-                                st.markdown(f"   • {food}")
-                        
-                        # Nearby restaurants
-                        if activity.get('nearby_restaurants'):
-                            st.markdown("🏪 **Recommended Restaurants:**")
-                            for restaurant in activity['nearby_restaurants']:
-                                st.markdown(f"   • {restaurant}")
-                        
-                        # Cost information
-                        if activity.get('estimated_cost'):
-                            st.markdown(f"💰 **Estimated cost:** {activity['estimated_cost']}")
-                        
-                        st.markdown("---")
+                display_day(day, activities, routes.get(day), costs['days'].get(day))
     
     with tab2:
         st.header("Interactive Map")
@@ -252,9 +438,17 @@ def display_itinerary(itinerary_data, map_data):
             if 'total_estimated_cost' in itinerary_data:
                 st.metric("Estimated Total Cost", itinerary_data['total_estimated_cost'])
             
+            if costs['per_person'].high:
+                st.metric("Itemized Activities & Food", format_range(costs['total']))
+            
+            if itinerary_data.get('route_summary', {}).get('saved_km'):
+                st.metric("Route Distance Saved", f"{itinerary_data['route_summary']['saved_km']:.1f} km")
+            
             interests_text = ", ".join(itinerary_data.get('interests', []))
             st.markdown(f"**Interests:** {interests_text}")
         
+        display_what_if(itinerary_data, costs)
+        
         # Additional trip tips
         if 'travel_tips' in itinerary_data:
             st.subheader("💡 Travel Tips")
@@ -264,9 +458,11 @@ def display_itinerary(itinerary_data, map_data):
         # Reset button
         if st.button("🔄 Plan Another Trip", use_container_width=True):
             st.session_state.itinerary_generated = False
-            st.session_state.itinerary_data = None
-            st.session_state.map_data = None
+            st.session_state.itinerary_key = None
+            st.session_state.map_key = None
+            get_session_store().forget(st.session_state.session_id)
             st.rerun()
 
 if __name__ == "__main__":
-    main()
+    with notifier.scoped(st.session_state.notification_sink.bind()):
+        main()
@@ -0,0 +1,215 @@
+"""Generate itineraries offline from a JSONL or CSV file of trip requests.
+
+    python batch_generate.py requests.jsonl -o itineraries.jsonl --workers 8 --max-in-flight 4
+
+Each input record needs ``destination``, ``budget``, ``num_people``, ``num_days``
+and ``interests`` (a list, or a ``;``-separated string in CSV), plus an optional
+``id`` (the 1-based record number is used otherwise). Results are appended to
+the output as JSONL with per-record timings; a record that can't be read gets
+a result with its ``error`` instead of stopping the run. The output doubles as
+the checkpoint: rerunning with the same output file skips records that already
+succeeded, so an interrupted run picks up where it stopped.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+DEFAULT_BUDGET = "Mid-range ($50-$150/day)"
+
+# Each pool thread (or process) gets its own planner and map generator
+_worker = threading.local()
+
+
+def read_requests(path):
+    """Yield ``(record_id, request, error)`` for each record of a JSONL or CSV file
+
+    ``request`` is ``None`` and ``error`` says why when a record can't be used.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (line for line in f if line.strip())
+        for number, row in enumerate(rows, start=1):
+            if isinstance(row, str):
+                try:
+                    row = json.loads(row)
+                except ValueError as e:
+                    yield str(number), None, f"Invalid JSON: {e}"
+                    continue
+            if not isinstance(row, dict):
+                yield str(number), None, "Record is not a JSON object"
+                continue
+            record_id = str(row.get('id') or number)
+            try:
+                request = normalize_request(row)
+            except ValueError as e:
+                yield record_id, None, str(e)
+                continue
+            yield record_id, request, None
+
+
+def normalize_request(row):
+    """Coerce a raw JSONL/CSV row into generate_itinerary keyword arguments
+
+    Raises ``ValueError`` for a missing destination or non-numeric counts.
+    """
+    destination = row.get('destination')
+    if not isinstance(destination, str) or not destination.strip():
+        raise ValueError("Missing 'destination'")
+    interests = row.get('interests') or []
+    if isinstance(interests, str):
+        interests = [interest.strip() for interest in interests.split(';') if interest.strip()]
+    elif not isinstance(interests, list):
+        raise ValueError(f"'interests' must be a list, got {interests!r}")
+    request = {
+        'destination': destination.strip(),
+        'budget': row.get('budget') or DEFAULT_BUDGET,
+        'interests': interests,
+    }
+    for field in ('num_people', 'num_days'):
+        try:
+            request[field] = int(row.get(field) or 1)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{field}' must be a whole number, got {row.get(field)!r}") from None
+    return request
+
+
+def completed_ids(output_path):
+    """Record ids that already succeeded in a previous run"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # A line cut short by an interrupted run
+            if result.get('ok'):
+                done.add(result['id'])
+    return done
+
+
+def _init_worker(with_map):
+    """Build one planner (and map generator) per worker so HTTP pools and caches are reused"""
+    from travel_planner import TravelPlanner
+    _worker.planner = TravelPlanner()
+    _worker.map_generator = None
+    if with_map:
+        from map_generator import MapGenerator
+        _worker.map_generator = MapGenerator()
+
+
+def process_request(record_id, request):
+    """Generate one itinerary (and map) and return the JSON-ready result"""
+    result = {'id': record_id, 'request': request, 'ok': False, 'timing': {}}
+    start = time.perf_counter()
+    try:
+        itinerary = _worker.planner.generate_itinerary(**request)
+        result['timing']['itinerary_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        result['itinerary'] = itinerary
+        map_generator = _worker.map_generator
+        if map_generator is not None:
+            map_start = time.perf_counter()
+            with map_generator.shared_deadline():
+                itinerary = map_generator.optimize_routes(request['destination'], itinerary)
+                result['itinerary'] = itinerary
+                result['map_html'] = map_generator.generate_map(request['destination'], itinerary)
+            result['timing']['map_ms'] = round((time.perf_counter() - map_start) * 1000, 2)
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['timing']['total_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def run_batch(input_path, output_path, workers=4, max_in_flight=None, executor='thread', with_map=False,
+              progress=None):
+    """Process every pending request; return ``(succeeded, failed, skipped)`` counts
+
+    At most ``max_in_flight`` requests are submitted at once, which bounds
+    concurrent calls to the Hugging Face API regardless of the input size.
+    """
+    max_in_flight = max_in_flight or workers
+    done = completed_ids(output_path)
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    succeeded = failed = skipped = 0
+
+    pool = pool_class(max_workers=workers, initializer=_init_worker, initargs=(with_map,))
+
+    with pool, open(output_path, 'a', encoding='utf-8') as out:
+        pending = set()
+
+        def write(result):
+            nonlocal succeeded, failed
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out.flush()  # Every written line is a checkpoint
+            if result['ok']:
+                succeeded += 1
+            else:
+                failed += 1
+            if progress:
+                progress(result)
+
+        def drain(return_when):
+            finished, still_pending = wait(pending, return_when=return_when)
+            for future in finished:
+                write(future.result())
+            return still_pending
+
+        try:
+            for record_id, request, error in read_requests(input_path):
+                if record_id in done:
+                    skipped += 1
+                    continue
+                if error:
+                    write({'id': record_id, 'request': None, 'ok': False, 'timing': {'total_ms': 0.0}, 'error': error})
+                    continue
+                if len(pending) >= max_in_flight:
+                    pending = drain(FIRST_COMPLETED)
+                pending.add(pool.submit(process_request, record_id, request))
+        finally:
+            # Even if reading the input fails, keep the results of everything already submitted
+            if pending:
+                drain(ALL_COMPLETED)
+
+    return succeeded, failed, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='JSONL or CSV file of trip requests')
+    parser.add_argument('-o', '--output', required=True, help='JSONL output file (also the resume checkpoint)')
+    parser.add_argument('--workers', type=int, default=4, help='pool size (default: 4)')
+    parser.add_argument('--max-in-flight', type=int, help='max requests submitted at once (default: --workers)')
+    parser.add_argument('--executor', choices=('thread', 'process'), default='thread',
+                        help='threads suit the I/O-bound API path, processes the CPU-bound template/map path')
+    parser.add_argument('--with-map', action='store_true', help='also render the map HTML for each itinerary')
+    parser.add_argument('--quiet', action='store_true', help='do not print per-record progress')
+    args = parser.parse_args(argv)
+    # Planner notifications (fallbacks, API errors) go to the log in headless runs
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+
+    def progress(result):
+        status = 'ok' if result['ok'] else f"FAILED ({result['error']})"
+        print(f"{result['id']}: {status} in {result['timing']['total_ms']:.0f} ms", file=sys.stderr)
+
+    start = time.perf_counter()
+    succeeded, failed, skipped = run_batch(
+        args.input, args.output, workers=args.workers, max_in_flight=args.max_in_flight,
+        executor=args.executor, with_map=args.with_map, progress=None if args.quiet else progress
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{succeeded} succeeded, {failed} failed, {skipped} already done in {elapsed:.1f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Measure Streamlit script start-up and rerun latency for app.py.
+
+    python benchmarks/bench_app_rerun.py [--reruns 20]
+
+Uses Streamlit's AppTest harness, so no server or browser is needed. The
+first run includes module imports; reruns toggle an interest checkbox, which
+is what users do most while filling in the sidebar.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run()
+    first_run = time.perf_counter() - start
+
+    samples = []
+    for i in range(args.reruns):
+        checkbox = at.sidebar.checkbox[i % len(at.sidebar.checkbox)]
+        start = time.perf_counter()
+        (checkbox.uncheck() if checkbox.value else checkbox.check()).run()
+        samples.append(time.perf_counter() - start)
+
+    print(f"first run: {first_run * 1000:.1f} ms")
+    print(f"rerun: median {statistics.median(samples) * 1000:.1f} ms, "
+          f"max {max(samples) * 1000:.1f} ms over {len(samples)} reruns")
+
+
+if __name__ == '__main__':
+    main()
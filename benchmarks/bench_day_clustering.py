@@ -0,0 +1,71 @@
+"""Compare geographic day grouping with the old landmark-N-on-day-N layout.
+
+    python benchmarks/bench_day_clustering.py [--places 30 100 300] [--days 7 14 30]
+
+Registers a synthetic destination whose landmarks are scattered over a
+~20 km city, builds template itineraries and reports the planning time and
+the mean straight-line path length between each day's landmarks.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from landmarks_data import register_destination  # noqa: E402
+from route_optimizer import haversine_matrix, path_length  # noqa: E402
+from travel_planner import DAY_SLOTS, TravelPlanner  # noqa: E402
+
+CENTRE = (41.9028, 12.4964)
+
+
+def synthetic_landmarks(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Landmark {i}",
+            "coordinates": [CENTRE[0] + rng.gauss(0, 0.05), CENTRE[1] + rng.gauss(0, 0.07)],
+            "type": "Landmark",
+            "description": "A synthetic point of interest.",
+            "famous_foods": [],
+            "nearby_food_spots": [],
+        }
+        for i in range(count)
+    ]
+
+
+def mean_day_path_km(groups):
+    lengths = []
+    for group in groups:
+        if len(group) > 1:
+            coords = [landmark["coordinates"] for landmark in group]
+            lengths.append(path_length(haversine_matrix(coords), list(range(len(coords)))))
+    return sum(lengths) / len(lengths) if lengths else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--places', type=int, nargs='+', default=[30, 100, 300])
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 14, 30])
+    args = parser.parse_args()
+
+    planner = TravelPlanner()
+    print(f"{'places':>7} {'days':>5} {'plan ms':>8} {'catalog-order km/day':>21} {'clustered km/day':>17}")
+    for places in args.places:
+        landmarks = synthetic_landmarks(places)
+        record = register_destination(f"Synthetic City {places}", [], landmarks)
+        for num_days in args.days:
+            sightseeing = max(num_days - 2, 0)
+            candidates = record["landmarks"][1:1 + len(DAY_SLOTS) * sightseeing]
+            naive = [candidates[i::sightseeing] for i in range(sightseeing)] if sightseeing else []
+            start = time.perf_counter()
+            grouped = planner._group_landmarks_by_day(record["landmarks"], num_days)
+            elapsed = time.perf_counter() - start
+            print(f"{places:>7} {num_days:>5} {elapsed * 1000:>8.1f} {mean_day_path_km(naive):>21.1f} "
+                  f"{mean_day_path_km(grouped.values()):>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Time radius and nearest-neighbour queries on the eating-place grid index.
+
+    python benchmarks/bench_food_places.py [--sizes 1000 20000 200000] [--repeat 2000]
+
+Synthetic places are scattered over a ~20 km city with random cuisine tags.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from food_places import FoodPlaceIndex  # noqa: E402
+
+CENTRE = (48.8566, 2.3522)
+CUISINES = ["french", "italian", "japanese", "sushi", "cafe", "bakery", "street food", "vegetarian"]
+
+
+def build_synthetic(size, seed=0):
+    rng = random.Random(seed)
+    index = FoodPlaceIndex()
+    for i in range(size):
+        index.add(f"Place {i}", CENTRE[0] + rng.uniform(-0.09, 0.09), CENTRE[1] + rng.uniform(-0.14, 0.14),
+                  rng.sample(CUISINES, 2), "$10-30")
+    return index
+
+
+def time_queries(query, points):
+    start = time.perf_counter()
+    for latitude, longitude in points:
+        query(latitude, longitude)
+    return (time.perf_counter() - start) / len(points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 20_000, 200_000])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    points = [(CENTRE[0] + rng.uniform(-0.05, 0.05), CENTRE[1] + rng.uniform(-0.08, 0.08))
+              for _ in range(args.repeat)]
+    print(f"{'places':>8} {'within 500m':>12} {'+ serving':>10} {'nearest k=3':>12}  (ms/query)")
+    for size in args.sizes:
+        index = build_synthetic(size)
+        within = time_queries(lambda lat, lon: index.within(lat, lon, 500, limit=3), points)
+        serving = time_queries(lambda lat, lon: index.within(lat, lon, 500, serving="sushi", limit=3), points)
+        nearest = time_queries(lambda lat, lon: index.nearest(lat, lon, k=3), points)
+        print(f"{size:>8} {within * 1000:>12.3f} {serving * 1000:>10.3f} {nearest * 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
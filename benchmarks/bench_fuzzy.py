@@ -0,0 +1,66 @@
+"""Time typo-tolerant destination lookups against a large synthetic catalog.
+
+    python benchmarks/bench_fuzzy.py [--size 100000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzy_index import TrigramIndex  # noqa: E402
+
+
+def random_name(rng):
+    # Place names are mostly one word, occasionally two or three
+    words = rng.choices((1, 2, 3), weights=(70, 25, 5))[0]
+    return " ".join(
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        for _ in range(words)
+    )
+
+
+def misspell(rng, name):
+    i = rng.randrange(len(name))
+    edit = rng.choice(('drop', 'double', 'swap'))
+    if edit == 'drop':
+        return name[:i] + name[i + 1:]
+    if edit == 'double':
+        return name[:i] + name[i] + name[i:]
+    if i + 1 < len(name):
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = list({random_name(rng) for _ in range(args.size)})
+    index = TrigramIndex()
+    start = time.perf_counter()
+    for name in names:
+        index.add(name, name)
+    print(f"indexed {len(index):,} names in {time.perf_counter() - start:.2f}s")
+
+    targets = [rng.choice(names) for _ in range(args.queries)]
+    queries = [misspell(rng, target) for target in targets]
+    start = time.perf_counter()
+    correct = 0
+    for query, target in zip(queries, targets):
+        matches = index.search(query, min_similarity=0.75)
+        if matches and matches[0][1] == target:
+            correct += 1
+    elapsed = time.perf_counter() - start
+    print(f"fuzzy search: {elapsed / len(queries) * 1e3:.3f} ms/query, "
+          f"top-1 accuracy {correct / len(queries):.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare offline gazetteer lookups with the Nominatim path used by MapGenerator.
+
+    python benchmarks/bench_geocoding.py [--gazetteer cities500.txt] [--live]
+
+Without ``--gazetteer`` a synthetic gazetteer is generated so the script runs
+anywhere. ``--live`` also times real Nominatim calls (rate-limited to 1 req/s).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gazetteer import GazetteerGeocoder  # noqa: E402
+
+QUERIES = ["Paris", "Hyderabad, IN", "New York City", "Mumbai", "Tokyo", "Rome", "Nowhereville"]
+
+
+def build_synthetic(size, seed=0):
+    rng = random.Random(seed)
+    gazetteer = GazetteerGeocoder()
+    for i in range(size):
+        gazetteer.add(f"Place {i}", rng.uniform(-60, 70), rng.uniform(-180, 180),
+                      country='XX', population=rng.randint(0, 1_000_000))
+    for name, lat, lon, country in [
+        ("Paris", 48.8566, 2.3522, 'FR'), ("Hyderabad", 17.385, 78.4867, 'IN'),
+        ("New York City", 40.7128, -74.006, 'US'), ("Mumbai", 19.076, 72.8777, 'IN'),
+        ("Tokyo", 35.6762, 139.6503, 'JP'), ("Rome", 41.9028, 12.4964, 'IT'),
+    ]:
+        gazetteer.add(name, lat, lon, country=country, population=5_000_000)
+    return gazetteer
+
+
+def time_lookups(geocode, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            geocode(query)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--gazetteer', help='GeoNames-style TSV to load')
+    parser.add_argument('--size', type=int, default=200_000, help='synthetic gazetteer size')
+    parser.add_argument('--repeat', type=int, default=10_000)
+    parser.add_argument('--live', action='store_true', help='also time live Nominatim lookups')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.gazetteer:
+        gazetteer = GazetteerGeocoder.from_file(args.gazetteer)
+    else:
+        gazetteer = build_synthetic(args.size)
+    load_time = time.perf_counter() - start
+    print(f"gazetteer: {len(gazetteer):,} places loaded in {load_time:.2f}s")
+
+    per_lookup = time_lookups(gazetteer.geocode, QUERIES, args.repeat)
+    print(f"gazetteer geocode: {per_lookup * 1e6:.2f} us/lookup")
+    per_nearest = time_lookups(lambda q: gazetteer.nearest(48.85, 2.35, k=5), QUERIES, args.repeat // 10 or 1)
+    print(f"gazetteer nearest(k=5): {per_nearest * 1e6:.2f} us/query")
+
+    if args.live:
+        from geopy.geocoders import Nominatim
+        nominatim = Nominatim(user_agent="travel_planner_app")
+
+        def live(query):
+            nominatim.geocode(query, timeout=10)
+            time.sleep(1)  # Respect the Nominatim usage policy
+
+        per_live = time_lookups(live, QUERIES, 1)
+        print(f"nominatim geocode (incl. 1s rate-limit sleep): {per_live * 1e3:.1f} ms/lookup")
+        print(f"speed-up: {per_live / per_lookup:,.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Measure cold import time of the planner core and fail if it exceeds the budget.
+
+    python benchmarks/bench_import.py [--budget-ms 250] [--runs 5]
+
+Each module is imported in a fresh interpreter; the median of several runs
+is reported. ``streamlit`` must not be pulled in by the core modules.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_MODULES = ['travel_planner', 'map_generator']
+
+PROBE = (
+    "import sys, time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start, 'streamlit' in sys.modules)"
+)
+
+
+def import_time(module):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1] == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget-ms', type=float, default=250.0, help='per-module import budget')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('modules', nargs='*', default=CORE_MODULES)
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        samples = [import_time(module) for _ in range(args.runs)]
+        median_ms = statistics.median(seconds for seconds, _ in samples) * 1000
+        pulls_streamlit = any(streamlit for _, streamlit in samples)
+        over_budget = median_ms > args.budget_ms
+        failed = failed or over_budget or pulls_streamlit
+        status = 'OVER BUDGET' if over_budget else 'ok'
+        note = ', imports streamlit' if pulls_streamlit else ''
+        print(f"{module}: {median_ms:.0f} ms (budget {args.budget_ms:.0f} ms) {status}{note}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Compare memory and serialization of itinerary dicts with the itinerary_model classes.
+
+    python benchmarks/bench_itinerary_model.py [--count 500] [--days 7]
+
+Builds ``--count`` template itineraries (distinct destinations, so only the
+template text repeats) and measures retained memory with tracemalloc, then
+the size and throughput of JSON, pickle and the compact serializer.
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from itinerary_model import Itinerary, dumps, loads  # noqa: E402
+from travel_planner import TravelPlanner  # noqa: E402
+
+DESTINATIONS = ["Paris", "New York", "Hyderabad", "Delhi", "Mumbai", "Chennai", "Goa", "Italy", "Japan"]
+
+
+def build_dicts(count, days):
+    planner = TravelPlanner()
+    return [
+        json.loads(json.dumps(planner._generate_template_itinerary(
+            DESTINATIONS[i % len(DESTINATIONS)] if i < len(DESTINATIONS) else f"Town {i}",
+            "Mid-range ($50-$150/day)", 2, days, ["Food & Cuisine", "History & Culture"]
+        )))
+        for i in range(count)
+    ]
+
+
+def retained_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, kept
+
+
+def throughput(label, encode, decode, items, repeat=3):
+    # Best of ``repeat`` runs, so a garbage collection in one pass doesn't skew a format
+    encode_time = decode_time = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = [encode(item) for item in items]
+        encode_time = min(encode_time, time.perf_counter() - start)
+        start = time.perf_counter()
+        for data in encoded:
+            decode(data)
+        decode_time = min(decode_time, time.perf_counter() - start)
+    size = sum(len(data) for data in encoded) / len(encoded)
+    print(f"{label:>16} {size:>10.0f} {len(items) / encode_time:>12.0f} {len(items) / decode_time:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=500)
+    parser.add_argument('--days', type=int, default=7)
+    args = parser.parse_args()
+
+    # Serialized copies, so each measurement builds its objects from scratch
+    payloads = [json.dumps(data) for data in build_dicts(args.count, args.days)]
+    dict_bytes, dicts = retained_bytes(lambda: [json.loads(payload) for payload in payloads])
+    model_bytes, models = retained_bytes(lambda: [Itinerary.from_dict(json.loads(payload)) for payload in payloads])
+    print(f"memory for {args.count} x {args.days}-day itineraries:")
+    print(f"  dicts: {dict_bytes / args.count / 1024:.1f} KiB each")
+    print(f"  model: {model_bytes / args.count / 1024:.1f} KiB each ({1 - model_bytes / dict_bytes:.0%} less)")
+    print()
+    print(f"{'format':>16} {'bytes':>10} {'encode/s':>12} {'decode/s':>12}")
+    throughput("json (dict)", lambda d: json.dumps(d, ensure_ascii=False).encode('utf-8'), json.loads, dicts)
+    throughput("pickle (dict)", pickle.dumps, pickle.loads, dicts)
+    throughput("json (model)", lambda m: json.dumps(m.to_dict(), ensure_ascii=False).encode('utf-8'),
+               lambda data: Itinerary.from_dict(json.loads(data)), models)
+    throughput("pickle (model)", pickle.dumps, pickle.loads, models)
+    throughput("compact (model)", dumps, loads, models)
+    # What session_store.get_itinerary does on every rerun
+    throughput("compact -> dict", dumps, lambda data: loads(data).to_dict(), models)
+
+
+if __name__ == '__main__':
+    main()
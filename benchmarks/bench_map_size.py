@@ -0,0 +1,71 @@
+"""Compare rendered map HTML size and render time across MapGenerator render modes.
+
+    python benchmarks/bench_map_size.py [--days 3 10 30] [--activities-per-day 3]
+
+Geocoding is served by a fake in-process geocoder, so only rendering is timed.
+The legacy ``markers`` mode caps output at 15 points; compare bytes per point.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gazetteer import GazetteerLocation  # noqa: E402
+from geocode_cache import GeocodeCache  # noqa: E402
+from map_cache import RenderedMapCache  # noqa: E402
+from map_generator import RENDER_MODES, MapGenerator  # noqa: E402
+
+
+class FakeGeocoder:
+    """Resolve every query to central Paris without touching the network"""
+
+    def geocode(self, query, timeout=None):
+        return GazetteerLocation(query, 48.8566, 2.3522)
+
+
+def synthetic_itinerary(num_days, activities_per_day, food_items=10):
+    daily_plan = {}
+    for day in range(1, num_days + 1):
+        daily_plan[f"Day {day}"] = [
+            {
+                'time': ('Morning', 'Afternoon', 'Evening')[slot % 3],
+                'name': f"Visit landmark {day}-{slot}",
+                'description': f"Spend a few hours exploring landmark {day}-{slot} and its surroundings",
+                'estimated_cost': "$20-50",
+            }
+            for slot in range(activities_per_day)
+        ]
+    food_recommendations = [
+        {'name': f"Dish {i}", 'description': "Local specialty", 'price_range': "$10-20", 'restaurant': None}
+        for i in range(food_items)
+    ]
+    return {'daily_plan': daily_plan, 'food_recommendations': food_recommendations}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=int, nargs='+', default=[3, 10, 30])
+    parser.add_argument('--activities-per-day', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'days':>5} {'mode':>8} {'points':>7} {'html KB':>8} {'B/point':>8} {'render ms':>10}")
+    for num_days in args.days:
+        itinerary = synthetic_itinerary(num_days, args.activities_per_day)
+        for mode in RENDER_MODES:
+            generator = MapGenerator(geocode_cache=GeocodeCache(), geolocator=FakeGeocoder(),
+                                     map_cache=RenderedMapCache(max_entries=1), render_mode=mode)
+            generator.generate_map("Paris", {'daily_plan': {}, 'food_recommendations': []})
+            empty_bytes = generator.last_render_stats['html_bytes']
+            start = time.perf_counter()
+            generator.generate_map("Paris", itinerary)
+            elapsed = time.perf_counter() - start
+            stats = generator.last_render_stats
+            per_point = (stats['html_bytes'] - empty_bytes) / max(stats['points'], 1)
+            print(f"{num_days:>5} {mode:>8} {stats['points']:>7} {stats['html_bytes'] / 1024:>8.1f} "
+                  f"{per_point:>8.0f} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Time TravelPlanner._parse_itinerary_response on synthetic AI output.
+
+    python benchmarks/bench_parser.py [--days 30] [--repeat 50]
+
+The legacy row is the parser as it was before single-pass classification:
+one ``any()`` scan per keyword list, day headers only for days one to three
+(so "Day 12" passes as "day 1"), and food and tips salvaged by splitting and
+scanning the whole text again.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from itinerary_parser import (  # noqa: E402
+    BULLETS, FOOD_WORDS, TIP_WORDS, IncrementalItineraryParser, ParseEvent, parse_activity, parse_food_item
+)
+from travel_planner import TravelPlanner  # noqa: E402
+
+LEGACY_DAY_WORDS = ['day 1', 'day 2', 'day 3', 'day one', 'day two', 'day three']
+LEGACY_FALLBACK_FOOD_WORDS = ['food', 'restaurant', 'dish', 'cuisine', 'eat', 'dining', 'meal']
+LEGACY_FALLBACK_TIP_WORDS = ['tip', 'advice', 'remember', 'important', 'note', 'recommend']
+
+PLACES = ["Old Town Square", "City Museum", "Riverside Park", "Central Market", "Cathedral",
+          "Harbour Walk", "Botanical Garden", "Castle Hill", "Art Quarter", "Night Bazaar"]
+DISHES = ["Street noodles", "Grilled fish", "Local pastry", "Spiced stew", "Fresh dumplings"]
+
+
+def synthetic_response(num_days, filler_lines=20, seed=0):
+    """Build an AI-style itinerary with day blocks, food and tips sections"""
+    rng = random.Random(seed)
+    lines = [f"Here is your {num_days}-day travel plan.", ""]
+    for day in range(1, num_days + 1):
+        lines.append(f"Day {day}: Exploring the city")
+        for slot in ("Morning", "Afternoon", "Evening"):
+            lines.append(f"- {slot}: Visit {rng.choice(PLACES)} and enjoy the views ($10-30)")
+        for _ in range(filler_lines):
+            lines.append(f"Walk from {rng.choice(PLACES)} towards {rng.choice(PLACES)} along the main road.")
+    lines.append("Food and restaurants")
+    for dish in DISHES:
+        lines.append(f"- {dish} at {rng.choice(PLACES)} Cafe")
+    lines.append("Travel tips")
+    for _ in range(5):
+        lines.append(f"- Remember to book {rng.choice(PLACES)} tickets early")
+    return "\n".join(lines)
+
+
+class LegacyItineraryParser(IncrementalItineraryParser):
+    """Line classification before the single-pass keyword table"""
+
+    def _parse_line(self, line, events):
+        line = line.strip()
+        if not line:
+            return
+        lowered = line.lower()
+        if any(day_word in lowered for day_word in LEGACY_DAY_WORDS):
+            self._finish_day(events)
+            self._current_day = line
+            self.daily_plan[line] = []
+            self._current_section = 'daily'
+        elif any(food_word in lowered for food_word in FOOD_WORDS):
+            self._finish_day(events)
+            self._current_section = 'food'
+        elif any(tip_word in lowered for tip_word in TIP_WORDS):
+            self._finish_day(events)
+            self._current_section = 'tips'
+        elif not line.startswith(BULLETS):
+            return
+        elif self._current_section == 'daily' and self._current_day:
+            self.daily_plan[self._current_day].append(parse_activity(line))
+        elif self._current_section == 'food':
+            food_item = parse_food_item(line)
+            self.food_recommendations.append(food_item)
+            events.append(ParseEvent('food', None, food_item))
+        elif self._current_section == 'tips':
+            tip = line.lstrip('-•* ').strip()
+            self.travel_tips.append(tip)
+            events.append(ParseEvent('tip', None, tip))
+
+
+def legacy_extract_lines(text, keywords):
+    """The old food/tips salvage: split the whole text again and scan every line"""
+    lines = []
+    for line in text.split('\n'):
+        if any(keyword in line.lower() for keyword in keywords):
+            if line.strip() and not line.strip().startswith('#'):
+                lines.append(line.strip())
+    return lines[:5]
+
+
+def legacy_parse_response(planner, generated_text, destination, num_days):
+    """_parse_itinerary_response with the legacy parser and salvage, for comparison"""
+    parser = LegacyItineraryParser()
+    parser.feed(generated_text)
+    parser.close()
+    daily_plan = parser.daily_plan or planner._create_basic_daily_plan(generated_text, num_days)
+    for activities in daily_plan.values():
+        planner._add_nearby_restaurants(destination, activities)
+    food_recommendations = parser.food_recommendations or planner._extract_food_recommendations(
+        generated_text, destination, lines=legacy_extract_lines(generated_text, LEGACY_FALLBACK_FOOD_WORDS)
+    )
+    travel_tips = parser.travel_tips or planner._extract_travel_tips(
+        generated_text, lines=legacy_extract_lines(generated_text, LEGACY_FALLBACK_TIP_WORDS)
+    )
+    return {'daily_plan': daily_plan, 'food_recommendations': food_recommendations, 'travel_tips': travel_tips}
+
+
+def feed_all(parser, text):
+    parser.feed(text)
+    parser.close()
+    return parser
+
+
+def time_parse(parse, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = parse()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=int, nargs='+', default=[3, 30])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    planner = TravelPlanner()
+    for num_days in args.days:
+        text = synthetic_response(num_days)
+        parsers = (
+            ("legacy", LegacyItineraryParser,
+             lambda: legacy_parse_response(planner, text, "Testville", num_days)),
+            ("single-pass", IncrementalItineraryParser,
+             lambda: planner._parse_itinerary_response(
+                 text, "Testville", "Mid-range ($50-$150/day)", 2, num_days, ["food"]
+             )),
+        )
+        for label, parser_class, parse in parsers:
+            parser_only, _ = time_parse(lambda: feed_all(parser_class(), text), args.repeat)
+            elapsed, result = time_parse(parse, args.repeat)
+            print(f"{num_days:>3} days, {len(text) / 1024:7.1f} KB, {label:>11}: {parser_only * 1e3:7.3f} ms parser, "
+                  f"{elapsed * 1e3:7.3f} ms response, {len(result['daily_plan'])} of {num_days} days parsed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Time route_optimizer.optimize_order on random days of activities.
+
+    python benchmarks/bench_routes.py [--sizes 3 6 10 30] [--repeat 200]
+
+Points are scattered over a ~10 km city; the path starts at the centre.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_optimizer import optimize_order  # noqa: E402
+
+CENTRE = (48.8566, 2.3522)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 6, 10, 30])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'stops':>6} {'ms/day':>8} {'original km':>12} {'optimized km':>13} {'saved':>6}")
+    for size in args.sizes:
+        days = [[(CENTRE[0] + rng.uniform(-0.05, 0.05), CENTRE[1] + rng.uniform(-0.07, 0.07)) for _ in range(size)]
+                for _ in range(args.repeat)]
+        original = optimized = 0.0
+        start = time.perf_counter()
+        for coords in days:
+            _, original_km, optimized_km = optimize_order(coords, start=CENTRE)
+            original += original_km
+            optimized += optimized_km
+        elapsed = time.perf_counter() - start
+        print(f"{size:>6} {elapsed / args.repeat * 1000:>8.2f} {original / args.repeat:>12.1f} "
+              f"{optimized / args.repeat:>13.1f} {(1 - optimized / original) * 100:>5.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compare per-session memory of keeping payloads in session state against the shared ContentStore.
+
+    python benchmarks/bench_session_store.py [--sessions 200] [--trips 20] [--days 5] [--max-mb 64]
+
+Renders ``--trips`` distinct itineraries and maps offline, then assigns them
+round-robin to ``--sessions`` sessions (popular trips repeat, as they do in
+practice). Per-session state used to hold the itinerary and the full map
+HTML; now it holds two content hashes and the store keeps one compressed
+copy of each distinct payload.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gazetteer import GazetteerLocation  # noqa: E402
+from geocode_cache import GeocodeCache  # noqa: E402
+from itinerary_model import Itinerary  # noqa: E402
+from map_cache import RenderedMapCache  # noqa: E402
+from map_generator import MapGenerator  # noqa: E402
+from session_store import ContentStore  # noqa: E402
+from travel_planner import TravelPlanner  # noqa: E402
+
+
+class FakeGeocoder:
+    """Resolve every query to central Paris without touching the network"""
+
+    def geocode(self, query, timeout=None):
+        return GazetteerLocation(query, 48.8566, 2.3522)
+
+
+def build_trips(count, days):
+    planner = TravelPlanner()
+    generator = MapGenerator(geocode_cache=GeocodeCache(), geolocator=FakeGeocoder(),
+                             map_cache=RenderedMapCache(max_entries=1))
+    trips = []
+    for i in range(count):
+        destination = f"Town {i}"
+        itinerary = planner._generate_template_itinerary(
+            destination, "Mid-range ($50-$150/day)", 2, days, ["Food & Cuisine", "History & Culture"]
+        )
+        trips.append((itinerary, generator.generate_map(destination, itinerary)))
+    return trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--trips', type=int, default=20)
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--max-mb', type=float, default=64)
+    args = parser.parse_args()
+
+    trips = build_trips(args.trips, args.days)
+    store = ContentStore(max_bytes=int(args.max_mb * 1024 * 1024))
+
+    legacy_bytes = 0
+    start = time.perf_counter()
+    for session in range(args.sessions):
+        itinerary, html = trips[session % len(trips)]
+        legacy_bytes += len(pickle.dumps(Itinerary.from_dict(itinerary))) + len(html.encode('utf-8'))
+        itinerary_key = store.put_itinerary(itinerary)
+        map_key = store.put_html(html)
+        store.track(f"session-{session}", itinerary_key, map_key)
+    put_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for session in range(args.sessions):
+        itinerary, html = trips[session % len(trips)]
+        store.get_itinerary(store.put_itinerary(itinerary))
+        store.get_html(store.put_html(html))
+    rerun_ms = (time.perf_counter() - start) * 1000 / args.sessions
+
+    stats = store.stats()
+    print(f"sessions={args.sessions} trips={args.trips} days={args.days}")
+    print(f"  session state (legacy):  {legacy_bytes / 1024:10.1f} KB  {legacy_bytes / args.sessions / 1024:8.1f} KB/session")
+    print(f"  shared store:            {stats['bytes'] / 1024:10.1f} KB  {stats['bytes_per_session'] / 1024:8.1f} KB/session")
+    print(f"  session state (keys):    {2 * 64 / 1024:10.3f} KB/session")
+    print(f"  entries={stats['entries']} deduplicated={stats['deduplicated']} evictions={stats['evictions']} "
+          f"dedup_ratio={stats['dedup_ratio']:.1f}")
+    print(f"  store all: {put_ms:.1f} ms   load per rerun: {rerun_ms:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
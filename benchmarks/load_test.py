@@ -0,0 +1,214 @@
+"""Drive concurrent simulated sessions through app.py and report latency, throughput and memory.
+
+    python benchmarks/load_test.py [--concurrency 1 2 4 8] [--sessions-per-worker 3]
+                                   [--latency 0.2] [--error-rate 0.0] [--output load.json]
+
+Each session is a Streamlit ``AppTest`` running the real script in this
+process, so sessions share ``st.cache_resource`` objects, caches and HTTP
+pools exactly as they would in one server. A session loads the page, fills
+in the sidebar, clicks Generate (streaming from the mock HF server, then
+building the map against the mock Nominatim) and reruns once with the tabs
+displayed. HF and Nominatim are the local mocks from ``mock_services.py``.
+
+For every concurrency level it reports p50/p95/p99 latency per step,
+completed sessions per second, failures and the process RSS before and
+after; results are also written as JSON for comparison across commits.
+"""
+import argparse
+import json
+import math
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_services import MockServices  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+DESTINATIONS = ["Paris", "New York", "Hyderabad", "Delhi", "Mumbai", "Goa", "Italy", "Japan"]
+STEPS = ('load', 'generate', 'rerun')
+
+
+def rss_mb():
+    """Current resident set size of this process, or the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` (``q`` in 0-100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+@contextmanager
+def shared_streamlit_runtime():
+    """Let concurrent AppTest runs share a Runtime while the block runs
+
+    AppTest installs a mock Runtime on the process-wide singleton for every
+    run and clears it when the run ends, so a session finishing would pull it
+    out from under the others. Fall back to the most recent one instead; the
+    original ``Runtime`` methods are restored on exit.
+    """
+    from streamlit.runtime.runtime import Runtime
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+            return cls._instance
+        if last:
+            return last[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    with mock.patch.object(Runtime, 'instance', classmethod(instance)), \
+            mock.patch.object(Runtime, 'exists', classmethod(lambda cls: cls._instance is not None or bool(last))):
+        yield
+
+
+def session_flow(index, timeout):
+    """Run one session through the app; returns ``{step: seconds}`` and an error, if any"""
+    from streamlit.testing.v1 import AppTest
+
+    timings = {}
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    timings['load'] = time.perf_counter() - start
+
+    at.text_input[0].input(DESTINATIONS[index % len(DESTINATIONS)])
+    at.number_input[1].set_value(1 + index % 7)
+    at.checkbox[index % len(at.checkbox)].check()
+    at.button[0].click()
+    start = time.perf_counter()
+    at.run()
+    timings['generate'] = time.perf_counter() - start
+    if at.exception or not at.session_state['itinerary_generated'] or not at.tabs:
+        messages = [element.value for element in at.exception] or [element.value for element in at.error]
+        return timings, '; '.join(messages) or 'no itinerary displayed'
+
+    start = time.perf_counter()
+    at.run()
+    timings['rerun'] = time.perf_counter() - start
+    return timings, None
+
+
+def run_level(concurrency, sessions, offset, timeout):
+    timings = {step: [] for step in STEPS}
+    errors = []
+    lock = threading.Lock()
+
+    def worker(index):
+        try:
+            result, error = session_flow(index, timeout)
+        except Exception as e:
+            result, error = {}, f"{type(e).__name__}: {e}"
+        with lock:
+            for step, seconds in result.items():
+                timings[step].append(seconds)
+            if error:
+                errors.append(error)
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(offset, offset + sessions)))
+    wall = time.perf_counter() - start
+    rss_after = rss_mb()
+
+    record = {
+        'concurrency': concurrency,
+        'sessions': sessions,
+        'failed': len(errors),
+        'wall_s': round(wall, 3),
+        'throughput_per_s': round((sessions - len(errors)) / wall, 3),
+        'rss_before_mb': round(rss_before, 1),
+        'rss_after_mb': round(rss_after, 1),
+        'rss_growth_mb': round(rss_after - rss_before, 1),
+        'errors': sorted(set(errors))[:5],
+    }
+    for step in STEPS:
+        for q in (50, 95, 99):
+            value = percentile(timings[step], q)
+            record[f"{step}_p{q}_ms"] = None if value is None else round(value * 1000, 1)
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--sessions-per-worker', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.2, help="Mock HF/Nominatim latency in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of mock requests that fail")
+    parser.add_argument('--timeout', type=float, default=120, help="Per-run AppTest timeout in seconds")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    with MockServices(latency=args.latency, error_rate=args.error_rate) as services, \
+            tempfile.TemporaryDirectory() as scratch, \
+            mock.patch.dict(os.environ, services.env()), \
+            shared_streamlit_runtime():
+        os.environ['GEOCODE_CACHE_PATH'] = os.path.join(scratch, 'geocode_cache.db')
+        os.environ.pop('MAP_CACHE_DIR', None)
+        # Worker threads have no ScriptRunContext and Streamlit warns about it on every run
+        from streamlit.logger import set_log_level
+        set_log_level('error')
+
+        # One untimed session pays for imports and process-wide resources
+        session_flow(0, args.timeout)
+        rss_start = rss_mb()
+
+        levels = []
+        offset = 1
+        print(f"{'conc':>4} {'sessions':>8} {'failed':>6} {'per s':>7} {'gen p50':>8} {'gen p95':>8} "
+              f"{'gen p99':>8} {'rerun p95':>9} {'RSS MB':>8} {'+MB':>6}", file=sys.stderr)
+        for concurrency in args.concurrency:
+            sessions = concurrency * args.sessions_per_worker
+            record = run_level(concurrency, sessions, offset, args.timeout)
+            offset += sessions
+            levels.append(record)
+            print(f"{concurrency:>4} {sessions:>8} {record['failed']:>6} {record['throughput_per_s']:>7.2f} "
+                  f"{record['generate_p50_ms'] or 0:>8.0f} {record['generate_p95_ms'] or 0:>8.0f} "
+                  f"{record['generate_p99_ms'] or 0:>8.0f} {record['rerun_p95_ms'] or 0:>9.0f} "
+                  f"{record['rss_after_mb']:>8.1f} {record['rss_growth_mb']:>+6.1f}", file=sys.stderr)
+        mock_counts = services.counts()
+
+    output = {
+        'meta': {
+            'latency': args.latency,
+            'error_rate': args.error_rate,
+            'sessions_per_worker': args.sessions_per_worker,
+            'rss_start_mb': round(rss_start, 1),
+            'mock': mock_counts,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'levels': levels,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""Local stand-ins for the Hugging Face inference API and Nominatim, for offline benchmarks.
+
+    python benchmarks/mock_services.py [--latency 0.2] [--error-rate 0.05] [--hf-port 8081] [--nominatim-port 8082]
+
+Prints the environment variables that point the app at the servers and runs
+until interrupted. Benchmarks use ``MockServices`` as a context manager.
+
+The HF server answers ``POST`` with ``[{"generated_text": ...}]``, or with a
+server-sent-events token stream when the payload asks for ``"stream": true``;
+the text is a synthetic itinerary for the number of days in the prompt.
+Nominatim answers ``GET /search`` with a point a few km from ``center``
+derived from a hash of the query, so results are stable across runs. Both
+delay each answer by ``latency`` seconds (+/- ``jitter``) and fail a seeded
+fraction ``error_rate`` of requests with ``error_status``.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parser import synthetic_response  # noqa: E402
+
+DAYS_PATTERN = re.compile(r'(\d+)-day')
+
+
+class MockBehaviour:
+    """Latency and failure injection shared by both servers; counts what it served"""
+
+    def __init__(self, latency=0.0, jitter=0.25, error_rate=0.0, error_status=503, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {'requests': 0, 'errors': 0}
+
+    def next_outcome(self):
+        """``(delay_seconds, failed)`` for the next request"""
+        with self._lock:
+            self.counts['requests'] += 1
+            delay = self.latency * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.counts['errors'] += 1
+        return max(delay, 0.0), failed
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    behaviour = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _delay_or_fail(self):
+        delay, failed = self.behaviour.next_outcome()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            self._send(self.behaviour.error_status, json.dumps({'error': 'injected failure'}).encode())
+        return failed
+
+
+class HuggingFaceHandler(_Handler):
+    filler_lines = 20
+    token_delay = 0.0
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        if self._delay_or_fail():
+            return
+        match = DAYS_PATTERN.search(payload.get('inputs') or '')
+        num_days = int(match.group(1)) if match else 3
+        text = synthetic_response(num_days, self.filler_lines, seed=num_days)
+        if not payload.get('stream'):
+            self._send(200, json.dumps([{'generated_text': text}]).encode())
+            return
+        events = [
+            f"data: {json.dumps({'token': {'text': line + chr(10), 'special': False}})}\n\n".encode()
+            for line in text.split('\n')
+        ]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Length', str(sum(len(event) for event in events)))
+        self.end_headers()
+        for event in events:
+            self.wfile.write(event)
+            if self.token_delay:
+                self.wfile.flush()
+                time.sleep(self.token_delay)
+
+
+class NominatimHandler(_Handler):
+    center = (48.8566, 2.3522)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/search':
+            self._send(404, b'[]')
+            return
+        if self._delay_or_fail():
+            return
+        query = parse_qs(url.query).get('q', [''])[0]
+        if not query or 'nowhere' in query.lower():
+            self._send(200, b'[]')
+            return
+        digest = hashlib.sha256(query.lower().encode()).digest()
+        lat = self.center[0] + (digest[0] - 128) / 128 * 0.03
+        lon = self.center[1] + (digest[1] - 128) / 128 * 0.04
+        result = [{
+            'place_id': int.from_bytes(digest[:4], 'big'), 'lat': f"{lat:.7f}", 'lon': f"{lon:.7f}",
+            'display_name': query, 'boundingbox': [str(lat - 0.001), str(lat + 0.001), str(lon - 0.001), str(lon + 0.001)],
+        }]
+        self._send(200, json.dumps(result).encode())
+
+
+class MockServices:
+    """Run the HF and Nominatim mocks on background threads; ports default to free ones
+
+    ``env()`` returns the variables that point ``TravelPlanner`` and
+    ``MapGenerator`` at the mocks (``apply_env()`` sets them in ``os.environ``).
+    """
+
+    def __init__(self, latency=0.0, jitter=0.25, error_rate=0.0, error_status=503, seed=0,
+                 hf_port=0, nominatim_port=0, filler_lines=20, token_delay=0.0):
+        self.hf = MockBehaviour(latency, jitter, error_rate, error_status, seed)
+        self.nominatim = MockBehaviour(latency, jitter, error_rate, error_status, seed + 1)
+        hf_handler = type('HF', (HuggingFaceHandler,), {
+            'behaviour': self.hf, 'filler_lines': filler_lines, 'token_delay': token_delay,
+        })
+        nominatim_handler = type('Nominatim', (NominatimHandler,), {'behaviour': self.nominatim})
+        self._servers = [
+            ThreadingHTTPServer(('127.0.0.1', hf_port), hf_handler),
+            ThreadingHTTPServer(('127.0.0.1', nominatim_port), nominatim_handler),
+        ]
+        for server in self._servers:
+            server.daemon_threads = True
+        self._threads = []
+
+    @property
+    def hf_url(self):
+        return f"http://127.0.0.1:{self._servers[0].server_address[1]}/models/mock"
+
+    @property
+    def nominatim_domain(self):
+        return f"127.0.0.1:{self._servers[1].server_address[1]}"
+
+    def env(self):
+        return {
+            'HF_API_URL': self.hf_url,
+            'HUGGING_FACE_API_KEY': 'mock-key',
+            'NOMINATIM_DOMAIN': self.nominatim_domain,
+            'NOMINATIM_SCHEME': 'http',
+            # The real server asks for about one request per second; the mock doesn't
+            'NOMINATIM_RATE_LIMIT': '1000',
+        }
+
+    def apply_env(self):
+        os.environ.update(self.env())
+
+    def counts(self):
+        return {'hf': dict(self.hf.counts), 'nominatim': dict(self.nominatim.counts)}
+
+    def start(self):
+        for server in self._servers:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.25)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--hf-port', type=int, default=8081)
+    parser.add_argument('--nominatim-port', type=int, default=8082)
+    args = parser.parse_args()
+
+    with MockServices(args.latency, args.jitter, args.error_rate, args.error_status,
+                      hf_port=args.hf_port, nominatim_port=args.nominatim_port) as services:
+        for name, value in services.env().items():
+            print(f"export {name}={value}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print(json.dumps(services.counts()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""Run the hot-path benchmark suite offline and write machine-readable results.
+
+    python benchmarks/run_suite.py [--output results.json] [--compare baseline.json] [--filter parse]
+                                   [--repeat 5] [--latency 0.05] [--error-rate 0.0] [--quick]
+
+Covers landmark lookups, template itineraries for 1-30 days, response parsing
+from 1 KB to 1 MB, cost breakdowns and what-if grids, map rendering (cold and
+warm geocode cache) and end-to-end generation. HF inference and Nominatim are served by the local mocks in
+``mock_services.py``, so results are reproducible and no network is needed.
+
+Results are JSON: ``meta`` (commit, Python, mock settings) plus one record per
+case with per-operation ``min_ms``/``median_ms``/``p95_ms``/``mean_ms``.
+``--compare`` prints the median change against an earlier results file and
+exits with status 1 if any case got slower than ``--threshold``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parser import synthetic_response  # noqa: E402
+from mock_services import MockServices  # noqa: E402
+
+BUDGET = "Mid-range ($50-$150/day)"
+INTERESTS = ["food", "culture", "museums"]
+LOOKUPS = {'exact': "Paris", 'alias': "paris, france", 'typo': "Hyderbad", 'miss': "Atlantis"}
+
+
+def measure(operation, repeat, min_sample_seconds=0.02, setup=None):
+    """Per-operation timings in ms: ``repeat`` samples, each looping until ``min_sample_seconds``
+
+    ``setup()`` runs before every call, untimed, and its result is passed to ``operation``.
+    One untimed call first keeps lazy imports and first-use caches out of the samples.
+    """
+    operation(setup()) if setup else operation()
+    samples = []
+    for _ in range(repeat):
+        elapsed, calls = 0.0, 0
+        while elapsed < min_sample_seconds or calls == 0:
+            argument = setup() if setup else None
+            start = time.perf_counter()
+            operation(argument) if setup else operation()
+            elapsed += time.perf_counter() - start
+            calls += 1
+        samples.append(elapsed / calls * 1000)
+    samples.sort()
+    return {
+        'repeat': repeat,
+        'min_ms': round(samples[0], 4),
+        'median_ms': round(statistics.median(samples), 4),
+        'p95_ms': round(samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))], 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+    }
+
+
+def sized_response(target_bytes):
+    """Synthetic AI output of about ``target_bytes``, padded with filler lines"""
+    num_days = 3 if target_bytes < 10_000 else 7
+    base = len(synthetic_response(num_days, 0))
+    per_line = (len(synthetic_response(num_days, 10)) - base) / (10 * num_days)
+    filler_lines = max(0, round((target_bytes - base) / (per_line * num_days)))
+    return num_days, synthetic_response(num_days, filler_lines)
+
+
+def case_key(name, params):
+    return name + '[' + ','.join(f"{key}={value}" for key, value in sorted(params.items())) + ']'
+
+
+def build_cases(services, quick):
+    from cost_engine import itinerary_costs, what_if_grid
+    from geocode_cache import GeocodeCache
+    from geopy.geocoders import Nominatim
+    from landmarks_data import get_landmarks_for_destination
+    from map_cache import RenderedMapCache
+    from map_generator import MapGenerator
+    from travel_planner import TravelPlanner
+
+    planner = TravelPlanner(hf_client=None)
+    geolocator = Nominatim(user_agent="travel_planner_bench", domain=services.nominatim_domain, scheme='http')
+
+    def map_generator(geocode_cache=None):
+        return MapGenerator(geocode_cache=geocode_cache or GeocodeCache(), geolocator=geolocator,
+                            map_cache=RenderedMapCache(max_entries=1))
+
+    for kind, query in LOOKUPS.items():
+        yield 'landmarks_lookup', {'kind': kind}, {}, lambda query=query: get_landmarks_for_destination(query), None
+
+    for num_days in ([1, 7] if quick else [1, 3, 7, 14, 30]):
+        yield 'template_itinerary', {'days': num_days}, {}, lambda num_days=num_days: (
+            planner._generate_template_itinerary("Paris", BUDGET, 2, num_days, INTERESTS)
+        ), None
+
+    for size in ([1_000, 100_000] if quick else [1_000, 10_000, 100_000, 1_000_000]):
+        num_days, text = sized_response(size)
+        yield 'parse_response', {'kb': size // 1000}, {'bytes': len(text)}, lambda num_days=num_days, text=text: (
+            planner._parse_itinerary_response(text, "Testville", BUDGET, 2, num_days, INTERESTS)
+        ), None
+
+    for num_days in ([7] if quick else [3, 30]):
+        itinerary = planner._generate_template_itinerary("Paris", BUDGET, 2, num_days, INTERESTS)
+        yield 'cost_engine', {'days': num_days}, {}, lambda itinerary=itinerary: (
+            what_if_grid(itinerary_costs(itinerary), BUDGET)
+        ), None
+
+    for num_days in ([3] if quick else [3, 10, 30]):
+        itinerary = planner._generate_template_itinerary("Paris", BUDGET, 2, num_days, INTERESTS)
+        yield 'generate_map', {'days': num_days, 'geocode': 'cold'}, {}, lambda generator: (
+            generator.generate_map("Paris", itinerary)
+        ), map_generator
+        warm_cache = GeocodeCache()
+        map_generator(warm_cache).generate_map("Paris", itinerary)
+        yield 'generate_map', {'days': num_days, 'geocode': 'warm'}, {}, lambda generator: (
+            generator.generate_map("Paris", itinerary)
+        ), lambda warm_cache=warm_cache: map_generator(warm_cache)
+
+    def end_to_end(num_days):
+        def run(generator):
+            ai_planner = TravelPlanner(cache_size=1)
+            itinerary = ai_planner.generate_itinerary("Paris", BUDGET, 2, num_days, INTERESTS, use_cache=False)
+            with generator.shared_deadline():
+                itinerary = generator.optimize_routes("Paris", itinerary)
+                return generator.generate_map("Paris", itinerary)
+        return run
+
+    for num_days in ([3] if quick else [3, 7]):
+        yield 'end_to_end', {'days': num_days}, {}, end_to_end(num_days), map_generator
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print median changes against a baseline file; return the keys that regressed"""
+    with open(baseline_path) as f:
+        baseline = {record['key']: record for record in json.load(f)['results']}
+    regressions = []
+    print(f"{'case':<48} {'base ms':>10} {'now ms':>10} {'change':>8}", file=sys.stderr)
+    for record in results:
+        before = baseline.get(record['key'])
+        if before is None:
+            print(f"{record['key']:<48} {'-':>10} {record['median_ms']:>10.3f} {'new':>8}", file=sys.stderr)
+            continue
+        change = record['median_ms'] / before['median_ms'] - 1 if before['median_ms'] else 0.0
+        flag = ' !' if change > threshold else ''
+        if flag:
+            regressions.append(record['key'])
+        print(f"{record['key']:<48} {before['median_ms']:>10.3f} {record['median_ms']:>10.3f} {change:>+7.1%}{flag}",
+              file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    parser.add_argument('--compare', help="Earlier results file to compare medians against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Slowdown that counts as a regression")
+    parser.add_argument('--filter', default='', help="Only run cases whose key contains this text")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.05, help="Mock HF/Nominatim latency in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of mock requests that fail")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help="Fewer sizes per case")
+    args = parser.parse_args()
+
+    results = []
+    with MockServices(latency=args.latency, error_rate=args.error_rate, seed=args.seed) as services:
+        services.apply_env()
+        for name, params, info, operation, setup in build_cases(services, args.quick):
+            key = case_key(name, params)
+            if args.filter not in key:
+                continue
+            record = {'key': key, 'name': name, 'params': params, **info}
+            record.update(measure(operation, args.repeat, setup=setup))
+            results.append(record)
+            print(f"{key:<48} {record['median_ms']:>10.3f} ms  (p95 {record['p95_ms']:.3f})", file=sys.stderr)
+        mock_counts = services.counts()
+
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'mock': {'latency': args.latency, 'error_rate': args.error_rate, 'seed': args.seed, 'counts': mock_counts},
+            'repeat': args.repeat,
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Numeric trip costs.
+
+Activity and food prices arrive as strings ("$20-50", "$150+", "Free",
+"Varies"). ``parse_cost`` turns each distinct string into a ``CostRange``
+once (results are cached), ``itinerary_costs`` sums an itinerary per day and
+per trip, and ``what_if_grid`` prices every budget tier x group size x trip
+length in one vectorized pass, so the UI can compare options without
+generating new itineraries.
+
+All amounts are USD per person unless a name says otherwise.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from utils import budget_tier
+
+CostRange = namedtuple('CostRange', ['low', 'high'])
+
+ZERO = CostRange(0.0, 0.0)
+
+# All-in daily spend per person for each budget tier, and the default when the tier is unknown
+TIER_DAILY_BUDGET = {'budget': 35, 'mid-range': 100, 'luxury': 200}
+DEFAULT_TIER = 'mid-range'
+TIERS = tuple(TIER_DAILY_BUDGET)
+# The high end of a budget-based estimate, as a multiple of the low end
+ESTIMATE_SPREAD = 1.2
+# "$150+" has no upper bound; assume this multiple of the stated minimum
+OPEN_ENDED_FACTOR = 1.5
+# Food recommendations are priced per meal; lunch and dinner are eaten out
+MEALS_PER_DAY = 2
+
+_AMOUNT = r'(\d[\d,]*(?:\.\d+)?)'
+RANGE_PATTERN = re.compile(_AMOUNT + r'\s*(?:-|–|—|to)\s*[$€£₹]?\s*' + _AMOUNT)
+OPEN_ENDED_PATTERN = re.compile(_AMOUNT + r'\s*\+')
+AMOUNT_PATTERN = re.compile(_AMOUNT)
+FREE_PATTERN = re.compile(r'\bfree\b', re.IGNORECASE)
+# Only look for prices inside names and descriptions when they carry a currency symbol
+EMBEDDED_PRICE_PATTERN = re.compile(r'[$€£₹]\s*\d[\d,.]*(?:\s*(?:-|–|—|to)\s*[$€£₹]?\s*\d[\d,.]*|\s*\+)?')
+
+
+def _number(text):
+    return float(text.replace(',', ''))
+
+
+@lru_cache(maxsize=4096)
+def parse_cost(text):
+    """``CostRange`` for a price string, or ``None`` if it has no amount ("Varies", "Moderate")"""
+    if not text:
+        return None
+    match = RANGE_PATTERN.search(text)
+    if match:
+        low, high = _number(match.group(1)), _number(match.group(2))
+        return CostRange(min(low, high), max(low, high))
+    match = OPEN_ENDED_PATTERN.search(text)
+    if match:
+        low = _number(match.group(1))
+        return CostRange(low, low * OPEN_ENDED_FACTOR)
+    match = AMOUNT_PATTERN.search(text)
+    if match:
+        amount = _number(match.group(1))
+        return CostRange(amount, amount)
+    if FREE_PATTERN.search(text):
+        return ZERO
+    return None
+
+
+def activity_cost(activity):
+    """Cost of one activity: its ``estimated_cost``, else a price quoted in its name or description"""
+    cost = parse_cost(activity.get('estimated_cost'))
+    if cost is not None:
+        return cost
+    for field in ('name', 'description'):
+        match = EMBEDDED_PRICE_PATTERN.search(activity.get(field) or '')
+        if match:
+            return parse_cost(match.group(0))
+    return None
+
+
+def add(*ranges):
+    """Sum of ``CostRange``s, skipping ``None``"""
+    low = high = 0.0
+    for cost in ranges:
+        if cost is not None:
+            low += cost.low
+            high += cost.high
+    return CostRange(low, high)
+
+
+def scale(cost, factor):
+    return CostRange(cost.low * factor, cost.high * factor)
+
+
+def estimate_range(budget, num_people, num_days):
+    """Budget-based trip estimate for the whole group: tier daily budget x people x days"""
+    daily = TIER_DAILY_BUDGET.get(budget_tier(budget), TIER_DAILY_BUDGET[DEFAULT_TIER])
+    total = daily * num_people * num_days
+    return CostRange(total, total * ESTIMATE_SPREAD)
+
+
+def format_range(cost):
+    """"$1,200 - $1,440"; a zero-width range is shown as one amount"""
+    low, high = int(round(cost.low)), int(round(cost.high))
+    return f"${low:,}" if low == high else f"${low:,} - ${high:,}"
+
+
+def itinerary_costs(itinerary_data):
+    """Itemized costs of an itinerary
+
+    Returns a dict with ``days`` (label -> ``{'cost': CostRange, 'priced',
+    'unpriced'}`` per person), ``activities`` and ``food`` per person for the
+    whole trip, ``per_person``, ``total`` for the group, ``food_per_meal``
+    (``None`` without priced food) and ``unpriced``, the number of activities
+    and dishes whose price could not be read.
+    """
+    days = {}
+    unpriced = 0
+    for label, activities in (itinerary_data.get('daily_plan') or {}).items():
+        costs = [activity_cost(activity) for activity in activities]
+        missing = costs.count(None)
+        unpriced += missing
+        days[label] = {'cost': add(*costs), 'priced': len(costs) - missing, 'unpriced': missing}
+    activities_total = add(*(day['cost'] for day in days.values()))
+
+    dishes = [parse_cost(item.get('price_range')) for item in itinerary_data.get('food_recommendations') or []]
+    priced_dishes = [cost for cost in dishes if cost is not None]
+    unpriced += len(dishes) - len(priced_dishes)
+    food_per_meal = scale(add(*priced_dishes), 1 / len(priced_dishes)) if priced_dishes else None
+    num_days = itinerary_data.get('num_days') or len(days) or 1
+    food_total = scale(food_per_meal, MEALS_PER_DAY * num_days) if food_per_meal else ZERO
+
+    per_person = add(activities_total, food_total)
+    return {
+        'days': days,
+        'activities': activities_total,
+        'food': food_total,
+        'food_per_meal': food_per_meal,
+        'per_person': per_person,
+        'total': scale(per_person, itinerary_data.get('num_people') or 1),
+        'unpriced': unpriced,
+    }
+
+
+def what_if_grid(costs=None, plan_budget=None, max_people=20, max_days=30):
+    """Group totals for every tier x 1..``max_people`` x 1..``max_days``, computed in one broadcast
+
+    Returns ``{'tiers', 'people', 'days', 'estimate', 'itemized'}`` where the
+    last two are ``(tiers, people, days, 2)`` arrays of (low, high) group
+    totals. ``estimate`` is the budget-based estimate; ``itemized`` spreads the
+    plan's per-person daily activity and food spend (from ``itinerary_costs``)
+    over each trip length and scales it between tiers by their daily budgets
+    relative to ``plan_budget``. ``itemized`` is ``None`` without ``costs``.
+    """
+    import numpy as np
+
+    budgets = np.array([TIER_DAILY_BUDGET[tier] for tier in TIERS], dtype=float)
+    daily = [np.column_stack((budgets, budgets * ESTIMATE_SPREAD))]
+    if costs is not None:
+        plan_days = max(len(costs['days']), 1)
+        activities_per_day = np.array(costs['activities'], dtype=float) / plan_days
+        food_per_day = np.array(costs['food_per_meal'] or ZERO, dtype=float) * MEALS_PER_DAY
+        plan_daily = TIER_DAILY_BUDGET.get(budget_tier(plan_budget), TIER_DAILY_BUDGET[DEFAULT_TIER])
+        daily.append((budgets / plan_daily)[:, None] * (activities_per_day + food_per_day)[None, :])
+
+    people = np.arange(1, max_people + 1, dtype=float)
+    days = np.arange(1, max_days + 1, dtype=float)
+    # (variant, tier, 1, 1, bound) x (people, 1, 1) x (days, 1) -> (variant, tier, people, days, bound)
+    grid = np.stack(daily)[:, :, None, None, :] * people[:, None, None] * days[:, None]
+    return {
+        'tiers': TIERS,
+        'people': people.astype(int),
+        'days': days.astype(int),
+        'estimate': grid[0],
+        'itemized': grid[1] if costs is not None else None,
+    }
@@ -0,0 +1,105 @@
+import math
+
+import numpy as np
+
+KM_PER_DEGREE = 111.32
+
+
+def project(coords):
+    """(lat, lon) pairs to planar km around their mean latitude; accurate enough within a city or country"""
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    scale = math.cos(math.radians(coords[:, 0].mean())) if len(coords) else 1.0
+    return np.column_stack((coords[:, 1] * scale, coords[:, 0])) * KM_PER_DEGREE
+
+
+def balanced_kmeans(coords, k, capacity=None, n_init=4, max_iterations=50, seed=0):
+    """Split points into ``k`` compact clusters of at most ``capacity`` points each.
+
+    Lloyd iterations with a capacity-constrained assignment step (see
+    ``_capacitated_assignment``). ``capacity`` defaults to ``ceil(n / k)``, which keeps cluster
+    sizes within one of each other. Runs ``n_init`` seeded k-means++ starts and
+    returns the labels of the tightest one as an array of cluster indexes.
+    """
+    points = project(coords)
+    n = len(points)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    k = max(1, min(k, n))
+    if capacity is None:
+        capacity = math.ceil(n / k)
+    if capacity * k < n:
+        raise ValueError(f"{n} points do not fit in {k} clusters of {capacity}")
+
+    rng = np.random.default_rng(seed)
+    best_labels, best_inertia = None, math.inf
+    for _ in range(n_init):
+        centroids = _kmeans_plus_plus(points, k, rng)
+        labels = None
+        for _ in range(max_iterations):
+            distances = _squared_distances(points, centroids)
+            new_labels = _capacitated_assignment(distances, capacity)
+            if labels is not None and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            counts = np.bincount(labels, minlength=k)
+            occupied = counts > 0
+            centroids[occupied] = _cluster_sums(points, labels, k)[occupied] / counts[occupied, None]
+        inertia = float(_squared_distances(points, centroids)[np.arange(n), labels].sum())
+        if inertia < best_inertia:
+            best_labels, best_inertia = labels, inertia
+    return best_labels
+
+
+def cluster_centroids(coords, labels, k):
+    """Mean (lat, lon) of each cluster as a ``(k, 2)`` array"""
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    counts = np.bincount(labels, minlength=k)
+    return _cluster_sums(coords, labels, k) / np.maximum(counts, 1)[:, None]
+
+
+def _cluster_sums(points, labels, k):
+    return np.column_stack([np.bincount(labels, weights=points[:, axis], minlength=k) for axis in range(2)])
+
+
+def _squared_distances(points, centroids):
+    # |p - c|^2 = |p|^2 - 2 p.c + |c|^2, without the (n, k, 2) intermediate
+    return np.maximum(
+        (points ** 2).sum(axis=1)[:, None] - 2 * points @ centroids.T + (centroids ** 2).sum(axis=1)[None, :], 0.0
+    )
+
+
+def _kmeans_plus_plus(points, k, rng):
+    """Seed centroids far apart: each pick is sampled proportionally to its squared distance"""
+    centroids = [points[rng.integers(len(points))]]
+    closest = ((points - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(points), p=closest / total) if total > 0 else rng.integers(len(points))
+        centroids.append(points[index])
+        closest = np.minimum(closest, ((points - points[index]) ** 2).sum(axis=1))
+    return np.array(centroids)
+
+
+def _capacitated_assignment(distances, capacity):
+    """Nearest-centroid labels with no cluster above ``capacity``
+
+    Every unassigned point proposes to its nearest cluster with room; each
+    cluster keeps its closest proposers up to its remaining room and the rest
+    propose again. A round fills at least one cluster, so there are at most
+    ``k`` rounds, each vectorized over all points.
+    """
+    n, k = distances.shape
+    labels = np.full(n, -1)
+    room = np.full(k, capacity)
+    unassigned = np.arange(n)
+    while len(unassigned):
+        cost = np.where(room > 0, distances[unassigned], np.inf)
+        choice = np.argmin(cost, axis=1)
+        order = np.lexsort((cost[np.arange(len(unassigned)), choice], choice))
+        chosen = choice[order]
+        rank = np.arange(len(order)) - np.searchsorted(chosen, chosen, side='left')
+        accepted = rank < room[chosen]
+        labels[unassigned[order[accepted]]] = chosen[accepted]
+        room -= np.bincount(chosen[accepted], minlength=k)
+        unassigned = unassigned[order[~accepted]]
+    return labels
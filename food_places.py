@@ -0,0 +1,151 @@
+import csv
+import json
+import math
+import os
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+from utils import normalize_location
+
+FoodPlace = namedtuple('FoodPlace', ['name', 'latitude', 'longitude', 'cuisines', 'price_range'])
+
+METRES_PER_DEGREE_LAT = 111_320
+
+
+class FoodPlaceIndex:
+    """Eating places on a fixed lat/lon grid for radius and nearest-neighbour queries.
+
+    Cells are ``cell_size`` degrees (about 550 m of latitude by default), so a
+    500 m radius query only scans the few cells overlapping its bounding box.
+    Cuisines are stored as normalized tags for ``serving`` filters, and names
+    go into a hash index so map code can resolve catalog restaurants offline.
+    """
+
+    def __init__(self, cell_size=0.005):
+        self.cell_size = cell_size
+        self.places = []
+        self.lats = array('d')
+        self.lons = array('d')
+        self._cuisines = []
+        self._name_index = {}
+        self._grid = {}
+
+    @classmethod
+    def from_records(cls, records, cell_size=0.005):
+        """Build an index from dicts shaped like ``landmarks_data.FOOD_PLACES``"""
+        index = cls(cell_size=cell_size)
+        index.extend(records)
+        return index
+
+    @classmethod
+    def from_file(cls, path, cell_size=0.005):
+        """Load a JSON list like ``FOOD_PLACES``, or a CSV with ``name,lat,lon,cuisines,price_range``
+
+        CSV cuisines are ``;``-separated.
+        """
+        index = cls(cell_size=cell_size)
+        index.load(path)
+        return index
+
+    def load(self, path):
+        """Add every place in a JSON or CSV file; returns how many were added"""
+        with open(path, newline='', encoding='utf-8') as f:
+            if path.lower().endswith('.csv'):
+                records = [
+                    {
+                        'name': row['name'],
+                        'coordinates': [row['lat'], row['lon']],
+                        'cuisines': [cuisine for cuisine in (row.get('cuisines') or '').split(';') if cuisine.strip()],
+                        'price_range': row.get('price_range') or '',
+                    }
+                    for row in csv.DictReader(f)
+                ]
+            else:
+                records = json.load(f)
+        return self.extend(records)
+
+    def extend(self, records):
+        added = 0
+        for record in records:
+            try:
+                latitude, longitude = (float(value) for value in record['coordinates'])
+            except (KeyError, TypeError, ValueError):
+                continue  # Skip malformed rows rather than failing the whole load
+            self.add(record['name'], latitude, longitude, record.get('cuisines', ()), record.get('price_range', ''))
+            added += 1
+        return added
+
+    def add(self, name, latitude, longitude, cuisines=(), price_range=''):
+        """Add one eating place to the name and spatial indexes"""
+        row = len(self.places)
+        self.places.append(FoodPlace(name, latitude, longitude, tuple(cuisines), price_range))
+        self.lats.append(latitude)
+        self.lons.append(longitude)
+        self._cuisines.append(tuple(normalize_location(cuisine) for cuisine in cuisines))
+        self._name_index.setdefault(normalize_location(name), row)
+        self._grid.setdefault(self._cell(latitude, longitude), []).append(row)
+        return row
+
+    def __len__(self):
+        return len(self.places)
+
+    def lookup(self, name):
+        """Return the place with this (normalized) name, or ``None``"""
+        row = self._name_index.get(normalize_location(name))
+        return None if row is None else self.places[row]
+
+    def within(self, latitude, longitude, radius_m=500, serving=None, limit=None):
+        """``(distance_m, FoodPlace)`` pairs within ``radius_m`` of a point, closest first
+
+        ``serving`` keeps only places with a cuisine tag containing it
+        (e.g. ``"biryani"`` or ``"south indian"``).
+        """
+        d_lat = radius_m / METRES_PER_DEGREE_LAT
+        d_lon = d_lat / max(math.cos(math.radians(latitude)), 1e-6)
+        lat_min, lon_min = self._cell(latitude - d_lat, longitude - d_lon)
+        lat_max, lon_max = self._cell(latitude + d_lat, longitude + d_lon)
+        serving = normalize_location(serving) if serving else None
+
+        # Equirectangular distances: well under 0.1% off haversine at these radii
+        x_scale = METRES_PER_DEGREE_LAT * math.cos(math.radians(latitude))
+        max_squared = radius_m * radius_m
+        lats, lons = self.lats, self.lons
+        found = []
+        for cell_lat in range(lat_min, lat_max + 1):
+            for cell_lon in range(lon_min, lon_max + 1):
+                for row in self._grid.get((cell_lat, cell_lon), ()):
+                    dy = (lats[row] - latitude) * METRES_PER_DEGREE_LAT
+                    dx = (lons[row] - longitude) * x_scale
+                    squared = dx * dx + dy * dy
+                    if squared > max_squared:
+                        continue
+                    if serving and not any(serving in cuisine for cuisine in self._cuisines[row]):
+                        continue
+                    found.append((math.sqrt(squared), row))
+        found.sort()
+        return [(distance, self.places[row]) for distance, row in found[:limit]]
+
+    def nearest(self, latitude, longitude, k=3, serving=None, max_radius_m=5000):
+        """Up to ``k`` closest ``(distance_m, FoodPlace)`` pairs no further than ``max_radius_m``"""
+        radius = self.cell_size * METRES_PER_DEGREE_LAT / 2
+        while radius < max_radius_m:
+            found = self.within(latitude, longitude, radius, serving, limit=k)
+            if len(found) >= k:
+                return found
+            radius *= 2
+        return self.within(latitude, longitude, max_radius_m, serving, limit=k)
+
+    def _cell(self, latitude, longitude):
+        return (int(math.floor(latitude / self.cell_size)), int(math.floor(longitude / self.cell_size)))
+
+
+@lru_cache(maxsize=1)
+def food_place_index():
+    """Process-wide index of the built-in catalog plus ``FOOD_PLACES_PATH``, if set"""
+    from landmarks_data import FOOD_PLACES
+    index = FoodPlaceIndex.from_records(FOOD_PLACES)
+    path = os.getenv("FOOD_PLACES_PATH")
+    if path:
+        index.load(path)
+    return index
@@ -0,0 +1,133 @@
+import math
+from collections import Counter
+from itertools import chain
+
+
+def trigrams(text):
+    """Return the padded character trigrams of a string"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, max_distance=None):
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)
+
+    Returns ``max_distance + 1`` as soon as the distance is known to exceed
+    ``max_distance``, which keeps verification cheap for poor candidates.
+    """
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class TrigramIndex:
+    """Typo-tolerant lookup over a set of names.
+
+    A trigram inverted index, bucketed by key length, narrows the catalog
+    down to a handful of candidates sharing the most trigrams with the query;
+    only those are verified with a bounded edit distance.
+    """
+
+    def __init__(self, candidates_to_verify=16):
+        self.candidates_to_verify = candidates_to_verify
+        self._keys = []
+        self._values = []
+        self._ids = {}
+        self._postings = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, value):
+        """Index ``key``; re-adding an existing key replaces its value"""
+        if key in self._ids:
+            self._values[self._ids[key]] = value
+            return
+        key_id = len(self._keys)
+        self._ids[key] = key_id
+        self._keys.append(key)
+        self._values.append(value)
+        length = len(key)
+        for gram in trigrams(key):
+            self._postings.setdefault(gram, {}).setdefault(length, []).append(key_id)
+
+    def search(self, query, limit=1, min_similarity=0.0, max_distance=None):
+        """Return up to ``limit`` ``(similarity, key, value)`` tuples, best first
+
+        Similarity is ``1 - distance / max(len(query), len(key))``. With
+        ``max_distance``, keys more than that many edits away are skipped too.
+        """
+        if not query:
+            return []
+        key_id = self._ids.get(query)
+        if key_id is not None:
+            return [(1.0, query, self._values[key_id])]
+
+        # Keys much shorter or longer than the query can't reach min_similarity or max_distance
+        if min_similarity:
+            lengths = range(math.ceil(len(query) * min_similarity), int(len(query) / min_similarity) + 1)
+        else:
+            lengths = None
+        if max_distance is not None:
+            lengths = range(
+                max(len(query) - max_distance, lengths.start if lengths else 0),
+                min(len(query) + max_distance, lengths.stop - 1 if lengths else len(query) + max_distance) + 1
+            )
+        postings = []
+        query_grams = trigrams(query)
+        for gram in query_grams:
+            buckets = self._postings.get(gram)
+            if not buckets:
+                continue
+            if lengths is None:
+                postings.extend(buckets.values())
+            else:
+                postings.extend(buckets[length] for length in lengths if length in buckets)
+        counts = Counter(chain.from_iterable(postings))
+        if not counts:
+            return []
+
+        # q-gram lemma: an edit (a transposition included) destroys at most four
+        # trigrams, so anything sharing fewer cannot be within the allowed distance.
+        # Candidates a full edit behind the best count are unlikely winners too.
+        max_query_distance = int(len(query) * (1.0 - min_similarity) / min_similarity) if min_similarity else len(query)
+        if max_distance is not None:
+            max_query_distance = min(max_query_distance, max_distance)
+        cutoff = max(len(query_grams) - 4 * max_query_distance, max(counts.values()) - 4, 1)
+        candidates = [(count, key_id) for key_id, count in counts.items() if count >= cutoff]
+        candidates.sort(reverse=True)
+        candidates = candidates[:self.candidates_to_verify]
+
+        results = []
+        best_distance = None
+        for _, key_id in candidates:
+            key = self._keys[key_id]
+            longest = max(len(query), len(key))
+            allowed = int(longest * (1.0 - min_similarity))
+            if max_distance is not None:
+                allowed = min(allowed, max_distance)
+            if best_distance is not None and limit == 1:
+                allowed = min(allowed, best_distance)
+            distance = edit_distance(query, key, allowed)
+            if distance > allowed:
+                continue
+            best_distance = distance if best_distance is None else min(best_distance, distance)
+            similarity = 1.0 - distance / longest
+            if similarity >= min_similarity:
+                results.append((similarity, key, self._values[key_id]))
+            if limit == 1 and distance <= 1:
+                break  # Exact matches were handled above, one edit is the best possible
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results[:limit]
@@ -0,0 +1,195 @@
+import math
+from array import array
+from collections import namedtuple
+
+from utils import normalize_location
+
+EARTH_RADIUS_KM = 6371.0
+
+GazetteerLocation = namedtuple('GazetteerLocation', ['address', 'latitude', 'longitude'])
+
+# Column layout of a GeoNames dump (allCountries.txt, cities500.txt, ...)
+GEONAMES_NAME = 1
+GEONAMES_ASCIINAME = 2
+GEONAMES_ALTERNATES = 3
+GEONAMES_LAT = 4
+GEONAMES_LON = 5
+GEONAMES_COUNTRY = 8
+GEONAMES_POPULATION = 14
+
+
+class GazetteerGeocoder:
+    """Offline geocoder backed by a local gazetteer dump.
+
+    Names (primary, ASCII and alternates) go into a hash index of normalized
+    name -> row ids; coordinates live in flat arrays with a lat/lon grid on top
+    for nearest-place queries. ``geocode`` mirrors the geopy call that
+    ``MapGenerator._get_coordinates`` makes, so it can stand in for Nominatim.
+    """
+
+    def __init__(self, cell_size=1.0):
+        self.cell_size = cell_size
+        self.names = []
+        self.countries = []
+        self.lats = array('d')
+        self.lons = array('d')
+        self.populations = array('q')
+        self._name_index = {}
+        self._grid = {}
+
+    @classmethod
+    def from_file(cls, path, cell_size=1.0):
+        """Load a GeoNames-style TSV, or a plain ``name<TAB>lat<TAB>lon[<TAB>country<TAB>population]`` file"""
+        gazetteer = cls(cell_size=cell_size)
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                cols = line.rstrip('\n').split('\t')
+                try:
+                    if len(cols) > GEONAMES_POPULATION:
+                        alternates = [cols[GEONAMES_ASCIINAME]]
+                        if cols[GEONAMES_ALTERNATES]:
+                            alternates.extend(cols[GEONAMES_ALTERNATES].split(','))
+                        gazetteer.add(
+                            cols[GEONAMES_NAME],
+                            float(cols[GEONAMES_LAT]),
+                            float(cols[GEONAMES_LON]),
+                            country=cols[GEONAMES_COUNTRY],
+                            population=int(cols[GEONAMES_POPULATION] or 0),
+                            alternate_names=alternates
+                        )
+                    else:
+                        gazetteer.add(
+                            cols[0],
+                            float(cols[1]),
+                            float(cols[2]),
+                            country=cols[3] if len(cols) > 3 else '',
+                            population=int(cols[4]) if len(cols) > 4 and cols[4] else 0
+                        )
+                except (IndexError, ValueError):
+                    continue  # Skip malformed rows rather than failing the whole load
+        return gazetteer
+
+    def add(self, name, latitude, longitude, country='', population=0, alternate_names=()):
+        """Add one place to the name and spatial indexes"""
+        row = len(self.names)
+        self.names.append(name)
+        self.countries.append(country.upper())
+        self.lats.append(latitude)
+        self.lons.append(longitude)
+        self.populations.append(population)
+
+        keys = {normalize_location(name)}
+        keys.update(normalize_location(alt) for alt in alternate_names if alt)
+        keys.discard('')
+        for key in keys:
+            self._name_index.setdefault(key, []).append(row)
+        self._grid.setdefault(self._cell(latitude, longitude), []).append(row)
+        return row
+
+    def __len__(self):
+        return len(self.names)
+
+    def geocode(self, query, timeout=None):
+        """Resolve a place name to a location, preferring the most populous match"""
+        row = self.lookup(query)
+        if row is None:
+            return None
+        return GazetteerLocation(self._address(row), self.lats[row], self.lons[row])
+
+    def lookup(self, query):
+        """Return the row id for a query, or ``None``"""
+        key = normalize_location(query)
+        if not key:
+            return None
+        rows = self._name_index.get(key)
+        if rows:
+            return self._best(rows)
+
+        # "Paris, France" / "Paris, FR": match the first part, use the rest to narrow down
+        parts = [part.strip() for part in key.split(',') if part.strip()]
+        if len(parts) < 2:
+            return None
+        rows = self._name_index.get(parts[0])
+        if not rows:
+            return None
+        qualifier = parts[-1]
+        if len(qualifier) == 2:
+            narrowed = [row for row in rows if self.countries[row].lower() == qualifier]
+            rows = narrowed or rows
+        return self._best(rows)
+
+    def nearest(self, latitude, longitude, k=1, max_rings=3):
+        """Return up to ``k`` ``(distance_km, location)`` pairs closest to a point
+
+        Rings of grid cells around the point are scanned until the ``k``-th
+        best distance is inside the radius the scanned cells fully cover, so a
+        closer place in the next ring can't be missed. Only places within
+        ``max_rings`` cells are considered.
+        """
+        base_lat, base_lon = self._cell(latitude, longitude)
+        scored = []
+        for ring in range(max_rings + 1):
+            for d_lat in range(-ring, ring + 1):
+                for d_lon in range(-ring, ring + 1):
+                    if max(abs(d_lat), abs(d_lon)) != ring:
+                        continue
+                    for row in self._grid.get((base_lat + d_lat, base_lon + d_lon), ()):
+                        scored.append((haversine_km(latitude, longitude, self.lats[row], self.lons[row]), row))
+            if len(scored) >= k:
+                scored.sort()
+                if scored[k - 1][0] <= self._covered_km(latitude, longitude, ring):
+                    break
+
+        scored.sort()
+        return [
+            (distance, GazetteerLocation(self._address(row), self.lats[row], self.lons[row]))
+            for distance, row in scored[:k]
+        ]
+
+    def _best(self, rows):
+        return max(rows, key=lambda row: self.populations[row])
+
+    def _address(self, row):
+        if self.countries[row]:
+            return f"{self.names[row]}, {self.countries[row]}"
+        return self.names[row]
+
+    def _covered_km(self, latitude, longitude, ring):
+        """Radius around a point that lies entirely inside the cells up to ``ring`` rings out"""
+        base_lat, base_lon = self._cell(latitude, longitude)
+        north = (base_lat + ring + 1) * self.cell_size - latitude
+        south = latitude - (base_lat - ring) * self.cell_size
+        east = (base_lon + ring + 1) * self.cell_size - longitude
+        west = longitude - (base_lon - ring) * self.cell_size
+        lat_km = EARTH_RADIUS_KM * math.radians(min(north, south))
+        # A meridian d_lon degrees away comes no closer than asin(cos(lat) * sin(d_lon)),
+        # so cells cover less ground east-west the further the point is from the equator
+        d_lon = math.radians(min(east, west, 90.0))
+        lon_km = EARTH_RADIUS_KM * math.asin(math.cos(math.radians(latitude)) * math.sin(d_lon))
+        return min(lat_km, lon_km)
+
+    def _cell(self, latitude, longitude):
+        return (int(math.floor(latitude / self.cell_size)), int(math.floor(longitude / self.cell_size)))
+
+
+class ChainedGeocoder:
+    """Try several geocoders in order and return the first hit"""
+
+    def __init__(self, geocoders):
+        self.geocoders = list(geocoders)
+
+    def geocode(self, query, timeout=None):
+        for geocoder in self.geocoders:
+            location = geocoder.geocode(query, timeout=timeout)
+            if location:
+                return location
+        return None
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a))
@@ -0,0 +1,156 @@
+import csv
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from ttl_cache import USE_DEFAULT
+from utils import normalize_location
+
+DEFAULT_TTL = 30 * 24 * 3600  # 30 days for successful lookups
+DEFAULT_NEGATIVE_TTL = 24 * 3600  # 1 day for places Nominatim could not find
+
+
+class GeocodeCache:
+    """Two-tier geocoding cache: an in-process LRU in front of a SQLite store.
+
+    Entries are keyed on the normalized location string. A value of ``None``
+    is a negative entry (the geocoder found nothing) and is kept for a shorter
+    TTL so misses don't hit the network on every request either. TTLs follow
+    ``ttl_cache``: ``None`` never expires and ``0`` skips caching.
+    """
+
+    def __init__(self, db_path=None, max_memory_entries=1024, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'negative_hits': 0,
+            'expired': 0,
+        }
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "key TEXT PRIMARY KEY, lat REAL, lon REAL, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def lookup(self, location_name):
+        """Return ``(found, coords)``; coords is ``None`` for a cached miss"""
+        key = normalize_location(location_name)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                coords, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._record_hit(coords, 'memory_hits')
+                    return True, coords
+                del self._memory[key]
+                self._stats['expired'] += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT lat, lon, expires_at FROM geocode WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    lat, lon, expires_at = row
+                    if expires_at is None or expires_at > now:
+                        coords = (lat, lon) if lat is not None else None
+                        self._remember(key, coords, expires_at)
+                        self._record_hit(coords, 'disk_hits')
+                        return True, coords
+                    self._conn.execute("DELETE FROM geocode WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._stats['expired'] += 1
+
+            self._stats['misses'] += 1
+            return False, None
+
+    def set(self, location_name, coords, ttl=USE_DEFAULT):
+        """Store coordinates (or ``None`` for a negative entry) for a location
+
+        ``ttl`` overrides the default lifetime; ``None`` never expires and
+        ``0`` doesn't store the entry.
+        """
+        key = normalize_location(location_name)
+        if ttl is USE_DEFAULT:
+            ttl = self.ttl if coords is not None else self.negative_ttl
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._remember(key, coords, expires_at)
+            if self._conn is not None:
+                lat, lon = coords if coords is not None else (None, None)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO geocode (key, lat, lon, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, lat, lon, expires_at)
+                )
+                self._conn.commit()
+
+    def seed_from_file(self, path):
+        """Pre-populate the cache from a CSV (name,lat,lon) or JSON ({name: [lat, lon]}) file
+
+        Seeded entries never expire. Returns the number of entries loaded.
+        """
+        if path.lower().endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                records = [(name, coords[0], coords[1]) for name, coords in json.load(f).items()]
+        else:
+            with open(path, newline='', encoding='utf-8') as f:
+                records = [
+                    (row[0], row[1], row[2]) for row in csv.reader(f)
+                    if len(row) >= 3 and row[0] and not row[0].startswith('#')
+                ]
+
+        count = 0
+        for name, lat, lon in records:
+            try:
+                self.set(name, (float(lat), float(lon)), ttl=None)
+                count += 1
+            except (TypeError, ValueError):
+                continue  # Skip header rows and malformed lines
+        return count
+
+    def stats(self):
+        """Return hit/miss counters and current tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_size'] = len(self._memory)
+            if self._conn is not None:
+                stats['disk_size'] = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Drop every cached entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM geocode")
+                self._conn.commit()
+
+    def _remember(self, key, coords, expires_at):
+        self._memory[key] = (coords, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _record_hit(self, coords, tier):
+        self._stats['hits'] += 1
+        self._stats[tier] += 1
+        if coords is None:
+            self._stats['negative_hits'] += 1
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import metrics
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HuggingFaceError(Exception):
+    """Base error for Hugging Face inference calls"""
+
+    def __init__(self, message, status_code=None, attempts=0, retryable=False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.attempts = attempts
+        self.retryable = retryable
+
+
+class HuggingFaceAuthError(HuggingFaceError):
+    """The API key was rejected (401/403)"""
+
+
+class HuggingFaceUnavailableError(HuggingFaceError):
+    """The model is loading, overloaded or rate-limited and retries ran out"""
+
+
+class HuggingFaceTimeoutError(HuggingFaceError):
+    """The overall deadline passed before a usable response arrived"""
+
+
+class HuggingFaceResponseError(HuggingFaceError):
+    """The API answered but the payload had no usable generated text"""
+
+
+class HuggingFaceClient:
+    """Pooled Hugging Face inference client with jittered exponential backoff.
+
+    One ``requests.Session`` is kept per client so connections (and TLS
+    sessions) are reused across generations; share a client between planners
+    to share the pool. ``agenerate`` is the asyncio variant of ``generate``
+    and uses its own ``httpx.AsyncClient`` pool of the same size.
+    """
+
+    def __init__(self, api_url, api_key, pool_size=10, max_attempts=3, attempt_timeout=30,
+                 deadline=60, backoff_base=0.5, backoff_max=8.0):
+        self.api_url = api_url
+        self.max_attempts = max_attempts
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+        # Created on first use by agenerate; an httpx pool belongs to one event loop
+        self._async_client = None
+        self._async_loop = None
+
+    def generate(self, prompt, parameters=None, deadline=None):
+        """Return the generated text for a prompt, retrying transient failures"""
+        payload = {"inputs": prompt, "parameters": parameters or {}}
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        last_error = None
+        for attempt in range(1, self.max_attempts + 1):
+            timeout = self._attempt_timeout(deadline_at)
+            if timeout is None:
+                break
+            try:
+                with metrics.span('hf_request'):
+                    response = self.session.post(self.api_url, json=payload, timeout=timeout)
+            except requests.RequestException as e:
+                metrics.inc('hf_responses_total', status='network')
+                last_error = HuggingFaceError(f"Network error: {e}", attempts=attempt, retryable=True)
+                delay = self._backoff(attempt)
+            else:
+                metrics.inc('hf_responses_total', status=str(response.status_code))
+                result = self._handle_response(response, attempt)
+                if not isinstance(result, HuggingFaceError):
+                    return result
+                last_error = result
+                delay = self._retry_delay(response, attempt)
+            if not last_error.retryable or attempt == self.max_attempts:
+                break
+            if time.monotonic() + delay >= deadline_at:
+                break
+            metrics.inc('hf_retries_total')
+            time.sleep(delay)
+        raise self._final_error(last_error, deadline_at)
+
+    async def agenerate(self, prompt, parameters=None, deadline=None):
+        """Asyncio variant of ``generate``, on a pooled ``httpx.AsyncClient``
+
+        Attempts are real coroutines, so the deadline (or cancelling the
+        caller) aborts the request instead of leaving it running on a thread.
+        """
+        import httpx
+
+        client = self._get_async_client()
+        payload = {"inputs": prompt, "parameters": parameters or {}}
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        last_error = None
+        for attempt in range(1, self.max_attempts + 1):
+            timeout = self._attempt_timeout(deadline_at)
+            if timeout is None:
+                break
+            try:
+                with metrics.span('hf_request'):
+                    response = await asyncio.wait_for(client.post(self.api_url, json=payload), timeout=timeout)
+            except (httpx.HTTPError, asyncio.TimeoutError) as e:
+                metrics.inc('hf_responses_total', status='network')
+                last_error = HuggingFaceError(f"Network error: {e}", attempts=attempt, retryable=True)
+                delay = self._backoff(attempt)
+            else:
+                metrics.inc('hf_responses_total', status=str(response.status_code))
+                result = self._handle_response(response, attempt)
+                if not isinstance(result, HuggingFaceError):
+                    return result
+                last_error = result
+                delay = self._retry_delay(response, attempt)
+            if not last_error.retryable or attempt == self.max_attempts:
+                break
+            if time.monotonic() + delay >= deadline_at:
+                break
+            metrics.inc('hf_retries_total')
+            await asyncio.sleep(delay)
+        raise self._final_error(last_error, deadline_at)
+
+    def stream(self, prompt, parameters=None, deadline=None):
+        """Yield generated text chunks as the model produces them
+
+        Uses the server-sent-events stream of text-generation endpoints. If the
+        model doesn't stream, the whole generated text is yielded as one chunk.
+        Only connecting is retried; once tokens have been yielded, errors propagate.
+        """
+        payload = {"inputs": prompt, "parameters": parameters or {}, "stream": True}
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        last_error = None
+        for attempt in range(1, self.max_attempts + 1):
+            timeout = self._attempt_timeout(deadline_at)
+            if timeout is None:
+                break
+            try:
+                # Time to the response headers; the tokens that follow are paced by the caller
+                with metrics.span('hf_request'):
+                    response = self.session.post(self.api_url, json=payload, timeout=timeout, stream=True)
+            except requests.RequestException as e:
+                metrics.inc('hf_responses_total', status='network')
+                last_error = HuggingFaceError(f"Network error: {e}", attempts=attempt, retryable=True)
+                delay = self._backoff(attempt)
+            else:
+                metrics.inc('hf_responses_total', status=str(response.status_code))
+                if response.status_code == 200:
+                    yield from self._iter_stream(response, attempt)
+                    return
+                last_error = self._handle_response(response, attempt)
+                delay = self._retry_delay(response, attempt)
+                response.close()
+            if not last_error.retryable or attempt == self.max_attempts:
+                break
+            if time.monotonic() + delay >= deadline_at:
+                break
+            metrics.inc('hf_retries_total')
+            time.sleep(delay)
+        raise self._final_error(last_error, deadline_at)
+
+    def close(self):
+        self.session.close()
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = self._async_loop = None
+
+    def _get_async_client(self):
+        """The pooled async client, recreated when called from a new event loop"""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            limits = httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            self._async_client = httpx.AsyncClient(
+                headers={"Authorization": self.session.headers["Authorization"]},
+                limits=limits,
+                timeout=self.attempt_timeout,
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def _iter_stream(self, response, attempt):
+        with response:
+            if not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                result = self._handle_response(response, attempt)
+                if isinstance(result, HuggingFaceError):
+                    raise result
+                yield result
+                return
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[len("data:"):])
+                    if event.get("error"):
+                        raise HuggingFaceResponseError(event["error"], response.status_code, attempt)
+                    token = event.get("token") or {}
+                    if token.get("text") and not token.get("special"):
+                        yield token["text"]
+            except requests.RequestException as e:
+                raise HuggingFaceError(f"Stream interrupted: {e}", attempts=attempt) from e
+            except ValueError as e:
+                raise HuggingFaceResponseError(f"Malformed stream event: {e}", response.status_code, attempt) from e
+
+    def _handle_response(self, response, attempt):
+        """Return generated text, or a HuggingFaceError describing why not"""
+        status = response.status_code
+        if status == 200:
+            try:
+                result = response.json()
+            except ValueError:
+                return HuggingFaceResponseError("Response was not valid JSON", status, attempt)
+            if isinstance(result, list) and result and isinstance(result[0], dict):
+                return result[0].get('generated_text', '')
+            return HuggingFaceResponseError("Response had no generated text", status, attempt)
+        if status in (401, 403):
+            return HuggingFaceAuthError("Invalid Hugging Face API key", status, attempt)
+        if status in RETRYABLE_STATUS_CODES:
+            message = "AI model is loading" if status == 503 else f"API returned status {status}"
+            return HuggingFaceUnavailableError(message, status, attempt, retryable=True)
+        return HuggingFaceError(f"API returned status {status}", status, attempt)
+
+    def _attempt_timeout(self, deadline_at):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(self.attempt_timeout, remaining)
+
+    def _backoff(self, attempt):
+        # Full jitter: spread retries from many sessions instead of synchronising them
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _retry_delay(self, response, attempt):
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return self._backoff(attempt)
+
+    def _final_error(self, last_error, deadline_at):
+        if last_error is None or (last_error.retryable and time.monotonic() >= deadline_at):
+            attempts = last_error.attempts if last_error else 0
+            status = last_error.status_code if last_error else None
+            return HuggingFaceTimeoutError("Deadline exceeded waiting for the AI model", status, attempts)
+        return last_error
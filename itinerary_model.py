@@ -0,0 +1,219 @@
+"""Compact in-memory model of an itinerary, with a string-table serializer.
+
+Itineraries travel through the app as nested dicts. ``Itinerary.from_dict``
+turns one into ``__slots__`` objects (no per-object ``__dict__``, no repeated
+key strings) with template strings interned, so the many copies of
+"Morning", "$20-60" or a landmark description share one string object.
+``to_dict`` rebuilds an equal dict, with the same keys present (sequences
+come back as lists), so callers can keep working with dicts.
+
+``dumps``/``loads`` write each record as a positional row of its slots with
+``marshal``, which stores a repeated interned string once and interns it
+again on load. The bytes are meant for stores inside one deployment (such as
+``session_store``), not for archiving: marshal's format follows the Python
+version.
+"""
+import copy
+import marshal
+import sys
+from operator import attrgetter
+
+FORMAT_VERSION = 2
+
+# Strings longer than this (e.g. a raw AI response) are not worth interning
+INTERN_MAX_LENGTH = 256
+
+# Field kinds for serialization: a string (or None), a tuple of strings, or any JSON value
+STRING, STRINGS, VALUE = 's', 'l', 'v'
+
+
+def _intern(value):
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _intern_strings(values):
+    return tuple(_intern(value) for value in values)
+
+
+class _Record:
+    """Base for the model classes: fixed fields plus a bitmask of which were present in the dict"""
+
+    __slots__ = ('_present', 'extra')
+    _fields = ()
+
+    def __init__(self, values=None):
+        values = dict(values or {})
+        present = 0
+        for bit, (field, kind) in enumerate(self._fields):
+            if field in values:
+                present |= 1 << bit
+                value = values.pop(field)
+                if kind == STRING:
+                    value = _intern(value)
+                elif kind == STRINGS and value is not None:
+                    value = _intern_strings(value)
+            else:
+                value = None
+            setattr(self, field, value)
+        self._present = present
+        # Unknown keys are copied so the caller's dict and this record never share a mutable value
+        self.extra = copy.deepcopy(values) if values else None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data)
+
+    def to_dict(self):
+        present = self._present
+        data = {
+            field: list(value) if kind == STRINGS and value is not None else value
+            for (field, kind, bit), value in zip(self._layout, self._values(self)) if present & bit
+        }
+        if self.extra:
+            data.update(copy.deepcopy(self.extra))
+        return data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Activity(_Record):
+    _fields = (
+        ('name', STRING), ('time', STRING), ('description', STRING), ('estimated_cost', STRING),
+        ('specific_places', STRINGS), ('food_items', STRINGS), ('nearby_restaurants', STRINGS),
+    )
+    __slots__ = tuple(field for field, _ in _fields)
+
+
+class FoodItem(_Record):
+    _fields = (('name', STRING), ('description', STRING), ('price_range', STRING), ('restaurant', STRING))
+    __slots__ = tuple(field for field, _ in _fields)
+
+
+class Day:
+    """One ``daily_plan`` entry: its label ("Day 1") and activities"""
+
+    __slots__ = ('label', 'activities')
+
+    def __init__(self, label, activities):
+        self.label = _intern(label)
+        self.activities = tuple(activities)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.label == other.label and self.activities == other.activities
+
+    def __repr__(self):
+        return f"Day({self.label!r}, {list(self.activities)!r})"
+
+
+class Itinerary(_Record):
+    _fields = (
+        ('destination', STRING), ('budget', STRING), ('num_people', VALUE), ('num_days', VALUE),
+        ('interests', STRINGS), ('raw_response', STRING), ('daily_plan', VALUE),
+        ('food_recommendations', VALUE), ('travel_tips', STRINGS), ('total_estimated_cost', VALUE),
+    )
+    __slots__ = tuple(field for field, _ in _fields)
+
+    def __init__(self, values=None):
+        values = dict(values or {})
+        daily_plan = values.get('daily_plan')
+        if daily_plan is not None:
+            values['daily_plan'] = tuple(
+                Day(label, [Activity(activity) for activity in activities])
+                for label, activities in daily_plan.items()
+            )
+        food_recommendations = values.get('food_recommendations')
+        if food_recommendations is not None:
+            values['food_recommendations'] = tuple(FoodItem(item) for item in food_recommendations)
+        super().__init__(values)
+
+    def to_dict(self):
+        data = super().to_dict()
+        if data.get('daily_plan') is not None:
+            data['daily_plan'] = {
+                day.label: [activity.to_dict() for activity in day.activities] for day in self.daily_plan
+            }
+        if data.get('food_recommendations') is not None:
+            data['food_recommendations'] = [item.to_dict() for item in self.food_recommendations]
+        return data
+
+
+for _cls in (Activity, FoodItem, Itinerary):
+    _cls._layout = tuple((field, kind, 1 << bit) for bit, (field, kind) in enumerate(_cls._fields))
+    _cls._values = attrgetter(*(field for field, _ in _cls._fields))
+
+
+def _row_filler(names):
+    """Return ``fill(record, row)`` assigning ``row`` to the slots ``names`` in one statement
+
+    Generated like the namedtuple helpers: a single unpacking assignment is
+    several times faster than a ``setattr`` loop, and ``loads`` runs it once
+    per activity.
+    """
+    namespace = {}
+    exec(f"def fill(record, row):\n    {', '.join(f'record.{name}' for name in names)}, = row\n", namespace)
+    return namespace['fill']
+
+
+def _row_layout(cls, skip=()):
+    """Row codec for ``cls``: ``(getter, fill)`` over its presence mask, kept fields and ``extra``"""
+    names = ('_present',) + tuple(field for field, _ in cls._fields if field not in skip) + ('extra',)
+    return attrgetter(*names), _row_filler(names)
+
+
+_ITINERARY_SKIP = ('daily_plan', 'food_recommendations')
+_activity_row, _fill_activity = _row_layout(Activity)
+_food_row, _fill_food = _row_layout(FoodItem)
+_itinerary_row, _fill_itinerary = _row_layout(Itinerary, _ITINERARY_SKIP)
+
+
+def dumps(itinerary):
+    """Serialize an Itinerary (or itinerary dict) to compact bytes"""
+    if isinstance(itinerary, dict):
+        itinerary = Itinerary.from_dict(itinerary)
+    days = None
+    if itinerary.daily_plan is not None:
+        days = tuple(
+            (day.label, tuple(_activity_row(activity) for activity in day.activities))
+            for day in itinerary.daily_plan
+        )
+    food = None
+    if itinerary.food_recommendations is not None:
+        food = tuple(_food_row(item) for item in itinerary.food_recommendations)
+    return marshal.dumps((FORMAT_VERSION, _itinerary_row(itinerary), days, food))
+
+
+def loads(data):
+    """Rebuild an Itinerary from ``dumps`` output"""
+    version, body, days, food = marshal.loads(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported itinerary format version {version}")
+    new = object.__new__
+
+    itinerary = new(Itinerary)
+    _fill_itinerary(itinerary, body)
+    itinerary.daily_plan = None
+    if days is not None:
+        plan = []
+        for label, rows in days:
+            activities = []
+            for row in rows:
+                activity = new(Activity)
+                _fill_activity(activity, row)
+                activities.append(activity)
+            plan.append(Day(label, activities))
+        itinerary.daily_plan = tuple(plan)
+    itinerary.food_recommendations = None
+    if food is not None:
+        items = []
+        for row in food:
+            item = new(FoodItem)
+            _fill_food(item, row)
+            items.append(item)
+        itinerary.food_recommendations = tuple(items)
+    return itinerary
@@ -0,0 +1,174 @@
+import re
+from collections import namedtuple
+
+# kind is 'day' (key=day label, value=activities), 'food' (value=food item) or 'tip' (value=tip text)
+ParseEvent = namedtuple('ParseEvent', ['kind', 'key', 'value'])
+
+NUMBER_WORDS = [
+    'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+    'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen',
+    'eighteen', 'nineteen', 'twenty', 'thirty'
+]
+FOOD_WORDS = ['food', 'restaurant', 'cuisine', 'dining']
+TIP_WORDS = ['tip', 'advice', 'recommendation', 'note']
+TIME_WORDS = ['morning', 'afternoon', 'evening', 'am', 'pm']
+# Looser keyword sets used to salvage food/tips from text without clear sections
+FALLBACK_FOOD_WORDS = ['food', 'restaurant', 'dish', 'cuisine', 'eat', 'dining', 'meal']
+FALLBACK_TIP_WORDS = ['tip', 'advice', 'remember', 'important', 'note', 'recommend']
+FALLBACK_LIMIT = 5
+BULLETS = ('-', '•', '*')
+
+
+# Matched against the lowercased line, and only after a cheap ``'day' in line`` check
+DAY_PATTERN = re.compile(
+    r'\bday\s*(?:\d+|(?:twenty|thirty)[\s-]?(?:one|two|three|four|five|six|seven|eight|nine)|'
+    + '|'.join(NUMBER_WORDS) + r')\b'
+)
+# Keyword -> category bits, so one pass over the keywords classifies a line for every section.
+# Python's re has no multi-pattern fast path, so substring checks beat a regex alternation here.
+FOOD, TIP, FALLBACK_FOOD, FALLBACK_TIP = 1, 2, 4, 8
+KEYWORD_CATEGORIES = {}
+for _words, _bit in ((FOOD_WORDS, FOOD), (TIP_WORDS, TIP),
+                     (FALLBACK_FOOD_WORDS, FALLBACK_FOOD), (FALLBACK_TIP_WORDS, FALLBACK_TIP)):
+    for _word in _words:
+        KEYWORD_CATEGORIES[_word] = KEYWORD_CATEGORIES.get(_word, 0) | _bit
+KEYWORD_CATEGORIES = tuple(KEYWORD_CATEGORIES.items())
+
+
+def classify_keywords(lowered):
+    """Return the OR of the category bits of every keyword found in a lowercased line"""
+    categories = 0
+    for keyword, bits in KEYWORD_CATEGORIES:
+        if keyword in lowered:
+            categories |= bits
+    return categories
+
+
+def is_day_header(lowered):
+    return 'day' in lowered and DAY_PATTERN.search(lowered) is not None
+
+
+def parse_activity(line):
+    """Turn a bullet line into an activity dict, splitting off a leading time of day"""
+    activity = {
+        'name': line.lstrip('-•* ').strip(),
+        'time': 'Flexible timing',
+        'description': 'Activity details from AI recommendation',
+        'estimated_cost': 'Varies'
+    }
+    if ':' in line and any(time_word in line.lower() for time_word in TIME_WORDS):
+        parts = line.split(':')
+        if len(parts) >= 2:
+            activity['time'] = parts[0].lstrip('-•* ').strip()
+            activity['name'] = parts[1].strip()
+    return activity
+
+
+def parse_food_item(line):
+    """Turn a bullet line into a food recommendation, splitting off '@ restaurant' / 'at restaurant'"""
+    food_item = {
+        'name': line.lstrip('-•* ').strip(),
+        'description': 'Local specialty dish',
+        'price_range': 'Moderate',
+        'restaurant': None
+    }
+    if '@' in line or 'at ' in line.lower():
+        parts = line.split('@') if '@' in line else line.split(' at ')
+        if len(parts) >= 2:
+            food_item['name'] = parts[0].lstrip('-•* ').strip()
+            food_item['restaurant'] = parts[1].strip()
+    return food_item
+
+
+class IncrementalItineraryParser:
+    """Parse AI itinerary text as it streams in.
+
+    ``feed`` accepts arbitrary chunks (tokens, partial lines) and returns the
+    events completed by them: a day is emitted once the next section starts,
+    food items and tips as soon as their line is complete. ``close`` flushes
+    whatever is left. The accumulated results are in ``daily_plan``,
+    ``food_recommendations`` and ``travel_tips``.
+
+    Each line is lowercased and classified once against every keyword set
+    (see ``classify_keywords``), and day headers of any number. The same pass
+    collects ``food_lines`` and ``tip_lines`` - loosely matching lines used
+    as fallbacks when the text has no clear food or tips sections.
+    """
+
+    def __init__(self):
+        self.daily_plan = {}
+        self.food_recommendations = []
+        self.travel_tips = []
+        self.food_lines = []
+        self.tip_lines = []
+        self._buffer = ''
+        self._chunks = []
+        self._current_day = None
+        self._current_section = None
+
+    @property
+    def text(self):
+        """Everything fed so far"""
+        return ''.join(self._chunks)
+
+    def feed(self, chunk):
+        """Consume a chunk of generated text and return the events it completed"""
+        self._chunks.append(chunk)
+        self._buffer += chunk
+        if '\n' not in self._buffer:
+            return []
+        *lines, self._buffer = self._buffer.split('\n')
+        events = []
+        for line in lines:
+            self._parse_line(line, events)
+        return events
+
+    def close(self):
+        """Flush the last partial line and the open day; return the final events"""
+        events = []
+        if self._buffer:
+            self._parse_line(self._buffer, events)
+            self._buffer = ''
+        self._finish_day(events)
+        return events
+
+    def _parse_line(self, line, events):
+        line = line.strip()
+        if not line:
+            return
+        lowered = line.lower()
+        categories = classify_keywords(lowered)
+        if categories & (FALLBACK_FOOD | FALLBACK_TIP) and not line.startswith('#'):
+            if categories & FALLBACK_FOOD and len(self.food_lines) < FALLBACK_LIMIT:
+                self.food_lines.append(line)
+            if categories & FALLBACK_TIP and len(self.tip_lines) < FALLBACK_LIMIT:
+                self.tip_lines.append(line)
+
+        if is_day_header(lowered):
+            self._finish_day(events)
+            self._current_day = line
+            self.daily_plan[line] = []
+            self._current_section = 'daily'
+        elif categories & FOOD:
+            self._finish_day(events)
+            self._current_section = 'food'
+        elif categories & TIP:
+            self._finish_day(events)
+            self._current_section = 'tips'
+        elif not line.startswith(BULLETS):
+            return
+        elif self._current_section == 'daily' and self._current_day:
+            self.daily_plan[self._current_day].append(parse_activity(line))
+        elif self._current_section == 'food':
+            food_item = parse_food_item(line)
+            self.food_recommendations.append(food_item)
+            events.append(ParseEvent('food', None, food_item))
+        elif self._current_section == 'tips':
+            tip = line.lstrip('-•* ').strip()
+            self.travel_tips.append(tip)
+            events.append(ParseEvent('tip', None, tip))
+
+    def _finish_day(self, events):
+        if self._current_section == 'daily' and self._current_day is not None:
+            events.append(ParseEvent('day', self._current_day, self.daily_plan[self._current_day]))
+            self._current_day = None
@@ -1,302 +1,790 @@
 # Dummy data for famous landmarks and foods for demonstration
+import json
+import re
+from functools import lru_cache
+from types import MappingProxyType
 
-def get_landmarks_for_destination(destination):
-    """Return famous landmarks and their specialties for a given destination"""
-    # Example data for Paris, France
-    if destination.lower() in ["paris", "paris, france"]:
-        return {
-            "landmarks": [
-                {
-                    "name": "Eiffel Tower",
-                    "type": "Monument",
-                    "description": "Iconic symbol of Paris with panoramic city views.",
-                    "famous_foods": ["Crêpes", "Baguette Sandwiches"],
-                    "nearby_food_spots": ["Le Champ de Mars Café", "Bistro Parisien"]
-                },
-                {
-                    "name": "Louvre Museum",
-                    "type": "Museum",
-                    "description": "World's largest art museum and a historic monument.",
-                    "famous_foods": ["French Pastries", "Croissants"],
-                    "nearby_food_spots": ["Café Marly", "Le Fumoir"]
-                },
-                {
-                    "name": "Montmartre",
-                    "type": "Neighborhood",
-                    "description": "Historic district known for its bohemian atmosphere and artists.",
-                    "famous_foods": ["Escargots", "Ratatouille"],
-                    "nearby_food_spots": ["Le Consulat", "La Maison Rose"]
-                }
-            ]
-        }
-    # Example data for New York
-    elif destination.lower() in ["new york", "new york city", "nyc"]:
-        return {
-            "landmarks": [
-                {
-                    "name": "Statue of Liberty",
-                    "type": "Monument",
-                    "description": "Famous symbol of freedom and democracy.",
-                    "famous_foods": ["New York Hot Dog", "Soft Pretzel"],
-                    "nearby_food_spots": ["Liberty Island Café", "Battery Gardens"]
-                },
-                {
-                    "name": "Central Park",
-                    "type": "Park",
-                    "description": "Urban park in Manhattan with scenic walking paths and lakes.",
-                    "famous_foods": ["Bagels", "NY Cheesecake"],
-                    "nearby_food_spots": ["The Loeb Boathouse", "Tavern on the Green"]
-                },
-                {
-                    "name": "Times Square",
-                    "type": "Entertainment District",
-                    "description": "Bustling commercial and entertainment hub with bright lights.",
-                    "famous_foods": ["Pizza Slice", "Deli Sandwich"],
-                    "nearby_food_spots": ["Junior's Restaurant", "Carmine's"]
-                }
-            ]
-        }
-    # Example data for Hyderabad
-    elif destination.lower() in ["hyderabad", "hyderabad, india", "hyd"]:
-        return {
-            "landmarks": [
-                {
-                    "name": "Charminar",
-                    "type": "Monument",
-                    "description": "Iconic 16th-century mosque with four grand arches, symbol of Hyderabad.",
-                    "famous_foods": ["Hyderabadi Biryani", "Irani Chai"],
-                    "nearby_food_spots": ["Shadab Hotel", "Nimrah Cafe"]
-                },
-                {
-                    "name": "Golconda Fort",
-                    "type": "Fort",
-                    "description": "Historic fortress known for its acoustics, palaces, and scenic views.",
-                    "famous_foods": ["Haleem", "Double Ka Meetha"],
-                    "nearby_food_spots": ["Pista House", "Cafe Bahar"]
-                },
-                {
-                    "name": "Hussain Sagar Lake",
-                    "type": "Lake",
-                    "description": "Heart-shaped lake with a large Buddha statue and boating activities.",
-                    "famous_foods": ["Mirchi Bajji", "Corn on the Cob"],
-                    "nearby_food_spots": ["Eat Street", "Waterfront Restaurant"]
-                }
-            ]
-        }
-    # Example data for Delhi
-    elif destination.lower() in ["delhi", "new delhi", "delhi, india", "del"]:
-        return {
-            "landmarks": [
-                {
-                    "name": "Red Fort",
-                    "type": "Fort",
-                    "description": "Historic 17th-century fort and UNESCO World Heritage Site.",
-                    "famous_foods": ["Chole Bhature", "Paratha"],
-                    "nearby_food_spots": ["Paranthe Wali Gali", "Karim's"]
-                },
-                {
-                    "name": "Qutub Minar",
-                    "type": "Minaret",
-                    "description": "Tallest brick minaret in the world, built in 1193.",
-                    "famous_foods": ["Dahi Bhalla", "Aloo Tikki"],
-                    "nearby_food_spots": ["Haldiram's", "Bengali Sweet House"]
-                },
-                {
-                    "name": "India Gate",
-                    "type": "Monument",
-                    "description": "War memorial and iconic landmark in central Delhi.",
-                    "famous_foods": ["Kulfi Falooda", "Bhel Puri"],
-                    "nearby_food_spots": ["India Gate Street Vendors", "Kwality Restaurant"]
-                }
-            ]
-        }
-    # Example data for Mumbai
-    elif destination.lower() in ["mumbai", "bombay", "mumbai, india", "bom"]:
-        return {
-            "landmarks": [
-                {
-                    "name": "Gateway of India",
-                    "type": "Monument",
-                    "description": "Grand arch monument overlooking the Arabian Sea.",
-                    "famous_foods": ["Vada Pav", "Bhel Puri"],
-                    "nearby_food_spots": ["Bademiya", "Leopold Cafe"]
-                },
-                {
-                    "name": "Chhatrapati Shivaji Maharaj Terminus",
-                    "type": "Railway Station",
-                    "description": "UNESCO World Heritage Site and historic railway station.",
-                    "famous_foods": ["Bombay Sandwich", "Frankie"],
-                    "nearby_food_spots": ["Cannon Pav Bhaji", "Ayub's"]
-                },
-                {
-                    "name": "Marine Drive",
-                    "type": "Promenade",
-                    "description": "Scenic boulevard along the coast, known as the Queen's Necklace.",
-                    "famous_foods": ["Pav Bhaji", "Kulfi"],
-                    "nearby_food_spots": ["Sukh Sagar", "Tiwari Bros Mithaiwala"]
-                }
-            ]
-        }
-    # Example data for Chennai
-    elif destination.lower() in ["chennai", "madras", "chennai, india", "maa"]:
-        return {
-            "landmarks": [
-                {
-                    "name": "Marina Beach",
-                    "type": "Beach",
-                    "description": "Longest urban beach in India, popular for walks and street food.",
-                    "famous_foods": ["Sundal", "Murukku"],
-                    "nearby_food_spots": ["Marina Beach Stalls", "Ratna Cafe"]
-                },
-                {
-                    "name": "Kapaleeshwarar Temple",
-                    "type": "Temple",
-                    "description": "Ancient Dravidian-style temple dedicated to Lord Shiva.",
-                    "famous_foods": ["Filter Coffee", "Idli Sambar"],
-                    "nearby_food_spots": ["Mylai Karpagambal Mess", "Rayar's Cafe"]
-                },
-                {
-                    "name": "Fort St. George",
-                    "type": "Fort",
-                    "description": "Historic British fort and museum complex.",
-                    "famous_foods": ["Dosa", "Vada"],
-                    "nearby_food_spots": ["Murugan Idli Shop", "Saravana Bhavan"]
-                }
-            ]
-        }
-    # Example data for Goa
-    elif destination.lower() in ["goa", "goa, india", "goi"]:
-        return {
-            "landmarks": [
-                {
-                    "name": "Baga Beach",
-                    "type": "Beach",
-                    "description": "Popular beach known for nightlife, water sports, and shacks.",
-                    "famous_foods": ["Goan Fish Curry", "Prawn Balchao"],
-                    "nearby_food_spots": ["Britto's", "St. Anthony's Shack"]
-                },
-                {
-                    "name": "Basilica of Bom Jesus",
-                    "type": "Church",
-                    "description": "UNESCO World Heritage Site famous for baroque architecture.",
-                    "famous_foods": ["Bebinca", "Sannas"],
-                    "nearby_food_spots": ["Fisherman's Wharf", "Mum's Kitchen"]
-                },
-                {
-                    "name": "Fort Aguada",
-                    "type": "Fort",
-                    "description": "17th-century Portuguese fort with panoramic sea views.",
-                    "famous_foods": ["Chicken Cafreal", "Feni"],
-                    "nearby_food_spots": ["Souza Lobo", "Fat Fish"]
-                }
-            ]
-        }
-    # Generic fallback for any other destination
-    else:
-        # Try to provide more realistic and descriptive places and foods
-        destination_lower = destination.lower()
-        if "france" in destination_lower:
-            return {
-                "landmarks": [
-                    {
-                        "name": "Eiffel Tower",
-                        "type": "Monument",
-                        "description": "Iconic Parisian landmark with panoramic city views.",
-                        "famous_foods": ["Crêpes", "Baguette", "Croissant"],
-                        "nearby_food_spots": ["Le Champ de Mars Café", "Bistro Parisien"]
-                    },
-                    {
-                        "name": "Louvre Museum",
-                        "type": "Museum",
-                        "description": "World's largest art museum and a historic monument in Paris.",
-                        "famous_foods": ["French Pastries", "Macarons"],
-                        "nearby_food_spots": ["Café Marly", "Le Fumoir"]
-                    },
-                    {
-                        "name": "Mont Saint-Michel",
-                        "type": "Island Abbey",
-                        "description": "Medieval abbey on a tidal island, a UNESCO World Heritage Site.",
-                        "famous_foods": ["Omelette de la Mère Poulard", "Seafood Platter"],
-                        "nearby_food_spots": ["La Mère Poulard", "Le Relais du Roy"]
-                    }
-                ]
+from fuzzy_index import TrigramIndex
+from utils import normalize_location
+
+# Typos tolerated in a destination, by length: (minimum length, edits), longest first. Names
+# under 5 characters must match exactly, since most short words are one edit from some city
+FUZZY_MAX_EDITS = ((9, 2), (5, 1))
+
+# Destinations matched on their exact (normalized) name or alias
+DESTINATIONS = [
+    {
+        "name": "Paris",
+        "aliases": ["paris", "paris, france"],
+        "landmarks": [
+            {
+                "name": "Eiffel Tower",
+                "coordinates": [48.8584, 2.2945],
+                "type": "Monument",
+                "description": "Iconic symbol of Paris with panoramic city views.",
+                "famous_foods": ["Crêpes", "Baguette Sandwiches"],
+                "nearby_food_spots": ["Le Champ de Mars Café", "Bistro Parisien"]
+            },
+            {
+                "name": "Louvre Museum",
+                "coordinates": [48.8606, 2.3376],
+                "type": "Museum",
+                "description": "World's largest art museum and a historic monument.",
+                "famous_foods": ["French Pastries", "Croissants"],
+                "nearby_food_spots": ["Café Marly", "Le Fumoir"]
+            },
+            {
+                "name": "Montmartre",
+                "coordinates": [48.8867, 2.3431],
+                "type": "Neighborhood",
+                "description": "Historic district known for its bohemian atmosphere and artists.",
+                "famous_foods": ["Escargots", "Ratatouille"],
+                "nearby_food_spots": ["Le Consulat", "La Maison Rose"]
+            }
+        ]
+    },
+    {
+        "name": "New York",
+        "aliases": ["new york", "new york city", "nyc", "new york, usa", "new york, ny"],
+        "landmarks": [
+            {
+                "name": "Statue of Liberty",
+                "coordinates": [40.6892, -74.0445],
+                "type": "Monument",
+                "description": "Famous symbol of freedom and democracy.",
+                "famous_foods": ["New York Hot Dog", "Soft Pretzel"],
+                "nearby_food_spots": ["Liberty Island Café", "Battery Gardens"]
+            },
+            {
+                "name": "Central Park",
+                "coordinates": [40.7829, -73.9654],
+                "type": "Park",
+                "description": "Urban park in Manhattan with scenic walking paths and lakes.",
+                "famous_foods": ["Bagels", "NY Cheesecake"],
+                "nearby_food_spots": ["The Loeb Boathouse", "Tavern on the Green"]
+            },
+            {
+                "name": "Times Square",
+                "coordinates": [40.758, -73.9855],
+                "type": "Entertainment District",
+                "description": "Bustling commercial and entertainment hub with bright lights.",
+                "famous_foods": ["Pizza Slice", "Deli Sandwich"],
+                "nearby_food_spots": ["Junior's Restaurant", "Carmine's"]
             }
-        elif "italy" in destination_lower:
-            return {
-                "landmarks": [
-                    {
-                        "name": "Colosseum",
-                        "type": "Amphitheatre",
-                        "description": "Ancient Roman amphitheatre in the heart of Rome.",
-                        "famous_foods": ["Pizza Margherita", "Gelato"],
-                        "nearby_food_spots": ["Trattoria Luzzi", "Gelateria La Dolce Vita"]
-                    },
-                    {
-                        "name": "Leaning Tower of Pisa",
-                        "type": "Tower",
-                        "description": "Famous leaning bell tower in Pisa.",
-                        "famous_foods": ["Pasta Carbonara", "Tiramisu"],
-                        "nearby_food_spots": ["Ristorante Piazza dei Miracoli", "Osteria in Domo"]
-                    },
-                    {
-                        "name": "Venice Grand Canal",
-                        "type": "Canal",
-                        "description": "Picturesque waterway lined with Renaissance and Gothic palaces.",
-                        "famous_foods": ["Risotto", "Cicchetti"],
-                        "nearby_food_spots": ["Osteria alle Testiere", "Cantina Do Spade"]
-                    }
-                ]
+        ]
+    },
+    {
+        "name": "Hyderabad",
+        "aliases": ["hyderabad", "hyderabad, india", "hyderabad, telangana", "hyd"],
+        "landmarks": [
+            {
+                "name": "Charminar",
+                "coordinates": [17.3616, 78.4747],
+                "type": "Monument",
+                "description": "Iconic 16th-century mosque with four grand arches, symbol of Hyderabad.",
+                "famous_foods": ["Hyderabadi Biryani", "Irani Chai"],
+                "nearby_food_spots": ["Shadab Hotel", "Nimrah Cafe"]
+            },
+            {
+                "name": "Golconda Fort",
+                "coordinates": [17.3833, 78.4011],
+                "type": "Fort",
+                "description": "Historic fortress known for its acoustics, palaces, and scenic views.",
+                "famous_foods": ["Haleem", "Double Ka Meetha"],
+                "nearby_food_spots": ["Pista House", "Cafe Bahar"]
+            },
+            {
+                "name": "Hussain Sagar Lake",
+                "coordinates": [17.4239, 78.4738],
+                "type": "Lake",
+                "description": "Heart-shaped lake with a large Buddha statue and boating activities.",
+                "famous_foods": ["Mirchi Bajji", "Corn on the Cob"],
+                "nearby_food_spots": ["Eat Street", "Waterfront Restaurant"]
             }
-        elif "japan" in destination_lower:
-            return {
-                "landmarks": [
-                    {
-                        "name": "Mount Fuji",
-                        "type": "Mountain",
-                        "description": "Japan's tallest peak and iconic symbol.",
-                        "famous_foods": ["Sushi", "Ramen"],
-                        "nearby_food_spots": ["Fujiyama Restaurant", "Sushi Zanmai"]
-                    },
-                    {
-                        "name": "Fushimi Inari Shrine",
-                        "type": "Shrine",
-                        "description": "Famous for its thousands of vermilion torii gates in Kyoto.",
-                        "famous_foods": ["Yakitori", "Matcha Sweets"],
-                        "nearby_food_spots": ["Inari Sushi Koji", "Kyoto Saryo"]
-                    },
-                    {
-                        "name": "Tokyo Skytree",
-                        "type": "Tower",
-                        "description": "Tallest structure in Japan with observation decks and city views.",
-                        "famous_foods": ["Tempura", "Takoyaki"],
-                        "nearby_food_spots": ["Skytree Cafe", "Asakusa Menchi"]
-                    }
-                ]
+        ]
+    },
+    {
+        "name": "Delhi",
+        "aliases": ["delhi", "new delhi", "delhi, india", "del"],
+        "landmarks": [
+            {
+                "name": "Red Fort",
+                "coordinates": [28.6562, 77.241],
+                "type": "Fort",
+                "description": "Historic 17th-century fort and UNESCO World Heritage Site.",
+                "famous_foods": ["Chole Bhature", "Paratha"],
+                "nearby_food_spots": ["Paranthe Wali Gali", "Karim's"]
+            },
+            {
+                "name": "Qutub Minar",
+                "coordinates": [28.5245, 77.1855],
+                "type": "Minaret",
+                "description": "Tallest brick minaret in the world, built in 1193.",
+                "famous_foods": ["Dahi Bhalla", "Aloo Tikki"],
+                "nearby_food_spots": ["Haldiram's", "Bengali Sweet House"]
+            },
+            {
+                "name": "India Gate",
+                "coordinates": [28.6129, 77.2295],
+                "type": "Monument",
+                "description": "War memorial and iconic landmark in central Delhi.",
+                "famous_foods": ["Kulfi Falooda", "Bhel Puri"],
+                "nearby_food_spots": ["India Gate Street Vendors", "Kwality Restaurant"]
+            }
+        ]
+    },
+    {
+        "name": "Mumbai",
+        "aliases": ["mumbai", "bombay", "mumbai, india", "mumbai, maharashtra", "bom"],
+        "landmarks": [
+            {
+                "name": "Gateway of India",
+                "coordinates": [18.922, 72.8347],
+                "type": "Monument",
+                "description": "Grand arch monument overlooking the Arabian Sea.",
+                "famous_foods": ["Vada Pav", "Bhel Puri"],
+                "nearby_food_spots": ["Bademiya", "Leopold Cafe"]
+            },
+            {
+                "name": "Chhatrapati Shivaji Maharaj Terminus",
+                "coordinates": [18.9398, 72.8355],
+                "type": "Railway Station",
+                "description": "UNESCO World Heritage Site and historic railway station.",
+                "famous_foods": ["Bombay Sandwich", "Frankie"],
+                "nearby_food_spots": ["Cannon Pav Bhaji", "Ayub's"]
+            },
+            {
+                "name": "Marine Drive",
+                "coordinates": [18.9432, 72.8235],
+                "type": "Promenade",
+                "description": "Scenic boulevard along the coast, known as the Queen's Necklace.",
+                "famous_foods": ["Pav Bhaji", "Kulfi"],
+                "nearby_food_spots": ["Sukh Sagar", "Tiwari Bros Mithaiwala"]
+            }
+        ]
+    },
+    {
+        "name": "Chennai",
+        "aliases": ["chennai", "madras", "chennai, india", "chennai, tamil nadu", "maa"],
+        "landmarks": [
+            {
+                "name": "Marina Beach",
+                "coordinates": [13.05, 80.2824],
+                "type": "Beach",
+                "description": "Longest urban beach in India, popular for walks and street food.",
+                "famous_foods": ["Sundal", "Murukku"],
+                "nearby_food_spots": ["Marina Beach Stalls", "Ratna Cafe"]
+            },
+            {
+                "name": "Kapaleeshwarar Temple",
+                "coordinates": [13.0339, 80.2696],
+                "type": "Temple",
+                "description": "Ancient Dravidian-style temple dedicated to Lord Shiva.",
+                "famous_foods": ["Filter Coffee", "Idli Sambar"],
+                "nearby_food_spots": ["Mylai Karpagambal Mess", "Rayar's Cafe"]
+            },
+            {
+                "name": "Fort St. George",
+                "coordinates": [13.0797, 80.2873],
+                "type": "Fort",
+                "description": "Historic British fort and museum complex.",
+                "famous_foods": ["Dosa", "Vada"],
+                "nearby_food_spots": ["Murugan Idli Shop", "Saravana Bhavan"]
+            }
+        ]
+    },
+    {
+        "name": "Goa",
+        "aliases": ["goa", "goa, india", "goi"],
+        "landmarks": [
+            {
+                "name": "Baga Beach",
+                "coordinates": [15.5553, 73.7517],
+                "type": "Beach",
+                "description": "Popular beach known for nightlife, water sports, and shacks.",
+                "famous_foods": ["Goan Fish Curry", "Prawn Balchao"],
+                "nearby_food_spots": ["Britto's", "St. Anthony's Shack"]
+            },
+            {
+                "name": "Basilica of Bom Jesus",
+                "coordinates": [15.5009, 73.9116],
+                "type": "Church",
+                "description": "UNESCO World Heritage Site famous for baroque architecture.",
+                "famous_foods": ["Bebinca", "Sannas"],
+                "nearby_food_spots": ["Fisherman's Wharf", "Mum's Kitchen"]
+            },
+            {
+                "name": "Fort Aguada",
+                "coordinates": [15.4921, 73.7735],
+                "type": "Fort",
+                "description": "17th-century Portuguese fort with panoramic sea views.",
+                "famous_foods": ["Chicken Cafreal", "Feni"],
+                "nearby_food_spots": ["Souza Lobo", "Fat Fish"]
+            }
+        ]
+    }
+]
+
+# Country-level catalogs, matched when the country name appears anywhere in the destination
+COUNTRIES = [
+    {
+        "name": "France",
+        "aliases": ["france"],
+        "landmarks": [
+            {
+                "name": "Eiffel Tower",
+                "coordinates": [48.8584, 2.2945],
+                "type": "Monument",
+                "description": "Iconic Parisian landmark with panoramic city views.",
+                "famous_foods": ["Crêpes", "Baguette", "Croissant"],
+                "nearby_food_spots": ["Le Champ de Mars Café", "Bistro Parisien"]
+            },
+            {
+                "name": "Louvre Museum",
+                "coordinates": [48.8606, 2.3376],
+                "type": "Museum",
+                "description": "World's largest art museum and a historic monument in Paris.",
+                "famous_foods": ["French Pastries", "Macarons"],
+                "nearby_food_spots": ["Café Marly", "Le Fumoir"]
+            },
+            {
+                "name": "Mont Saint-Michel",
+                "coordinates": [48.6361, -1.5115],
+                "type": "Island Abbey",
+                "description": "Medieval abbey on a tidal island, a UNESCO World Heritage Site.",
+                "famous_foods": ["Omelette de la Mère Poulard", "Seafood Platter"],
+                "nearby_food_spots": ["La Mère Poulard", "Le Relais du Roy"]
             }
-        else:
-            # Default fallback for any other destination
-            return {
-                "landmarks": [
-                    {
-                        "name": f"Central {destination.title()} Landmark",
-                        "type": "Landmark",
-                        "description": f"A must-see attraction in {destination.title()} with local history and culture.",
-                        "famous_foods": [f"Signature {destination.title()} Dish", f"Popular {destination.title()} Snack"],
-                        "nearby_food_spots": [f"Famous {destination.title()} Eatery", f"Popular {destination.title()} Cafe"]
-                    },
-                    {
-                        "name": f"Historic {destination.title()} Site",
-                        "type": "Historic Site",
-                        "description": f"A place of historical importance in {destination.title()} with unique architecture.",
-                        "famous_foods": [f"Traditional {destination.title()} Food", f"Local {destination.title()} Dessert"],
-                        "nearby_food_spots": [f"Best {destination.title()} Restaurant", f"Traditional {destination.title()} Sweet Shop"]
-                    },
-                    {
-                        "name": f"{destination.title()} Park or Beach",
-                        "type": "Park/Beach",
-                        "description": f"A scenic spot for relaxation and recreation in {destination.title()}.",
-                        "famous_foods": [f"Local {destination.title()} Treat", f"Refreshing {destination.title()} Drink"],
-                        "nearby_food_spots": [f"Best {destination.title()} Food Stall", f"Popular {destination.title()} Bar"]
-                    }
-                ]
+        ]
+    },
+    {
+        "name": "Italy",
+        "aliases": ["italy"],
+        "landmarks": [
+            {
+                "name": "Colosseum",
+                "coordinates": [41.8902, 12.4922],
+                "type": "Amphitheatre",
+                "description": "Ancient Roman amphitheatre in the heart of Rome.",
+                "famous_foods": ["Pizza Margherita", "Gelato"],
+                "nearby_food_spots": ["Trattoria Luzzi", "Gelateria La Dolce Vita"]
+            },
+            {
+                "name": "Leaning Tower of Pisa",
+                "coordinates": [43.723, 10.3966],
+                "type": "Tower",
+                "description": "Famous leaning bell tower in Pisa.",
+                "famous_foods": ["Pasta Carbonara", "Tiramisu"],
+                "nearby_food_spots": ["Ristorante Piazza dei Miracoli", "Osteria in Domo"]
+            },
+            {
+                "name": "Venice Grand Canal",
+                "coordinates": [45.4408, 12.3155],
+                "type": "Canal",
+                "description": "Picturesque waterway lined with Renaissance and Gothic palaces.",
+                "famous_foods": ["Risotto", "Cicchetti"],
+                "nearby_food_spots": ["Osteria alle Testiere", "Cantina Do Spade"]
+            }
+        ]
+    },
+    {
+        "name": "Japan",
+        "aliases": ["japan"],
+        "landmarks": [
+            {
+                "name": "Mount Fuji",
+                "coordinates": [35.3606, 138.7274],
+                "type": "Mountain",
+                "description": "Japan's tallest peak and iconic symbol.",
+                "famous_foods": ["Sushi", "Ramen"],
+                "nearby_food_spots": ["Fujiyama Restaurant", "Sushi Zanmai"]
+            },
+            {
+                "name": "Fushimi Inari Shrine",
+                "coordinates": [34.9671, 135.7727],
+                "type": "Shrine",
+                "description": "Famous for its thousands of vermilion torii gates in Kyoto.",
+                "famous_foods": ["Yakitori", "Matcha Sweets"],
+                "nearby_food_spots": ["Inari Sushi Koji", "Kyoto Saryo"]
+            },
+            {
+                "name": "Tokyo Skytree",
+                "coordinates": [35.7101, 139.8107],
+                "type": "Tower",
+                "description": "Tallest structure in Japan with observation decks and city views.",
+                "famous_foods": ["Tempura", "Takoyaki"],
+                "nearby_food_spots": ["Skytree Cafe", "Asakusa Menchi"]
+            }
+        ]
+    }
+]
+
+# Eating places with coordinates, indexed by food_places.FoodPlaceIndex for nearby-restaurant queries
+FOOD_PLACES = [
+    {
+        "name": "Le Champ de Mars Café",
+        "coordinates": [48.8556, 2.2986],
+        "cuisines": ["cafe", "french", "crepes"],
+        "price_range": "$10-25"
+    },
+    {
+        "name": "Bistro Parisien",
+        "coordinates": [48.8566, 2.3009],
+        "cuisines": ["french", "bistro"],
+        "price_range": "$20-45"
+    },
+    {
+        "name": "Café Marly",
+        "coordinates": [48.8614, 2.3351],
+        "cuisines": ["cafe", "french", "pastries"],
+        "price_range": "$25-60"
+    },
+    {
+        "name": "Le Fumoir",
+        "coordinates": [48.8603, 2.3408],
+        "cuisines": ["french", "bar"],
+        "price_range": "$25-55"
+    },
+    {
+        "name": "Le Consulat",
+        "coordinates": [48.8866, 2.34],
+        "cuisines": ["french", "cafe"],
+        "price_range": "$15-35"
+    },
+    {
+        "name": "La Maison Rose",
+        "coordinates": [48.8873, 2.3395],
+        "cuisines": ["french"],
+        "price_range": "$20-45"
+    },
+    {
+        "name": "Liberty Island Café",
+        "coordinates": [40.6897, -74.0454],
+        "cuisines": ["cafe", "american", "hot dogs"],
+        "price_range": "$8-20"
+    },
+    {
+        "name": "Battery Gardens",
+        "coordinates": [40.7029, -74.016],
+        "cuisines": ["american", "seafood"],
+        "price_range": "$30-70"
+    },
+    {
+        "name": "The Loeb Boathouse",
+        "coordinates": [40.7753, -73.969],
+        "cuisines": ["american"],
+        "price_range": "$30-70"
+    },
+    {
+        "name": "Tavern on the Green",
+        "coordinates": [40.7722, -73.9777],
+        "cuisines": ["american"],
+        "price_range": "$35-80"
+    },
+    {
+        "name": "Junior's Restaurant",
+        "coordinates": [40.7589, -73.9874],
+        "cuisines": ["american", "deli", "cheesecake"],
+        "price_range": "$15-35"
+    },
+    {
+        "name": "Carmine's",
+        "coordinates": [40.7573, -73.9866],
+        "cuisines": ["italian", "pizza"],
+        "price_range": "$20-45"
+    },
+    {
+        "name": "Shadab Hotel",
+        "coordinates": [17.3622, 78.4766],
+        "cuisines": ["hyderabadi", "biryani", "mughlai"],
+        "price_range": "$4-12"
+    },
+    {
+        "name": "Nimrah Cafe",
+        "coordinates": [17.3618, 78.4743],
+        "cuisines": ["cafe", "irani chai", "bakery"],
+        "price_range": "$1-5"
+    },
+    {
+        "name": "Pista House",
+        "coordinates": [17.3605, 78.475],
+        "cuisines": ["hyderabadi", "haleem", "biryani"],
+        "price_range": "$3-10"
+    },
+    {
+        "name": "Cafe Bahar",
+        "coordinates": [17.4, 78.479],
+        "cuisines": ["hyderabadi", "biryani"],
+        "price_range": "$4-12"
+    },
+    {
+        "name": "Eat Street",
+        "coordinates": [17.4285, 78.4733],
+        "cuisines": ["street food", "snacks"],
+        "price_range": "$3-10"
+    },
+    {
+        "name": "Waterfront Restaurant",
+        "coordinates": [17.4275, 78.4728],
+        "cuisines": ["seafood", "indian"],
+        "price_range": "$10-30"
+    },
+    {
+        "name": "Paranthe Wali Gali",
+        "coordinates": [28.656, 77.2303],
+        "cuisines": ["street food", "paratha", "vegetarian"],
+        "price_range": "$2-6"
+    },
+    {
+        "name": "Karim's",
+        "coordinates": [28.6495, 77.2337],
+        "cuisines": ["mughlai", "kebabs"],
+        "price_range": "$5-15"
+    },
+    {
+        "name": "Haldiram's",
+        "coordinates": [28.527, 77.187],
+        "cuisines": ["vegetarian", "snacks", "sweets", "chaat"],
+        "price_range": "$3-10"
+    },
+    {
+        "name": "Bengali Sweet House",
+        "coordinates": [28.6289, 77.2346],
+        "cuisines": ["sweets", "chaat", "vegetarian"],
+        "price_range": "$2-8"
+    },
+    {
+        "name": "India Gate Street Vendors",
+        "coordinates": [28.6135, 77.229],
+        "cuisines": ["street food", "kulfi", "chaat"],
+        "price_range": "$1-4"
+    },
+    {
+        "name": "Kwality Restaurant",
+        "coordinates": [28.633, 77.2195],
+        "cuisines": ["north indian", "chole bhature"],
+        "price_range": "$8-20"
+    },
+    {
+        "name": "Bademiya",
+        "coordinates": [18.923, 72.8321],
+        "cuisines": ["kebabs", "street food"],
+        "price_range": "$3-10"
+    },
+    {
+        "name": "Leopold Cafe",
+        "coordinates": [18.9226, 72.8317],
+        "cuisines": ["cafe", "continental", "indian"],
+        "price_range": "$8-20"
+    },
+    {
+        "name": "Cannon Pav Bhaji",
+        "coordinates": [18.941, 72.835],
+        "cuisines": ["pav bhaji", "street food", "vegetarian"],
+        "price_range": "$2-5"
+    },
+    {
+        "name": "Ayub's",
+        "coordinates": [18.929, 72.832],
+        "cuisines": ["rolls", "kebabs", "street food"],
+        "price_range": "$2-6"
+    },
+    {
+        "name": "Sukh Sagar",
+        "coordinates": [18.9548, 72.813],
+        "cuisines": ["pav bhaji", "vegetarian", "south indian"],
+        "price_range": "$3-8"
+    },
+    {
+        "name": "Tiwari Bros Mithaiwala",
+        "coordinates": [18.954, 72.814],
+        "cuisines": ["sweets", "chaat", "vegetarian"],
+        "price_range": "$2-6"
+    },
+    {
+        "name": "Marina Beach Stalls",
+        "coordinates": [13.05, 80.283],
+        "cuisines": ["street food", "seafood", "sundal"],
+        "price_range": "$1-4"
+    },
+    {
+        "name": "Ratna Cafe",
+        "coordinates": [13.0575, 80.277],
+        "cuisines": ["south indian", "idli", "vegetarian"],
+        "price_range": "$2-6"
+    },
+    {
+        "name": "Mylai Karpagambal Mess",
+        "coordinates": [13.0335, 80.2705],
+        "cuisines": ["south indian", "vegetarian", "filter coffee"],
+        "price_range": "$2-6"
+    },
+    {
+        "name": "Rayar's Cafe",
+        "coordinates": [13.033, 80.2686],
+        "cuisines": ["south indian", "idli", "filter coffee"],
+        "price_range": "$1-4"
+    },
+    {
+        "name": "Murugan Idli Shop",
+        "coordinates": [13.08, 80.28],
+        "cuisines": ["south indian", "idli", "dosa"],
+        "price_range": "$2-6"
+    },
+    {
+        "name": "Saravana Bhavan",
+        "coordinates": [13.083, 80.282],
+        "cuisines": ["south indian", "vegetarian", "dosa"],
+        "price_range": "$3-8"
+    },
+    {
+        "name": "Britto's",
+        "coordinates": [15.557, 73.752],
+        "cuisines": ["goan", "seafood"],
+        "price_range": "$10-25"
+    },
+    {
+        "name": "St. Anthony's Shack",
+        "coordinates": [15.556, 73.751],
+        "cuisines": ["goan", "seafood"],
+        "price_range": "$8-20"
+    },
+    {
+        "name": "Fisherman's Wharf",
+        "coordinates": [15.496, 73.829],
+        "cuisines": ["goan", "seafood"],
+        "price_range": "$12-30"
+    },
+    {
+        "name": "Mum's Kitchen",
+        "coordinates": [15.498, 73.827],
+        "cuisines": ["goan"],
+        "price_range": "$10-25"
+    },
+    {
+        "name": "Souza Lobo",
+        "coordinates": [15.544, 73.756],
+        "cuisines": ["goan", "seafood"],
+        "price_range": "$12-30"
+    },
+    {
+        "name": "Fat Fish",
+        "coordinates": [15.56, 73.763],
+        "cuisines": ["seafood", "goan"],
+        "price_range": "$10-25"
+    },
+    {
+        "name": "La Mère Poulard",
+        "coordinates": [48.6355, -1.5108],
+        "cuisines": ["french", "omelette"],
+        "price_range": "$30-70"
+    },
+    {
+        "name": "Le Relais du Roy",
+        "coordinates": [48.616, -1.51],
+        "cuisines": ["french", "seafood"],
+        "price_range": "$25-55"
+    },
+    {
+        "name": "Trattoria Luzzi",
+        "coordinates": [41.8893, 12.4975],
+        "cuisines": ["italian", "trattoria", "pizza"],
+        "price_range": "$15-35"
+    },
+    {
+        "name": "Gelateria La Dolce Vita",
+        "coordinates": [41.891, 12.492],
+        "cuisines": ["gelato", "dessert"],
+        "price_range": "$3-8"
+    },
+    {
+        "name": "Ristorante Piazza dei Miracoli",
+        "coordinates": [43.7225, 10.398],
+        "cuisines": ["italian", "pasta"],
+        "price_range": "$20-45"
+    },
+    {
+        "name": "Osteria in Domo",
+        "coordinates": [43.7235, 10.399],
+        "cuisines": ["italian", "tuscan"],
+        "price_range": "$20-45"
+    },
+    {
+        "name": "Osteria alle Testiere",
+        "coordinates": [45.4377, 12.3412],
+        "cuisines": ["venetian", "seafood"],
+        "price_range": "$45-90"
+    },
+    {
+        "name": "Cantina Do Spade",
+        "coordinates": [45.4393, 12.3341],
+        "cuisines": ["venetian", "cicchetti"],
+        "price_range": "$15-35"
+    },
+    {
+        "name": "Fujiyama Restaurant",
+        "coordinates": [35.395, 138.732],
+        "cuisines": ["japanese", "ramen"],
+        "price_range": "$10-25"
+    },
+    {
+        "name": "Sushi Zanmai",
+        "coordinates": [35.6655, 139.7705],
+        "cuisines": ["japanese", "sushi"],
+        "price_range": "$15-40"
+    },
+    {
+        "name": "Inari Sushi Koji",
+        "coordinates": [34.9676, 135.7717],
+        "cuisines": ["japanese", "sushi"],
+        "price_range": "$10-25"
+    },
+    {
+        "name": "Kyoto Saryo",
+        "coordinates": [34.9858, 135.7588],
+        "cuisines": ["japanese", "matcha", "tea"],
+        "price_range": "$8-20"
+    },
+    {
+        "name": "Skytree Cafe",
+        "coordinates": [35.71, 139.8107],
+        "cuisines": ["cafe", "japanese"],
+        "price_range": "$8-20"
+    },
+    {
+        "name": "Asakusa Menchi",
+        "coordinates": [35.714, 139.796],
+        "cuisines": ["japanese", "street food"],
+        "price_range": "$3-8"
+    }
+]
+
+_alias_index = {}
+_country_index = {}
+_fuzzy_index = TrigramIndex()
+_word_pattern = re.compile(r"[^\W_]+")
+
+
+def _freeze(value):
+    """Turn nested dicts/lists into read-only mappings/tuples so records can be shared"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def register_destination(name, aliases, landmarks, country=False):
+    """Add a destination to the alias index and return its shared record"""
+    record = _freeze({"name": name, "landmarks": landmarks})
+    index = _country_index if country else _alias_index
+    for alias in [name, *aliases]:
+        key = normalize_location(alias)
+        if key:
+            index[key] = record
+            if not country:
+                _fuzzy_index.add(key, record)
+    return record
+
+
+def load_catalog(path):
+    """Register every destination in a JSON file shaped like ``DESTINATIONS``"""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    for entry in entries:
+        register_destination(entry["name"], entry.get("aliases", []), entry["landmarks"], entry.get("country", False))
+    return len(entries)
+
+
+def max_typos(length):
+    """Edits a destination of ``length`` characters may be away from a catalog name"""
+    for min_length, edits in FUZZY_MAX_EDITS:
+        if length >= min_length:
+            return edits
+    return 0
+
+
+def resolve_destination(destination):
+    """Return ``(canonical_name, confidence)`` for a destination, tolerating typos
+
+    ``canonical_name`` is ``None`` when nothing in the catalog is within
+    ``max_typos`` edits.
+    """
+    record, confidence = _resolve(normalize_location(destination))
+    return (record["name"], confidence) if record is not None else (None, 0.0)
+
+
+def canonical_destination(destination):
+    """Return the catalog name for an exact name or alias, otherwise the cleaned-up input
+
+    Misspellings are deliberately not canonicalized: a close match may be a
+    different real place, and this name is used for cache keys.
+    """
+    record = _alias_index.get(normalize_location(destination))
+    return record["name"] if record is not None else " ".join(destination.split())
+
+
+def _resolve(key):
+    record = _alias_index.get(key)
+    if record is not None:
+        return record, 1.0
+    # The whole input is matched, qualifier included, so "Paris, Texas" stays out of France
+    edits = max_typos(len(key))
+    if not edits:
+        return None, 0.0
+    matches = _fuzzy_index.search(key, max_distance=edits)
+    if matches:
+        confidence, _, record = matches[0]
+        return record, confidence
+    return None, 0.0
+
+
+def get_landmarks_for_destination(destination):
+    """Return famous landmarks and their specialties for a given destination"""
+    key = normalize_location(destination)
+    record, _ = _resolve(key)
+    if record is not None:
+        return record
+    if _country_index:
+        for word in _word_pattern.findall(key):
+            record = _country_index.get(word)
+            if record is not None:
+                return record
+    return _generic_landmarks(destination.title())
+
+
+@lru_cache(maxsize=1024)
+def _generic_landmarks(title):
+    """Default fallback for any other destination"""
+    return _freeze({
+        "name": title,
+        "landmarks": [
+            {
+                "name": f"Central {title} Landmark",
+                "type": "Landmark",
+                "description": f"A must-see attraction in {title} with local history and culture.",
+                "famous_foods": [f"Signature {title} Dish", f"Popular {title} Snack"],
+                "nearby_food_spots": [f"Famous {title} Eatery", f"Popular {title} Cafe"]
+            },
+            {
+                "name": f"Historic {title} Site",
+                "type": "Historic Site",
+                "description": f"A place of historical importance in {title} with unique architecture.",
+                "famous_foods": [f"Traditional {title} Food", f"Local {title} Dessert"],
+                "nearby_food_spots": [f"Best {title} Restaurant", f"Traditional {title} Sweet Shop"]
+            },
+            {
+                "name": f"{title} Park or Beach",
+                "type": "Park/Beach",
+                "description": f"A scenic spot for relaxation and recreation in {title}.",
+                "famous_foods": [f"Local {title} Treat", f"Refreshing {title} Drink"],
+                "nearby_food_spots": [f"Best {title} Food Stall", f"Popular {title} Bar"]
             }
+        ]
+    })
+
+
+for _entry in DESTINATIONS:
+    register_destination(_entry["name"], _entry["aliases"], _entry["landmarks"])
+for _entry in COUNTRIES:
+    register_destination(_entry["name"], _entry["aliases"], _entry["landmarks"], country=True)
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from ttl_cache import TTLCache
+
+
+def itinerary_hash(destination, itinerary_data):
+    """Content hash of everything that affects a rendered map"""
+    content = {
+        'destination': destination,
+        'daily_plan': itinerary_data.get('daily_plan', {}),
+        'food_recommendations': itinerary_data.get('food_recommendations', []),
+    }
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=list)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class RenderedMapCache:
+    """Content-addressed cache of rendered map HTML.
+
+    An in-memory LRU is always used; with ``disk_dir`` set, rendered maps are
+    also written there as ``<hash>.html`` so they survive restarts and can be
+    shared between processes.
+    """
+
+    def __init__(self, max_entries=128, ttl=24 * 3600, disk_dir=None):
+        self.memory = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.disk_dir = disk_dir
+        self._stats = {'disk_hits': 0, 'disk_writes': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        html = self.memory.get(key)
+        if html is not None or not self.disk_dir:
+            return html
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                html = f.read()
+        except OSError:
+            return None
+        self._stats['disk_hits'] += 1
+        self.memory.set(key, html)
+        return html
+
+    def set(self, key, html):
+        self.memory.set(key, html)
+        if not self.disk_dir:
+            return
+        # Write to a temp file and rename so readers never see a partial map
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(tmp_path, self._path(key))
+            self._stats['disk_writes'] += 1
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats.update(self._stats)
+        return stats
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.html")
@@ -1,23 +1,101 @@
-import folium
-import streamlit as st
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+import contextvars
+import os
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+from geocode_cache import GeocodeCache
+from map_cache import RenderedMapCache, itinerary_hash
+from gazetteer import GazetteerGeocoder, ChainedGeocoder, haversine_km
+from rate_limiter import TokenBucket, RateLimitedGeocoder
+from food_places import food_place_index
+from single_flight import SingleFlight
+from notifications import notifier
+from metrics import metrics
+from profiling import profiled
+from utils import normalize_location
 import time
 import random
 
+# Places geocoded further than this from the destination are treated as wrong matches
+MAX_PLACE_DISTANCE_KM = 50
+MARKER_COLORS = ['blue', 'green', 'purple', 'orange', 'darkred', 'lightred', 'beige', 'darkblue', 'darkgreen', 'cadetblue']
+# 'geojson': all points in one clustered GeoJSON layer with per-day toggles, no caps. 'markers': one folium.Marker per point, capped (legacy)
+RENDER_MODES = ('geojson', 'markers')
+
+# Absolute time.monotonic() deadline shared by the geocode_places calls of one request, if any
+_shared_deadline = contextvars.ContextVar('geocode_shared_deadline', default=None)
+
 class MapGenerator:
-    def __init__(self):
-        self.geolocator = Nominatim(user_agent="travel_planner_app")
+    # Process-wide, so concurrent sessions geocoding the same place share one Nominatim call
+    single_flight = SingleFlight()
+    # Process-wide Nominatim budget (their usage policy allows about one request per second)
+    nominatim_bucket = TokenBucket(rate=float(os.getenv("NOMINATIM_RATE_LIMIT", "1.0")))
+    _place_executor = None
+
+    def __init__(self, geocode_cache=None, geolocator=None, map_cache=None, render_mode=None):
+        if geolocator is None:
+            geolocator = self._build_geolocator()
+        self.geolocator = geolocator
+        if geocode_cache is None:
+            geocode_cache = GeocodeCache(os.getenv("GEOCODE_CACHE_PATH", "geocode_cache.db"))
+            seed_file = os.getenv("GEOCODE_SEED_FILE")
+            if seed_file and os.path.exists(seed_file):
+                geocode_cache.seed_from_file(seed_file)
+        self.geocode_cache = geocode_cache
+        if map_cache is None:
+            map_cache = RenderedMapCache(disk_dir=os.getenv("MAP_CACHE_DIR") or None)
+        self.map_cache = map_cache
+        render_mode = render_mode or os.getenv("MAP_RENDER_MODE", "geojson")
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"render_mode must be one of {RENDER_MODES}, got {render_mode!r}")
+        self.render_mode = render_mode
+        self.last_render_stats = {}
     
+    def _build_geolocator(self):
+        """Use the offline gazetteer when GAZETTEER_PATH is set, falling back to Nominatim"""
+        from geopy.geocoders import Nominatim
+        # NOMINATIM_DOMAIN/NOMINATIM_SCHEME select another Nominatim server, e.g. a self-hosted one or the benchmark mock
+        nominatim = Nominatim(
+            user_agent="travel_planner_app",
+            domain=os.getenv("NOMINATIM_DOMAIN", "nominatim.openstreetmap.org"),
+            scheme=os.getenv("NOMINATIM_SCHEME", "https"),
+        )
+        nominatim = RateLimitedGeocoder(nominatim, self.nominatim_bucket)
+        gazetteer_path = os.getenv("GAZETTEER_PATH")
+        if not gazetteer_path or not os.path.exists(gazetteer_path):
+            return nominatim
+        gazetteer = GazetteerGeocoder.from_file(gazetteer_path)
+        if os.getenv("GAZETTEER_OFFLINE_ONLY", "").lower() in ("1", "true", "yes"):
+            return gazetteer
+        return ChainedGeocoder([gazetteer, nominatim])
+    
+    @profiled('generate_map')
+    @metrics.timed('generate_map')
     def generate_map(self, destination, itinerary_data):
         """Generate an interactive map with recommended locations"""
         
+        # Identical itineraries render identical maps, so serve them from the cache. The key uses
+        # the destination as typed: it is geocoded as-is and shown in the marker popup and tooltip
+        content_hash = itinerary_hash(destination, itinerary_data)
+        map_key = f"{self.render_mode}-{content_hash}"
+        cached_html = self.map_cache.get(map_key)
+        metrics.inc('map_cache_total', result='miss' if cached_html is None else 'hit')
+        if cached_html is not None:
+            return cached_html
+        
+        # folium takes most of a second to import, so it is loaded on first use
+        import folium
+        
         try:
-            # Get coordinates for the destination
+            # Marker offsets are seeded from the content hash, so the same plan always gets the same layout
+            rng = random.Random(int(content_hash[:16], 16))
+            
+            # Geocode what the user typed; a catalog name that merely looks similar may be another city
             destination_coords = self._get_coordinates(destination)
             
+            # Only a real destination fix can tell which places landed in the wrong town
+            filter_coords = destination_coords
             if not destination_coords:
-                st.warning(f"Could not find coordinates for {destination}. Using default map location.")
+                notifier.warning(f"Could not find coordinates for {destination}. Using default map location.")
                 destination_coords = (40.7128, -74.0060)  # Default to NYC coordinates
             
             # Create the base map
@@ -36,47 +114,254 @@ class MapGenerator:
                 icon=folium.Icon(color='red', icon='star')
             ).add_to(travel_map)
             
-            # Add markers for activities from itinerary
-            self._add_activity_markers(travel_map, itinerary_data, destination_coords)
+            # Resolve named places to real coordinates; anything unresolved falls back to an offset
+            place_coords, complete = self.geocode_places(destination, itinerary_data, filter_coords)
             
-            # Add food recommendation markers
-            self._add_food_markers(travel_map, itinerary_data, destination_coords)
+            if self.render_mode == 'geojson':
+                point_count = self._add_geojson_layers(travel_map, itinerary_data, destination_coords, rng, place_coords)
+            else:
+                # Add markers for activities from itinerary
+                point_count = self._add_activity_markers(travel_map, itinerary_data, destination_coords, rng, place_coords)
+                
+                # Add food recommendation markers
+                point_count += self._add_food_markers(travel_map, itinerary_data, destination_coords, rng, place_coords)
             
-            # Return the map as HTML
-            return travel_map._repr_html_()
+            # Return the map as HTML; only cache it once every place has been looked up,
+            # otherwise later views would keep the placeholder positions
+            with metrics.span('render_html'):
+                html = travel_map._repr_html_()
+            self.last_render_stats = {
+                'render_mode': self.render_mode,
+                'points': point_count,
+                'html_bytes': len(html.encode('utf-8')),
+            }
+            if complete:
+                self.map_cache.set(map_key, html)
+            return html
             
         except Exception as e:
-            st.error(f"Error generating map: {str(e)}")
+            notifier.error(f"Error generating map: {str(e)}")
             return None
     
     def _get_coordinates(self, location_name):
         """Get latitude and longitude for a location"""
         
+        found, coords = self.geocode_cache.lookup(location_name)
+        metrics.inc('geocode_cache_total', result='hit' if found else 'miss')
+        if found:
+            return coords
+        
+        coords, _ = self.single_flight.do(normalize_location(location_name), self._geocode_uncached, location_name)
+        return coords
+    
+    @metrics.timed('optimize_routes')
+    def optimize_routes(self, destination, itinerary_data):
+        """Reorder each day's activities into a short route between their geocoded places
+
+        Routes start from the destination centre. Returns a copy of
+        ``itinerary_data`` with the reordered ``daily_plan`` and a
+        ``route_summary`` of per-day and total distances; activities whose
+        places could not be located keep their slot.
+        """
+        try:
+            from route_optimizer import optimize_daily_plan
+            
+            destination_coords = self._get_coordinates(destination)
+            place_coords, _ = self.geocode_places(destination, itinerary_data, destination_coords)
+            
+            def coords_for_activity(activity):
+                for place in activity.get('specific_places') or []:
+                    if place in place_coords:
+                        return place_coords[place]
+                return None
+            
+            daily_plan, days = optimize_daily_plan(
+                itinerary_data.get('daily_plan', {}), coords_for_activity, start=destination_coords
+            )
+        except Exception as e:
+            notifier.warning(f"Could not optimize routes: {str(e)}")
+            return itinerary_data
+        
+        result = dict(itinerary_data, daily_plan=daily_plan)
+        result['route_summary'] = {'days': days}
+        for total in ('original_km', 'optimized_km', 'saved_km'):
+            result['route_summary'][total] = round(sum(day[total] for day in days.values()), 2)
+        return result
+    
+    @metrics.timed('geocode_places')
+    def geocode_places(self, destination, itinerary_data, destination_coords=None, deadline=None):
+        """Geocode every place named in an itinerary concurrently
+
+        Place names from ``specific_places``, ``nearby_restaurants`` and food
+        ``restaurant`` fields are deduplicated across the whole itinerary and
+        looked up as "<place>, <destination>". Cached answers are used directly;
+        the rest run on a shared thread pool, with network calls throttled by
+        the process-wide Nominatim token bucket. Returns ``(coords_by_place,
+        complete)``; lookups still running at the deadline keep going in the
+        background and warm the cache for the next request. Inside
+        ``shared_deadline`` the remaining time of that block is the deadline.
+        """
+        if deadline is None:
+            shared_at = _shared_deadline.get()
+            if shared_at is None:
+                deadline = float(os.getenv("PLACE_GEOCODE_DEADLINE", "5"))
+            else:
+                deadline = max(0.0, shared_at - time.monotonic())
+        queries = {}
+        for place in self._itinerary_places(itinerary_data):
+            queries.setdefault(normalize_location(place), (place, f"{place}, {destination}"))
+        
+        coords_by_place = {}
+        pending = {}
+        food_places = food_place_index()
+        for place, query in queries.values():
+            # Restaurants from the eating-place catalog already have coordinates
+            food_place = food_places.lookup(place)
+            if food_place is not None:
+                coords_by_place[place] = (food_place.latitude, food_place.longitude)
+                continue
+            found, coords = self.geocode_cache.lookup(query)
+            if found:
+                # Misses are counted by _get_coordinates, which checks the cache again
+                metrics.inc('geocode_cache_total', result='hit')
+                coords_by_place[place] = coords
+            else:
+                # Run in a copy of this context so the lookups show up in the caller's trace
+                future = self._get_place_executor().submit(contextvars.copy_context().run, self._get_coordinates, query)
+                pending[future] = place
+        
+        if pending:
+            done, not_done = wait(pending, timeout=deadline)
+            for future in done:
+                coords_by_place[pending[future]] = future.result()
+            complete = not not_done
+        else:
+            complete = True
+        
+        # Drop misses and matches that landed in the wrong town
+        resolved = {}
+        for place, coords in coords_by_place.items():
+            if coords is None:
+                continue
+            if destination_coords and haversine_km(*destination_coords, *coords) > MAX_PLACE_DISTANCE_KM:
+                continue
+            resolved[place] = coords
+        return resolved, complete
+    
+    @contextmanager
+    def shared_deadline(self, seconds=None):
+        """Give every ``geocode_places`` call in this block one deadline between them
+
+        Wrap the ``optimize_routes`` and ``generate_map`` calls of one request
+        in it, so waiting for slow places is bounded once, not once per call.
+        """
+        if seconds is None:
+            seconds = float(os.getenv("PLACE_GEOCODE_DEADLINE", "5"))
+        token = _shared_deadline.set(time.monotonic() + seconds)
+        try:
+            yield
+        finally:
+            _shared_deadline.reset(token)
+    
+    @classmethod
+    def _get_place_executor(cls):
+        if cls._place_executor is None:
+            workers = int(os.getenv("PLACE_GEOCODE_WORKERS", "4"))
+            cls._place_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="place-geocode")
+        return cls._place_executor
+    
+    def _itinerary_places(self, itinerary_data):
+        """Every distinct named place in an itinerary, in order of appearance"""
+        places = []
+        for day_activities in itinerary_data.get('daily_plan', {}).values():
+            for activity in day_activities:
+                places.extend(activity.get('specific_places') or [])
+                places.extend(activity.get('nearby_restaurants') or [])
+        for food_item in itinerary_data.get('food_recommendations', []):
+            if food_item.get('restaurant'):
+                places.append(food_item['restaurant'])
+        return list(dict.fromkeys(place.strip() for place in places if place and place.strip()))
+    
+    @metrics.timed('geocode')
+    def _geocode_uncached(self, location_name):
+        """Query the geocoder (with retries) and store the answer in the cache"""
+        
+        from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+        
         try:
             # Add retry logic for geocoding
             for attempt in range(3):
                 try:
                     location = self.geolocator.geocode(location_name, timeout=10)
                     if location:
-                        return (location.latitude, location.longitude)
+                        coords = (location.latitude, location.longitude)
+                        self.geocode_cache.set(location_name, coords)
+                        return coords
+                    # Definitive "not found" answer; cache it so we don't ask again
+                    self.geocode_cache.set(location_name, None)
                     break
                 except GeocoderTimedOut:
                     if attempt < 2:  # Don't sleep on the last attempt
+                        metrics.inc('geocode_retries_total')
                         time.sleep(1)
                     continue
                 except GeocoderServiceError as e:
-                    st.warning(f"Geocoding service error: {str(e)}")
+                    notifier.warning(f"Geocoding service error: {str(e)}")
                     break
             
             return None
             
         except Exception as e:
-            st.warning(f"Could not geocode location {location_name}: {str(e)}")
+            notifier.warning(f"Could not geocode location {location_name}: {str(e)}")
             return None
     
-    def _add_activity_markers(self, travel_map, itinerary_data, destination_coords):
-        """Add markers for activities and attractions"""
+    def _add_geojson_layers(self, travel_map, itinerary_data, destination_coords, rng=random, place_coords=None):
+        """Add every itinerary point to one clustered GeoJSON layer with a toggle per day; returns the point count"""
+        
+        from map_layers import ItineraryPointLayer
+        
+        try:
+            lat, lon = destination_coords
+            points = ItineraryPointLayer()
+            for day_index, (day, day_activities) in enumerate(itinerary_data.get('daily_plan', {}).items()):
+                layer = points.add_layer(day, MARKER_COLORS[(day_index + 1) % len(MARKER_COLORS)])
+                for activity in day_activities:
+                    point = (lat + rng.uniform(-0.01, 0.01), lon + rng.uniform(-0.01, 0.01))
+                    for place in activity.get('specific_places') or []:
+                        if place_coords and place in place_coords:
+                            point = place_coords[place]
+                            break
+                    points.add_point(
+                        layer, point, activity['name'], activity.get('time', ''),
+                        activity.get('estimated_cost', ''), activity.get('description', '')
+                    )
+            
+            food_recommendations = itinerary_data.get('food_recommendations', [])
+            if food_recommendations:
+                layer = points.add_layer('🍽️ Food', 'orange')
+                for food_item in food_recommendations:
+                    point = (lat + rng.uniform(-0.015, 0.015), lon + rng.uniform(-0.015, 0.015))
+                    if place_coords and food_item.get('restaurant') in place_coords:
+                        point = place_coords[food_item['restaurant']]
+                    points.add_point(
+                        layer, point, f"🍽️ {food_item['name']}",
+                        cost=food_item.get('price_range', 'Moderate'),
+                        description=food_item.get('description', 'Local specialty'),
+                        location=food_item.get('restaurant') or 'Various'
+                    )
+            
+            points.add_to(travel_map)
+        except Exception as e:
+            notifier.warning(f"Could not add itinerary points: {str(e)}")
+            return 0
+        return len(points)
+    
+    def _add_activity_markers(self, travel_map, itinerary_data, destination_coords, rng=random, place_coords=None):
+        """Add markers for activities and attractions; returns how many were added"""
+        
+        import folium
         
+        added = 0
         try:
             # Extract activity locations from daily plan
             activities = []
@@ -87,16 +372,21 @@ class MapGenerator:
                         'day': day,
                         'description': activity.get('description', ''),
                         'time': activity.get('time', ''),
-                        'cost': activity.get('estimated_cost', '')
+                        'cost': activity.get('estimated_cost', ''),
+                        'places': activity.get('specific_places') or []
                     })
             
             # Generate coordinates for activities (around destination)
             lat, lon = destination_coords
             
             for i, activity in enumerate(activities[:10]):  # Limit to 10 activities
-                # Generate random coordinates around the destination
-                activity_lat = lat + random.uniform(-0.01, 0.01)
-                activity_lon = lon + random.uniform(-0.01, 0.01)
+                # Use the first geocoded place, otherwise random coordinates around the destination
+                activity_lat = lat + rng.uniform(-0.01, 0.01)
+                activity_lon = lon + rng.uniform(-0.01, 0.01)
+                for place in activity['places']:
+                    if place_coords and place in place_coords:
+                        activity_lat, activity_lon = place_coords[place]
+                        break
                 
                 # Create popup content
                 popup_content = f"""
@@ -117,8 +407,7 @@ class MapGenerator:
                     except:
                         day_number = i + 1
                 
-                colors = ['blue', 'green', 'purple', 'orange', 'darkred', 'lightred', 'beige', 'darkblue', 'darkgreen', 'cadetblue']
-                icon_color = colors[day_number % len(colors)]
+                icon_color = MARKER_COLORS[day_number % len(MARKER_COLORS)]
                 
                 folium.Marker(
                     location=[activity_lat, activity_lon],
@@ -126,21 +415,28 @@ class MapGenerator:
                     tooltip=activity['name'],
                     icon=folium.Icon(color=icon_color, icon='info-sign')
                 ).add_to(travel_map)
+                added += 1
                 
         except Exception as e:
-            st.warning(f"Could not add activity markers: {str(e)}")
+            notifier.warning(f"Could not add activity markers: {str(e)}")
+        return added
     
-    def _add_food_markers(self, travel_map, itinerary_data, destination_coords):
-        """Add markers for food recommendations"""
+    def _add_food_markers(self, travel_map, itinerary_data, destination_coords, rng=random, place_coords=None):
+        """Add markers for food recommendations; returns how many were added"""
         
+        import folium
+        
+        added = 0
         try:
             food_recommendations = itinerary_data.get('food_recommendations', [])
             lat, lon = destination_coords
             
             for i, food_item in enumerate(food_recommendations[:5]):  # Limit to 5 food recommendations
-                # Generate random coordinates around the destination for restaurants
-                food_lat = lat + random.uniform(-0.015, 0.015)
-                food_lon = lon + random.uniform(-0.015, 0.015)
+                # Use the geocoded restaurant, otherwise random coordinates around the destination
+                food_lat = lat + rng.uniform(-0.015, 0.015)
+                food_lon = lon + rng.uniform(-0.015, 0.015)
+                if place_coords and food_item.get('restaurant') in place_coords:
+                    food_lat, food_lon = place_coords[food_item['restaurant']]
                 
                 # Create popup content
                 popup_content = f"""
@@ -158,16 +454,19 @@ class MapGenerator:
                     tooltip=food_item['name'],
                     icon=folium.Icon(color='orange', icon='cutlery')
                 ).add_to(travel_map)
+                added += 1
                 
         except Exception as e:
-            st.warning(f"Could not add food markers: {str(e)}")
+            notifier.warning(f"Could not add food markers: {str(e)}")
+        return added
     
-    def _generate_area_coordinates(self, center_coords, radius=0.02):
+    def _generate_area_coordinates(self, center_coords, radius=0.02, rng=random):
         """Generate random coordinates within a radius of the center"""
         lat, lon = center_coords
         
         # Generate random offset within radius
-        lat_offset = random.uniform(-radius, radius)
-        lon_offset = random.uniform(-radius, radius)
+        lat_offset = rng.uniform(-radius, radius)
+        lon_offset = rng.uniform(-radius, radius)
         
         return (lat + lat_offset, lon + lon_offset)
+
@@ -0,0 +1,98 @@
+from branca.element import MacroElement
+from folium.elements import JSCSSMixin
+from folium.plugins import MarkerCluster
+from folium.template import Template
+
+
+class ItineraryPointLayer(JSCSSMixin, MacroElement):
+    """All itinerary points as one GeoJSON FeatureCollection, clustered client-side.
+
+    Each feature carries a ``layer`` index into ``layers`` (one per day plus
+    food); the browser builds one toggleable sub-layer per entry inside a
+    single marker cluster and renders popups and tooltips from the feature
+    properties. The script and styling are emitted once per map, so the HTML
+    grows only by the compact feature JSON per point.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.markerClusterGroup(
+                {{ this.options|tojavascript }}
+            ).addTo({{ this._parent.get_name() }});
+            (function(map, cluster, data, layers) {
+                function escape(value) {
+                    return String(value == null ? '' : value).replace(/[&<>"']/g, function(c) {
+                        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+                    });
+                }
+                var overlays = {};
+                layers.forEach(function(layer, index) {
+                    var group = L.featureGroup.subGroup(cluster).addTo(map);
+                    L.geoJSON(data, {
+                        filter: function(feature) { return feature.properties.layer === index; },
+                        pointToLayer: function(feature, latlng) {
+                            return L.circleMarker(latlng, {
+                                radius: 7, weight: 2, color: layer.color, fillColor: layer.color, fillOpacity: 0.8
+                            });
+                        },
+                        onEachFeature: function(feature, marker) {
+                            var p = feature.properties;
+                            marker.bindTooltip(escape(p.name));
+                            marker.bindPopup(
+                                '<b>' + escape(p.name) + '</b><br><i>' + escape(layer.name) + '</i><br>'
+                                + (p.time ? 'Time: ' + escape(p.time) + '<br>' : '')
+                                + (p.cost ? 'Cost: ' + escape(p.cost) + '<br>' : '')
+                                + (p.location ? 'Location: ' + escape(p.location) + '<br>' : '')
+                                + escape(p.description),
+                                {maxWidth: 250}
+                            );
+                        }
+                    }).eachLayer(function(marker) { group.addLayer(marker); });
+                    overlays[escape(layer.name)] = group;
+                });
+                L.control.layers(null, overlays, {collapsed: {{ this.collapsed|tojson }}}).addTo(map);
+            })(
+                {{ this._parent.get_name() }},
+                {{ this.get_name() }},
+                {{ this.data|tojson }},
+                {{ this.layers|tojson }}
+            );
+        {% endmacro %}
+        """
+    )
+
+    default_js = MarkerCluster.default_js + [
+        (
+            "featuregroupsubgroupjs",
+            "https://unpkg.com/leaflet.featuregroup.subgroup@1.0.2/dist/leaflet.featuregroup.subgroup.js",
+        ),
+    ]
+    default_css = MarkerCluster.default_css
+
+    def __init__(self, collapsed=False, disable_clustering_at_zoom=16):
+        super().__init__()
+        self._name = "ItineraryPointLayer"
+        self.layers = []
+        self.data = {'type': 'FeatureCollection', 'features': []}
+        self.collapsed = collapsed
+        self.options = {'disableClusteringAtZoom': disable_clustering_at_zoom}
+
+    def add_layer(self, name, color):
+        """Start a new toggleable layer; returns its index for ``add_point``"""
+        self.layers.append({'name': name, 'color': color})
+        return len(self.layers) - 1
+
+    def add_point(self, layer, coords, name, time='', cost='', description='', location=''):
+        """Add a point at ``(lat, lon)`` to the layer with index ``layer``"""
+        properties = {'layer': layer, 'name': name, 'time': time, 'cost': cost, 'description': description}
+        if location:
+            properties['location'] = location
+        self.data['features'].append({
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [round(coords[1], 6), round(coords[0], 6)]},
+            'properties': properties,
+        })
+
+    def __len__(self):
+        return len(self.data['features'])
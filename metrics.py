@@ -0,0 +1,230 @@
+import bisect
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = 'travel_planner_'
+# Histogram bucket bounds in seconds, from a cache hit to a slow model call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HELP = {
+    'stage_seconds': "Time spent in each generation stage",
+    'itinerary_cache_total': "Itinerary result cache lookups by result",
+    'fallbacks_total': "Template itineraries generated instead of AI ones, by reason",
+    'hf_responses_total': "Hugging Face API attempts by HTTP status ('network' for connection errors)",
+    'hf_retries_total': "Hugging Face API attempts retried after a transient failure",
+    'geocode_cache_total': "Geocode cache lookups by result",
+    'geocode_retries_total': "Geocoding requests retried after a timeout",
+    'map_cache_total': "Rendered map cache lookups by result",
+    'session_store': "Shared session store statistics (bytes, entries, bytes_per_session, ...), by stat",
+}
+
+_trace = contextvars.ContextVar('metrics_trace', default=None)
+_depth = contextvars.ContextVar('metrics_depth', default=0)
+
+
+class Metrics:
+    """Process-wide counters and stage timings for the planner core.
+
+    Like ``notifications.notifier``, the core only reports (``inc``, ``span``,
+    ``timed``) and never knows who is listening. ``render_prometheus`` gives
+    the Prometheus text format, served by ``start_http_server`` or written by
+    ``write_file``. ``trace`` additionally collects the spans of one request,
+    including those run on worker threads through ``contextvars.copy_context``,
+    for the app's debug panel.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            histogram[0][bisect.bisect_left(self.buckets, value)] += 1
+            histogram[1] += value
+
+    def gauges(self, name, callback):
+        """Export ``callback()``'s numeric values as gauge ``name{stat=...}``, read at every render
+
+        For components that already keep their own statistics, such as the
+        session store; registering the same name again replaces the callback.
+        """
+        with self._lock:
+            self._gauges[name] = callback
+
+    @contextmanager
+    def span(self, stage):
+        """Time a block as ``stage_seconds{stage=...}`` and add it to the current trace, if any"""
+        spans = _trace.get()
+        record = None
+        if spans is not None:
+            record = {'stage': stage, 'seconds': None, 'depth': _depth.get()}
+            spans.append(record)
+        depth_token = _depth.set(_depth.get() + 1)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _depth.reset(depth_token)
+            self.observe('stage_seconds', elapsed, stage=stage)
+            if record is not None:
+                record['seconds'] = elapsed
+
+    def timed_iter(self, stage, iterable):
+        """Yield from ``iterable``, timing only the work of producing each item as one ``stage`` span
+
+        For streams consumed piece by piece: what the consumer does between
+        items (rendering, for instance) is not counted, and spans started while
+        producing an item nest under ``stage``.
+        """
+        spans = _trace.get()
+        depth = _depth.get()
+        record = None
+        if spans is not None:
+            record = {'stage': stage, 'seconds': None, 'depth': depth}
+            spans.append(record)
+        iterator = iter(iterable)
+        elapsed = 0.0
+        try:
+            while True:
+                depth_token = _depth.set(depth + 1)
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                    _depth.reset(depth_token)
+                yield item
+        finally:
+            self.observe('stage_seconds', elapsed, stage=stage)
+            if record is not None:
+                record['seconds'] = elapsed
+
+    def timed(self, stage):
+        """Decorator form of ``span``"""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def trace(self):
+        """Collect every span started in this context as ``{'stage', 'seconds', 'depth'}`` dicts"""
+        spans = []
+        token = _trace.set(spans)
+        try:
+            yield spans
+        finally:
+            _trace.reset(token)
+
+    def snapshot(self):
+        """Counters as ``{(name, labels): value}`` and histograms as ``{(name, labels): (count, sum)}``"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (sum(counts), total) for key, (counts, total) in self._histograms.items()}
+        return counters, histograms
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(counts), total)) for key, (counts, total) in self._histograms.items())
+            gauges = sorted(self._gauges.items())
+        lines = []
+        described = set()
+
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, 'counter')
+            lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+        for (name, labels), (counts, total) in histograms:
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {total:.6f}")
+            lines.append(f"{PREFIX}{name}_count{_labels(labels)} {cumulative}")
+        for name, callback in gauges:
+            header(name, 'gauge')
+            for stat, value in sorted(callback().items()):
+                if isinstance(value, (int, float)):
+                    lines.append(f"{PREFIX}{name}{_labels((('stat', stat),))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Write ``render_prometheus`` atomically, e.g. for node_exporter's textfile collector"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+    def start_http_server(self, port, host='0.0.0.0'):
+        """Serve ``GET /metrics`` on a daemon thread; returns the server"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        return server
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+# Process-wide registry used by the planner core
+metrics = Metrics()
@@ -0,0 +1,111 @@
+import contextvars
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+INFO = 'info'
+WARNING = 'warning'
+ERROR = 'error'
+
+_LOG_LEVELS = {INFO: logging.INFO, WARNING: logging.WARNING, ERROR: logging.ERROR}
+
+logger = logging.getLogger('travel_planner')
+
+_scoped_sinks = contextvars.ContextVar('notification_sinks', default=())
+
+
+class Notifier:
+    """Pluggable sink for user-facing messages from the planner core.
+
+    The core (TravelPlanner, MapGenerator, ...) never talks to a UI directly;
+    it calls ``info``/``warning``/``error`` here and every subscriber receives
+    ``(level, message)`` synchronously, in the caller's thread. ``scoped``
+    sinks only receive the messages raised in one context (one UI session,
+    say), including worker threads started with ``contextvars.copy_context``.
+    With no subscribers, messages go to the ``travel_planner`` logger, which
+    is what headless and batch runs want.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Register ``callback(level, message)``; subscribing the same callback twice is a no-op"""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers = self._subscribers + [callback]
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [subscriber for subscriber in self._subscribers if subscriber != callback]
+
+    @contextmanager
+    def scoped(self, callback):
+        """Also send the notifications raised in this context to ``callback`` while the block runs"""
+        token = _scoped_sinks.set(_scoped_sinks.get() + (callback,))
+        try:
+            yield callback
+        finally:
+            _scoped_sinks.reset(token)
+
+    def notify(self, level, message):
+        subscribers = self._subscribers + list(_scoped_sinks.get())
+        if not subscribers:
+            logger.log(_LOG_LEVELS.get(level, logging.INFO), message)
+            return
+        for callback in subscribers:
+            callback(level, message)
+
+    def info(self, message):
+        self.notify(INFO, message)
+
+    def warning(self, message):
+        self.notify(WARNING, message)
+
+    def error(self, message):
+        self.notify(ERROR, message)
+
+
+class ThreadBoundSink:
+    """Delivers to a sink that only works on one thread, e.g. ``streamlit_sink`` on the script thread
+
+    Messages raised on the owning thread are delivered at once; those from
+    worker threads are queued until the owner calls ``flush``. ``bind`` makes
+    the calling thread the owner, for sinks that outlive one script run.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.owner = threading.get_ident()
+        self._pending = queue.SimpleQueue()
+
+    def __call__(self, level, message):
+        if threading.get_ident() == self.owner:
+            self.callback(level, message)
+        else:
+            self._pending.put((level, message))
+
+    def bind(self):
+        self.owner = threading.get_ident()
+        return self
+
+    def flush(self):
+        """Deliver the queued messages; call on the owning thread"""
+        while True:
+            try:
+                level, message = self._pending.get_nowait()
+            except queue.Empty:
+                return
+            self.callback(level, message)
+
+
+def streamlit_sink(level, message):
+    """Show a notification on the current Streamlit page (st.info / st.warning / st.error)"""
+    import streamlit as st
+    getattr(st, level, st.info)(message)
+
+
+notifier = Notifier()
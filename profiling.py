@@ -0,0 +1,192 @@
+import contextvars
+import functools
+import inspect
+import itertools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+# PROFILE_REQUESTS: unset/empty = off, "all" = every wrapped call, "query" = only requests
+# the app marks with ``requested()`` (``?profile=1``), so nobody can profile a server that didn't opt in
+PROFILE_MODE = os.getenv("PROFILE_REQUESTS", "").strip().lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "2")) / 1000
+TRACEMALLOC_FRAMES = 25
+TOP_ALLOCATIONS = 25
+
+_requested = contextvars.ContextVar('profile_requested', default=False)
+_active = contextvars.ContextVar('profile_active', default=False)
+_sequence = itertools.count(1)
+# tracemalloc is process-wide, so overlapping profiles share one tracing session
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def enabled():
+    """Whether the current call should be profiled"""
+    if PROFILE_MODE == 'all':
+        return True
+    return PROFILE_MODE == 'query' and _requested.get()
+
+
+@contextmanager
+def requested():
+    """Mark the calls made in this block as asking to be profiled (honoured in "query" mode)"""
+    token = _requested.set(True)
+    try:
+        yield
+    finally:
+        _requested.reset(token)
+
+
+def profiled(name):
+    """Profile each call of the decorated function when profiling is enabled
+
+    With PROFILE_REQUESTS unset the function is returned undecorated, so
+    there is no overhead at all. Otherwise the calling thread's stack is
+    sampled every PROFILE_INTERVAL_MS and allocations are traced; a
+    collapsed-stack file (for flamegraph.pl or speedscope), a tracemalloc
+    snapshot and a text summary are written to PROFILE_DIR, keeping the last
+    PROFILE_KEEP calls. Generator functions are profiled until exhausted.
+    Calls nested inside a profiled call are part of the outer profile.
+    """
+    def decorator(function):
+        if not PROFILE_MODE:
+            return function
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                if _active.get() or not enabled():
+                    return (yield from function(*args, **kwargs))
+                with _profile(name):
+                    return (yield from function(*args, **kwargs))
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active.get() or not enabled():
+                return function(*args, **kwargs)
+            with _profile(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a background thread into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """``frame;frame;frame count`` lines, outermost frame first"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _start_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0:
+            _tracing_owned = not tracemalloc.is_tracing()
+            if _tracing_owned:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+
+
+@contextmanager
+def _profile(name):
+    active_token = _active.set(True)
+    _start_tracing()
+    before = tracemalloc.take_snapshot()
+    sampler = StackSampler(threading.get_ident()).start()
+    start_wall, start_cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - start_wall, time.thread_time() - start_cpu
+        sampler.stop()
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        _stop_tracing()
+        _active.reset(active_token)
+        try:
+            _write_profile(name, sampler, before, after, wall, cpu, peak)
+        except OSError:
+            pass  # Profiling must never break the request it observes
+
+
+def _write_profile(name, sampler, before, after, wall, cpu, peak):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(
+        PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence):04d}-{name}"
+    )
+    with open(f"{stem}.collapsed", 'w', encoding='utf-8') as f:
+        f.write(sampler.collapsed())
+    after.dump(f"{stem}.tracemalloc")
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    growth = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    lines = [
+        f"{name}: wall {wall * 1000:.1f} ms, cpu {cpu * 1000:.1f} ms, "
+        f"{sampler.samples} samples every {sampler.interval * 1000:g} ms, traced peak {peak / 1024:.0f} KB",
+        "",
+        f"Top {TOP_ALLOCATIONS} allocation sites by growth during the call:",
+    ]
+    lines.extend(str(stat) for stat in growth[:TOP_ALLOCATIONS])
+    with open(f"{stem}.txt", 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    _rotate(PROFILE_DIR, PROFILE_KEEP)
+
+
+def _rotate(directory, keep):
+    """Delete the files of all but the newest ``keep`` profiled calls"""
+    stems = {}
+    for entry in os.scandir(directory):
+        stem = entry.name.split('.', 1)[0]
+        stems[stem] = max(stems.get(stem, 0), entry.stat().st_mtime)
+    for stem in sorted(stems, key=stems.get, reverse=True)[keep:]:
+        for suffix in ('.collapsed', '.tracemalloc', '.txt'):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,188 @@
+from itertools import groupby
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_matrix(coords):
+    """Pairwise great-circle distances in kilometres for an ``(n, 2)`` array of (lat, lon)"""
+    radians = np.radians(np.asarray(coords, dtype=float).reshape(-1, 2))
+    lat = radians[:, 0]
+    lon = radians[:, 1]
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(distances, order):
+    """Length of the open path visiting ``order`` in sequence"""
+    order = np.asarray(order)
+    return float(distances[order[:-1], order[1:]].sum())
+
+
+def nearest_neighbor_order(distances, start=0):
+    """Greedy path from ``start`` that always moves to the closest unvisited node"""
+    n = len(distances)
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, distances[order[-1]])
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        visited[nxt] = True
+    return order
+
+
+def two_opt(distances, order, max_passes=100):
+    """Improve a path with both endpoints fixed by reversing segments while that shortens it.
+
+    Every candidate reversal ``order[i..j]`` is scored at once with NumPy and
+    the best one is applied, until no reversal helps.
+    """
+    order = np.array(order)
+    n = len(order)
+    if n < 4:
+        return order.tolist()
+    i_idx, j_idx = np.triu_indices(n - 2, k=1)
+    i_idx = i_idx + 1
+    j_idx = j_idx + 1
+    for _ in range(max_passes):
+        prev, first, last, nxt = order[i_idx - 1], order[i_idx], order[j_idx], order[j_idx + 1]
+        delta = (distances[prev, last] + distances[first, nxt]
+                 - distances[prev, first] - distances[last, nxt])
+        best = int(np.argmin(delta))
+        if delta[best] >= -1e-9:
+            break
+        i, j = i_idx[best], j_idx[best]
+        order[i:j + 1] = order[i:j + 1][::-1]
+    return order.tolist()
+
+
+def or_opt(distances, order, max_segment=3, max_passes=100):
+    """Improve a path with both endpoints fixed by moving runs of up to ``max_segment`` nodes elsewhere.
+
+    Catches what 2-opt misses on short open paths (e.g. one stop visited out
+    of the way); insertion points for each run are scored at once with NumPy.
+    """
+    order = list(order)
+    for _ in range(max_passes):
+        improved = False
+        for length in range(1, max_segment + 1):
+            for i in range(1, len(order) - length):
+                segment = order[i:i + length]
+                prev, nxt = order[i - 1], order[i + length]
+                gain = distances[prev, segment[0]] + distances[segment[-1], nxt] - distances[prev, nxt]
+                rest = np.array(order[:i] + order[i + length:])
+                left, right = rest[:-1], rest[1:]
+                base = distances[left, right]
+                forward = distances[left, segment[0]] + distances[segment[-1], right] - base
+                backward = distances[left, segment[-1]] + distances[segment[0], right] - base
+                k_forward, k_backward = int(np.argmin(forward)), int(np.argmin(backward))
+                if forward[k_forward] <= backward[k_backward]:
+                    k, cost, moved = k_forward, forward[k_forward], segment
+                else:
+                    k, cost, moved = k_backward, backward[k_backward], segment[::-1]
+                if cost - gain < -1e-9:
+                    rest = rest.tolist()
+                    order = rest[:k + 1] + moved + rest[k + 1:]
+                    improved = True
+                    break
+            if improved:
+                break
+        if not improved:
+            break
+    return order
+
+
+def optimize_order(coords, start=None):
+    """Visiting order for ``coords`` that keeps the path short.
+
+    With ``start`` (e.g. the hotel or city centre) the path begins there,
+    otherwise it may begin anywhere. The end is always free. Returns
+    ``(order, original_km, optimized_km)`` where ``order`` indexes ``coords``
+    and ``original_km`` is the length in the given order.
+    """
+    n = len(coords)
+    if n == 0:
+        return [], 0.0, 0.0
+    points = list(coords) if start is None else [start] + list(coords)
+    real = haversine_matrix(points)
+    # A dummy node at distance 0 from everything turns the open path into one with fixed ends
+    size = len(points) + 1
+    distances = np.zeros((size, size))
+    distances[:-1, :-1] = real
+    dummy = size - 1
+    offset = 0 if start is None else 1
+    head = dummy if start is None else 0
+
+    original = [head] + list(range(offset, offset + n)) + [dummy]
+    greedy = nearest_neighbor_order(real, start=0)
+    improved = [head] + [node for node in greedy if node != head] + [dummy]
+    best_km = path_length(distances, improved)
+    while True:
+        improved = or_opt(distances, two_opt(distances, improved))
+        improved_km = path_length(distances, improved)
+        if improved_km >= best_km - 1e-9:
+            break
+        best_km = improved_km
+
+    original_km = path_length(distances, original)
+    optimized_km = path_length(distances, improved)
+    if optimized_km >= original_km:
+        return list(range(n)), original_km, original_km
+    return [node - offset for node in improved[1:-1]], original_km, optimized_km
+
+
+def route_km(points, start=None):
+    """Length in kilometres of the path through ``points`` in order, from ``start`` if given"""
+    points = list(points) if start is None else [start] + list(points)
+    if len(points) < 2:
+        return 0.0
+    return path_length(haversine_matrix(points), range(len(points)))
+
+
+def time_runs(activities):
+    """Slot indices of each run of consecutive activities sharing the same ``time``"""
+    return [
+        [slot for slot, _ in run]
+        for _, run in groupby(enumerate(activities), key=lambda item: item[1].get('time'))
+    ]
+
+
+def optimize_daily_plan(daily_plan, coords_for_activity, start=None):
+    """Reorder each day's activities into a short route without changing when they happen.
+
+    ``coords_for_activity(activity)`` returns (lat, lon) or ``None``. Only
+    consecutive activities with the same ``time`` ("Morning", ...) are
+    reordered among themselves, each run starting where the previous one
+    ended; activities without coordinates keep their slot. Returns ``(plan,
+    summary)`` where ``summary`` maps each day to its original, optimized and
+    saved km.
+    """
+    plan = {}
+    summary = {}
+    for day, activities in daily_plan.items():
+        points = [coords_for_activity(activity) for activity in activities]
+        sequence = list(range(len(activities)))
+        position = start
+        for run in time_runs(activities):
+            located = [slot for slot in run if points[slot] is not None]
+            order, _, _ = optimize_order([points[slot] for slot in located], position)
+            for slot, index in zip(located, order):
+                sequence[slot] = located[index]
+            if located:
+                position = points[sequence[located[-1]]]
+        original_km = route_km([point for point in points if point is not None], start)
+        optimized_km = route_km([points[index] for index in sequence if points[index] is not None], start)
+        if optimized_km >= original_km:
+            sequence, optimized_km = list(range(len(activities))), original_km
+        plan[day] = [dict(activities[index]) for index in sequence]
+        summary[day] = {
+            'original_km': round(original_km, 2),
+            'optimized_km': round(optimized_km, 2),
+            'saved_km': round(original_km - optimized_km, 2),
+        }
+    return plan, summary
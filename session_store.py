@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from itinerary_model import Itinerary, dumps, loads
+
+
+class ContentStore:
+    """Shared, content-addressed store for per-session payloads.
+
+    Payloads are keyed by the SHA-256 of their bytes, so sessions holding the
+    same itinerary or map share one copy and each session only keeps the key.
+    The store is bounded by total payload bytes: the least recently used
+    entries are evicted first, and entries also expire after ``ttl`` seconds.
+    ``track`` records which keys each session holds so ``stats`` can report
+    how many bytes every session really costs.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=24 * 3600, session_ttl=3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.session_ttl = session_ttl
+        self._entries = OrderedDict()
+        self._sessions = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0, 'misses': 0, 'puts': 0, 'deduplicated': 0, 'evictions': 0, 'expired': 0, 'rejected': 0
+        }
+
+    def put(self, data):
+        """Store ``data`` (bytes) and return its key; storing known content only refreshes it
+
+        Returns ``None`` if ``data`` is bigger than the whole store.
+        """
+        key = hashlib.sha256(data).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            self._stats['puts'] += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._stats['deduplicated'] += 1
+                self._entries[key] = (entry[0], now + self.ttl)
+                self._entries.move_to_end(key)
+                return key
+            if len(data) > self.max_bytes:
+                self._stats['rejected'] += 1
+                return None
+            self._entries[key] = (data, now + self.ttl)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._stats['evictions'] += 1
+        return key
+
+    def get(self, key):
+        """Return the bytes stored under ``key``, or ``None`` if evicted, expired or unknown"""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return data
+                del self._entries[key]
+                self._bytes -= len(data)
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+            return None
+
+    def put_itinerary(self, itinerary_data):
+        """Store an itinerary dict in the compact itinerary_model format"""
+        return self.put(dumps(Itinerary.from_dict(itinerary_data)))
+
+    def get_itinerary(self, key):
+        data = self.get(key)
+        return None if data is None else loads(data).to_dict()
+
+    def put_html(self, html):
+        """Store rendered HTML compressed; folium maps shrink several-fold"""
+        return self.put(zlib.compress(html.encode('utf-8'), 6))
+
+    def get_html(self, key):
+        data = self.get(key)
+        return None if data is None else zlib.decompress(data).decode('utf-8')
+
+    def track(self, session_id, *keys):
+        """Record the keys a session currently holds; sessions unseen for ``session_ttl`` are dropped"""
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session_id] = (tuple(key for key in keys if key), now)
+            stale = [sid for sid, (_, seen) in self._sessions.items() if now - seen > self.session_ttl]
+            for sid in stale:
+                del self._sessions[sid]
+
+    def forget(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self):
+        """Counters plus ``bytes`` held, ``session_bytes`` (what the tracked sessions would hold
+        on their own) and the resulting ``bytes_per_session`` and ``dedup_ratio``"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+            stats['sessions'] = len(self._sessions)
+            stats['session_bytes'] = sum(
+                len(self._entries[key][0])
+                for keys, _ in self._sessions.values() for key in keys if key in self._entries
+            )
+        stats['bytes_per_session'] = stats['bytes'] / stats['sessions'] if stats['sessions'] else 0.0
+        stats['dedup_ratio'] = stats['session_bytes'] / stats['bytes'] if stats['bytes'] else 1.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sessions.clear()
+            self._bytes = 0
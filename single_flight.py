@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait on the same future and get its result (or exception).
+    Nothing is cached once the call finishes - that is the result caches' job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._stats = {'calls': 0, 'executions': 0, 'coalesced': 0, 'errors': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run ``fn`` once per in-flight ``key``; return ``(result, shared)``
+
+        ``shared`` is ``True`` for callers that received another caller's
+        result, so they can copy it before mutating.
+        """
+        future, leader = self.acquire(key)
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.release(key, error=e)
+            raise
+        self.release(key, result)
+        return result, False
+
+    def acquire(self, key):
+        """Join the call in flight for ``key``, or start one; return ``(future, leader)``
+
+        For work that can't be wrapped in one function call, such as a
+        generator. The leader must call ``release`` exactly once; everyone
+        else waits on ``future``.
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._stats['coalesced'] += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            self._stats['executions'] += 1
+            return future, True
+
+    def release(self, key, result=None, error=None):
+        """Finish the leader's call for ``key`` with a result or an exception"""
+        with self._lock:
+            if error is not None:
+                self._stats['errors'] += 1
+            future = self._in_flight.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._in_flight)
+
+    def stats(self):
+        """Return call/execution/coalesced counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._in_flight)
+        return stats
@@ -1,66 +1,273 @@
+import copy
 import os
-import requests
-import streamlit as st
-from utils import parse_budget_range, format_interests
-from landmarks_data import get_landmarks_for_destination
+from hf_client import (
+    HuggingFaceClient, HuggingFaceError, HuggingFaceAuthError, HuggingFaceUnavailableError,
+    HuggingFaceTimeoutError
+)
+from utils import parse_budget_range, format_interests, budget_tier, normalize_location
+from landmarks_data import get_landmarks_for_destination, canonical_destination
+from cost_engine import estimate_range, format_range
+from ttl_cache import TTLCache
+from itinerary_model import Itinerary
+from single_flight import SingleFlight
+from notifications import notifier
+from metrics import metrics
+from profiling import profiled
+from itinerary_parser import (
+    IncrementalItineraryParser, ParseEvent, parse_activity, parse_food_item,
+    classify_keywords, FALLBACK_FOOD, FALLBACK_TIP, FALLBACK_LIMIT
+)
+
+HF_GENERATION_PARAMETERS = {
+    "max_length": 1000,
+    "temperature": 0.7,
+    "do_sample": True
+}
+
+# Time slots of a full sightseeing day; each can hold one landmark
+DAY_SLOTS = ('morning', 'afternoon', 'evening')
+# Catalog eating places suggested next to a landmark: nearest first, within walking distance
+NEARBY_RESTAURANT_RADIUS_M = 500
+NEARBY_RESTAURANT_LIMIT = 3
 
 class TravelPlanner:
-    def __init__(self):
+    # Process-wide, so concurrent sessions asking for the same plan share one upstream call
+    single_flight = SingleFlight()
+
+    def __init__(self, cache_size=None, ai_cache_ttl=None, template_cache_ttl=None, hf_client=None):
         self.hf_api_key = os.getenv("HUGGING_FACE_API_KEY", "")
-        self.api_url = "https://api-inference.huggingface.co/models/google/flan-t5-large"
+        # HF_API_URL points the planner at another endpoint, e.g. the benchmark mock server
+        self.api_url = os.getenv("HF_API_URL", "https://api-inference.huggingface.co/models/google/flan-t5-large")
         self.headers = {"Authorization": f"Bearer {self.hf_api_key}"}
+        self.hf_client = hf_client or HuggingFaceClient(self.api_url, self.hf_api_key)
+        # AI results are expensive and stable, so they live longer than template results,
+        # which are usually a fallback and should give the API another chance soon
+        if cache_size is None:
+            cache_size = int(os.getenv("ITINERARY_CACHE_SIZE", "256"))
+        if ai_cache_ttl is None:
+            ai_cache_ttl = float(os.getenv("ITINERARY_CACHE_AI_TTL", "21600"))
+        if template_cache_ttl is None:
+            template_cache_ttl = float(os.getenv("ITINERARY_CACHE_TEMPLATE_TTL", "600"))
+        self.ai_cache_ttl = ai_cache_ttl
+        self.template_cache_ttl = template_cache_ttl
+        self.result_cache = TTLCache(max_entries=cache_size, ttl=ai_cache_ttl)
 
-    def generate_itinerary(self, destination, budget, num_people, num_days, interests):
+    @profiled('generate_itinerary')
+    def generate_itinerary(self, destination, budget, num_people, num_days, interests, use_cache=True):
         """Generate a personalized travel itinerary using Hugging Face API with fallback"""
+        fingerprint = itinerary_fingerprint(destination, budget, num_people, num_days, interests)
+        if use_cache:
+            cached = self.result_cache.get(fingerprint)
+            metrics.inc('itinerary_cache_total', result='miss' if cached is None else 'hit')
+            if cached is not None:
+                return _for_caller(cached.to_dict(), destination)
+
+        # Identical requests already being generated by another session wait for that result
+        result, shared = self.single_flight.do(
+            fingerprint, self._generate_and_cache, fingerprint, canonical_destination(destination),
+            budget, num_people, num_days, interests
+        )
+        return _for_caller(copy.deepcopy(result) if shared else result, destination)
+
+    @metrics.timed('generate_itinerary')
+    def _generate_and_cache(self, fingerprint, destination, budget, num_people, num_days, interests):
         try:
             if self.hf_api_key:
                 ai_result = self._try_huggingface_api(destination, budget, num_people, num_days, interests)
                 if ai_result:
+                    self.result_cache.set(fingerprint, Itinerary.from_dict(ai_result), ttl=self.ai_cache_ttl)
                     return ai_result
-            st.info("Using template-based itinerary generation...")
-            return self._generate_template_itinerary(destination, budget, num_people, num_days, interests)
+            metrics.inc('fallbacks_total', reason='api_error' if self.hf_api_key else 'no_api_key')
+            notifier.info("Using template-based itinerary generation...")
+            result = self._generate_template_itinerary(destination, budget, num_people, num_days, interests)
         except Exception as e:
-            st.warning(f"Error during generation: {str(e)}. Using template-based approach.")
-            return self._generate_template_itinerary(destination, budget, num_people, num_days, interests)
+            metrics.inc('fallbacks_total', reason='error')
+            notifier.warning(f"Error during generation: {str(e)}. Using template-based approach.")
+            result = self._generate_template_itinerary(destination, budget, num_people, num_days, interests)
+        self.result_cache.set(fingerprint, Itinerary.from_dict(result), ttl=self.template_cache_ttl)
+        return result
+
+    async def agenerate_itinerary(self, destination, budget, num_people, num_days, interests, use_cache=True):
+        """Asyncio variant of ``generate_itinerary`` for callers serving many sessions"""
+        fingerprint = itinerary_fingerprint(destination, budget, num_people, num_days, interests)
+        if use_cache:
+            cached = self.result_cache.get(fingerprint)
+            metrics.inc('itinerary_cache_total', result='miss' if cached is None else 'hit')
+            if cached is not None:
+                return _for_caller(cached.to_dict(), destination)
+
+        name = canonical_destination(destination)
+        if self.hf_api_key:
+            ai_result = await self._try_huggingface_api_async(name, budget, num_people, num_days, interests)
+            if ai_result:
+                self.result_cache.set(fingerprint, Itinerary.from_dict(ai_result), ttl=self.ai_cache_ttl)
+                return _for_caller(ai_result, destination)
+        metrics.inc('fallbacks_total', reason='api_error' if self.hf_api_key else 'no_api_key')
+        notifier.info("Using template-based itinerary generation...")
+        result = self._generate_template_itinerary(name, budget, num_people, num_days, interests)
+        self.result_cache.set(fingerprint, Itinerary.from_dict(result), ttl=self.template_cache_ttl)
+        return _for_caller(result, destination)
+
+    @profiled('stream_itinerary')
+    def stream_itinerary(self, destination, budget, num_people, num_days, interests, use_cache=True):
+        """Yield ParseEvents as the itinerary is generated, then ``ParseEvent('done', None, itinerary)``
+
+        With a Hugging Face key, tokens are streamed from the API and each day,
+        food item and tip is emitted as soon as it is complete. Cached plans and
+        template plans are replayed as events so callers render them the same way.
+        Identical requests streamed concurrently share one generation: later
+        callers wait for the first one's plan and replay it. If the AI stream
+        fails after days were emitted, ``ParseEvent('reset', None, None)`` tells
+        the caller to discard them before the template plan is replayed.
+        """
+        fingerprint = itinerary_fingerprint(destination, budget, num_people, num_days, interests)
+        cached = self.result_cache.get(fingerprint) if use_cache else None
+        if use_cache:
+            metrics.inc('itinerary_cache_total', result='miss' if cached is None else 'hit')
+        if cached is not None:
+            result = cached.to_dict()
+            yield from self._replay_events(result)
+            yield ParseEvent('done', None, _for_caller(result, destination))
+            return
+
+        while True:
+            future, leader = self.single_flight.acquire(fingerprint)
+            if leader:
+                break
+            try:
+                result = copy.deepcopy(future.result())
+            except Exception:
+                continue  # The leader's stream was closed before it finished; take over
+            yield from self._replay_events(result)
+            yield ParseEvent('done', None, _for_caller(result, destination))
+            return
+
+        result = None
+        try:
+            # Built under the canonical name so the cached plan suits every caller sharing its fingerprint
+            result = yield from self._stream_and_cache(
+                fingerprint, canonical_destination(destination), budget, num_people, num_days, interests
+            )
+        finally:
+            if result is None:
+                self.single_flight.release(fingerprint, error=RuntimeError("Itinerary stream closed early"))
+            else:
+                self.single_flight.release(fingerprint, result)
+        yield ParseEvent('done', None, _for_caller(result, destination))
+
+    def _stream_and_cache(self, fingerprint, destination, budget, num_people, num_days, interests):
+        """Yield the events of a fresh generation and return the finished plan"""
+        emitted = False
+        reason = 'no_api_key'
+        if self.hf_api_key:
+            reason = 'api_error'
+            parser = IncrementalItineraryParser()
+            try:
+                prompt = self._create_prompt(destination, budget, num_people, num_days, interests)
+                for event in metrics.timed_iter('hf_stream', self._stream_events(prompt, parser, destination)):
+                    emitted = True
+                    yield event
+                generated_text = parser.text
+                if len(generated_text.strip()) > 50:
+                    result = self._parse_itinerary_response(
+                        generated_text, destination, budget, num_people, num_days, interests, parser=parser
+                    )
+                    if not emitted:
+                        # Nothing matched the day/food/tip structure; show the fallbacks instead
+                        yield from self._replay_events(result)
+                    self.result_cache.set(fingerprint, Itinerary.from_dict(result), ttl=self.ai_cache_ttl)
+                    return result
+            except HuggingFaceError as e:
+                if emitted:
+                    notifier.warning(f"{e}. The itinerary may be incomplete.")
+                    return self._parse_itinerary_response(
+                        parser.text, destination, budget, num_people, num_days, interests, parser=parser
+                    )
+                notifier.warning(f"{e}. Using template generation.")
+            except Exception as e:
+                reason = 'error'
+                notifier.warning(f"Error during generation: {str(e)}. Using template-based approach.")
+
+        metrics.inc('fallbacks_total', reason=reason)
+        notifier.info("Using template-based itinerary generation...")
+        result = self._generate_template_itinerary(destination, budget, num_people, num_days, interests)
+        self.result_cache.set(fingerprint, Itinerary.from_dict(result), ttl=self.template_cache_ttl)
+        if emitted:
+            # Days from the failed AI stream were already shown; the template plan replaces them
+            yield ParseEvent('reset', None, None)
+        yield from self._replay_events(result)
+        return result
+
+    def _stream_events(self, prompt, parser, destination):
+        """Parse the API token stream into ParseEvents as the tokens arrive"""
+        for chunk in self.hf_client.stream(prompt, HF_GENERATION_PARAMETERS):
+            for event in parser.feed(chunk):
+                if event.kind == 'day':
+                    self._add_nearby_restaurants(destination, event.value)
+                yield event
+        for event in parser.close():
+            if event.kind == 'day':
+                self._add_nearby_restaurants(destination, event.value)
+            yield event
+
+    def _replay_events(self, itinerary_data):
+        for day, activities in itinerary_data.get('daily_plan', {}).items():
+            yield ParseEvent('day', day, activities)
+        for food_item in itinerary_data.get('food_recommendations', []):
+            yield ParseEvent('food', None, food_item)
+        for tip in itinerary_data.get('travel_tips', []):
+            yield ParseEvent('tip', None, tip)
 
     def _try_huggingface_api(self, destination, budget, num_people, num_days, interests):
         try:
             prompt = self._create_prompt(destination, budget, num_people, num_days, interests)
-            payload = {
-                "inputs": prompt,
-                "parameters": {
-                    "max_length": 1000,
-                    "temperature": 0.7,
-                    "do_sample": True
-                }
-            }
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=30)
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    generated_text = result[0].get('generated_text', '')
-                    if generated_text and len(generated_text.strip()) > 50:
-                        return self._parse_itinerary_response(generated_text, destination, budget, num_people, num_days, interests)
-            elif response.status_code == 401:
-                st.error("Invalid Hugging Face API key. Please check your configuration.")
-            elif response.status_code == 503:
-                st.warning("AI model is loading. Using template generation for now.")
-            else:
-                st.warning(f"API returned status {response.status_code}. Using template generation.")
-        except requests.RequestException as e:
-            st.warning(f"Network error: {str(e)}. Using template generation.")
+            generated_text = self.hf_client.generate(prompt, HF_GENERATION_PARAMETERS)
+            if generated_text and len(generated_text.strip()) > 50:
+                return self._parse_itinerary_response(generated_text, destination, budget, num_people, num_days, interests)
+        except HuggingFaceError as e:
+            self._notify_api_error(e)
+        except Exception as e:
+            notifier.warning(f"API error: {str(e)}. Using template generation.")
+        return None
+
+    async def _try_huggingface_api_async(self, destination, budget, num_people, num_days, interests):
+        """Asyncio variant of ``_try_huggingface_api``, reporting failures the same way"""
+        try:
+            prompt = self._create_prompt(destination, budget, num_people, num_days, interests)
+            generated_text = await self.hf_client.agenerate(prompt, HF_GENERATION_PARAMETERS)
+            if generated_text and len(generated_text.strip()) > 50:
+                return self._parse_itinerary_response(generated_text, destination, budget, num_people, num_days, interests)
+        except HuggingFaceError as e:
+            self._notify_api_error(e)
         except Exception as e:
-            st.warning(f"API error: {str(e)}. Using template generation.")
+            notifier.warning(f"API error: {str(e)}. Using template generation.")
         return None
 
+    def _notify_api_error(self, e):
+        """Tell whoever is listening why the AI result is being replaced by a template"""
+        if isinstance(e, HuggingFaceAuthError):
+            notifier.error("Invalid Hugging Face API key. Please check your configuration.")
+        elif isinstance(e, HuggingFaceUnavailableError) and e.status_code == 503:
+            notifier.warning("AI model is loading. Using template generation for now.")
+        elif isinstance(e, HuggingFaceTimeoutError):
+            notifier.warning(f"AI model did not respond in time after {e.attempts} attempt(s). Using template generation.")
+        else:
+            notifier.warning(f"{e}. Using template generation.")
+
+    @metrics.timed('create_prompt')
     def _create_prompt(self, destination, budget, num_people, num_days, interests):
         budget_range = parse_budget_range(budget)
         interests_text = format_interests(interests)
         prompt = f"""Create a detailed {num_days}-day travel itinerary for {destination} for {num_people} people with a {budget} budget.\n\nTraveler interests: {interests_text}\n\nPlease provide:\n1. Day-by-day itinerary with specific places to visit\n2. Recommended local food and restaurants\n3. Estimated costs for activities\n4. Travel tips specific to {destination}\n5. Best times to visit each location\n\nFormat the response as a structured plan with clear daily schedules, including:\n- Morning, afternoon, and evening activities\n- Specific restaurant recommendations with cuisine types\n- Estimated costs per person\n- Transportation suggestions between locations\n- Cultural etiquette tips\n\nBudget range: {budget_range} per person per day\nDuration: {num_days} days\nGroup size: {num_people} people\nDestination: {destination}\n"""
         return prompt
 
-    def _parse_itinerary_response(self, generated_text, destination, budget, num_people, num_days, interests):
+    @metrics.timed('parse_response')
+    def _parse_itinerary_response(self, generated_text, destination, budget, num_people, num_days, interests, parser=None):
         try:
+            if parser is None:
+                parser = IncrementalItineraryParser()
+                parser.feed(generated_text)
+                parser.close()
             itinerary_data = {
                 'destination': destination,
                 'budget': budget,
@@ -68,46 +275,23 @@ class TravelPlanner:
                 'num_days': num_days,
                 'interests': interests,
                 'raw_response': generated_text,
-                'daily_plan': {},
-                'food_recommendations': [],
-                'travel_tips': []
+                'daily_plan': parser.daily_plan,
+                'food_recommendations': parser.food_recommendations,
+                'travel_tips': parser.travel_tips
             }
-            lines = generated_text.split('\n')
-            current_day = None
-            current_section = None
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                if any(day_word in line.lower() for day_word in ['day 1', 'day 2', 'day 3', 'day one', 'day two', 'day three']):
-                    current_day = line
-                    itinerary_data['daily_plan'][current_day] = []
-                    current_section = 'daily'
-                elif any(food_word in line.lower() for food_word in ['food', 'restaurant', 'cuisine', 'dining']):
-                    current_section = 'food'
-                elif any(tip_word in line.lower() for tip_word in ['tip', 'advice', 'recommendation', 'note']):
-                    current_section = 'tips'
-                elif current_section == 'daily' and current_day:
-                    if line.startswith('-') or line.startswith('•') or line.startswith('*'):
-                        activity = self._parse_activity(line)
-                        itinerary_data['daily_plan'][current_day].append(activity)
-                elif current_section == 'food':
-                    if line.startswith('-') or line.startswith('•') or line.startswith('*'):
-                        food_item = self._parse_food_item(line)
-                        itinerary_data['food_recommendations'].append(food_item)
-                elif current_section == 'tips':
-                    if line.startswith('-') or line.startswith('•') or line.startswith('*'):
-                        tip = line.lstrip('-•* ').strip()
-                        itinerary_data['travel_tips'].append(tip)
             if not itinerary_data['daily_plan']:
                 itinerary_data['daily_plan'] = self._create_basic_daily_plan(generated_text, num_days)
+            for activities in itinerary_data['daily_plan'].values():
+                self._add_nearby_restaurants(destination, activities)
             if not itinerary_data['food_recommendations']:
-                itinerary_data['food_recommendations'] = self._extract_food_recommendations(generated_text, destination)
+                itinerary_data['food_recommendations'] = self._extract_food_recommendations(
+                    generated_text, destination, lines=parser.food_lines
+                )
             if not itinerary_data['travel_tips']:
-                itinerary_data['travel_tips'] = self._extract_travel_tips(generated_text)
+                itinerary_data['travel_tips'] = self._extract_travel_tips(generated_text, lines=parser.tip_lines)
             return itinerary_data
         except Exception as e:
-            st.error(f"Error parsing itinerary response: {str(e)}")
+            notifier.error(f"Error parsing itinerary response: {str(e)}")
             return {
                 'destination': destination,
                 'budget': budget,
@@ -121,32 +305,10 @@ class TravelPlanner:
             }
 
     def _parse_activity(self, line):
-        activity = {
-            'name': line.lstrip('-•* ').strip(),
-            'time': 'Flexible timing',
-            'description': 'Activity details from AI recommendation',
-            'estimated_cost': 'Varies'
-        }
-        if ':' in line and any(time_word in line.lower() for time_word in ['morning', 'afternoon', 'evening', 'am', 'pm']):
-            parts = line.split(':')
-            if len(parts) >= 2:
-                activity['time'] = parts[0].lstrip('-•* ').strip()
-                activity['name'] = parts[1].strip()
-        return activity
+        return parse_activity(line)
 
     def _parse_food_item(self, line):
-        food_item = {
-            'name': line.lstrip('-•* ').strip(),
-            'description': 'Local specialty dish',
-            'price_range': 'Moderate',
-            'restaurant': None
-        }
-        if '@' in line or 'at ' in line.lower():
-            parts = line.split('@') if '@' in line else line.split(' at ')
-            if len(parts) >= 2:
-                food_item['name'] = parts[0].lstrip('-•* ').strip()
-                food_item['restaurant'] = parts[1].strip()
-        return food_item
+        return parse_food_item(line)
 
     def _create_basic_daily_plan(self, text, num_days):
         daily_plan = {}
@@ -162,19 +324,18 @@ class TravelPlanner:
             ]
         return daily_plan
 
-    def _extract_food_recommendations(self, text, destination):
-        food_keywords = ['food', 'restaurant', 'dish', 'cuisine', 'eat', 'dining', 'meal']
-        food_recommendations = []
-        lines = text.split('\n')
-        for line in lines:
-            if any(keyword in line.lower() for keyword in food_keywords):
-                if line.strip() and not line.strip().startswith('#'):
-                    food_recommendations.append({
-                        'name': line.strip()[:50] + ('...' if len(line.strip()) > 50 else ''),
-                        'description': f'Local {destination} specialty',
-                        'price_range': 'Moderate',
-                        'restaurant': 'Various locations'
-                    })
+    def _extract_food_recommendations(self, text, destination, lines=None):
+        if lines is None:
+            lines = _matching_lines(text, FALLBACK_FOOD)
+        food_recommendations = [
+            {
+                'name': line[:50] + ('...' if len(line) > 50 else ''),
+                'description': f'Local {destination} specialty',
+                'price_range': 'Moderate',
+                'restaurant': 'Various locations'
+            }
+            for line in lines[:5]
+        ]
         if not food_recommendations:
             food_recommendations = [
                 {
@@ -184,16 +345,12 @@ class TravelPlanner:
                     'restaurant': 'Local restaurants'
                 }
             ]
-        return food_recommendations[:5]
-
-    def _extract_travel_tips(self, text):
-        tip_keywords = ['tip', 'advice', 'remember', 'important', 'note', 'recommend']
-        tips = []
-        lines = text.split('\n')
-        for line in lines:
-            if any(keyword in line.lower() for keyword in tip_keywords):
-                if line.strip() and not line.strip().startswith('#'):
-                    tips.append(line.strip())
+        return food_recommendations
+
+    def _extract_travel_tips(self, text, lines=None):
+        if lines is None:
+            lines = _matching_lines(text, FALLBACK_TIP)
+        tips = list(lines[:5])
         if not tips:
             tips = [
                 'Check local weather conditions before your trip',
@@ -201,12 +358,14 @@ class TravelPlanner:
                 'Keep copies of important documents',
                 'Research local customs and etiquette'
             ]
-        return tips[:5]
+        return tips
 
+    @metrics.timed('template_itinerary')
     def _generate_template_itinerary(self, destination, budget, num_people, num_days, interests):
         from utils import create_fallback_itinerary
         base_itinerary = create_fallback_itinerary(destination, num_days, interests)
         landmarks_data = get_landmarks_for_destination(destination)
+        landmark_days = self._group_landmarks_by_day(landmarks_data.get('landmarks', ()) if landmarks_data else (), num_days)
         enhanced_daily_plan = {}
         for day_num in range(1, num_days + 1):
             day_key = f"Day {day_num}"
@@ -227,7 +386,7 @@ class TravelPlanner:
                             'description': f'{first_landmark["description"]} - {first_landmark["type"]}',
                             'specific_places': [first_landmark["name"]],
                             'food_items': first_landmark["famous_foods"],
-                            'nearby_restaurants': first_landmark["nearby_food_spots"],
+                            'nearby_restaurants': self._nearby_restaurants(first_landmark),
                             'estimated_cost': '$15-40'
                         }
                     ]
@@ -262,20 +421,24 @@ class TravelPlanner:
                     }
                 ]
             else:
-                if landmarks_data and landmarks_data.get('landmarks') and len(landmarks_data['landmarks']) > day_num - 1:
-                    landmark = landmarks_data['landmarks'][day_num - 1]
-                    landmark_activity = {
-                        'name': f'Explore {landmark["name"]}',
-                        'time': 'Morning',
-                        'description': f'{landmark["description"]} - Experience this {landmark["type"].lower()} and discover its cultural significance.',
-                        'specific_places': [landmark["name"]],
-                        'food_items': landmark["famous_foods"],
-                        'nearby_restaurants': landmark["nearby_food_spots"],
-                        'estimated_cost': '$20-60'
-                    }
-                    afternoon_activity = self._get_interest_activity(destination, interests, 'afternoon')
-                    evening_activity = self._get_interest_activity(destination, interests, 'evening')
-                    activities = [landmark_activity, afternoon_activity, evening_activity]
+                day_landmarks = landmark_days.get(day_num)
+                if day_landmarks:
+                    activities = [
+                        {
+                            'name': f'Explore {landmark["name"]}',
+                            'time': slot.title(),
+                            'description': f'{landmark["description"]} - Experience this {landmark["type"].lower()} and discover its cultural significance.',
+                            'specific_places': [landmark["name"]],
+                            'food_items': landmark["famous_foods"],
+                            'nearby_restaurants': self._nearby_restaurants(landmark),
+                            'estimated_cost': '$20-60'
+                        }
+                        for slot, landmark in zip(DAY_SLOTS, day_landmarks)
+                    ]
+                    activities += [
+                        self._get_interest_activity(destination, interests, slot)
+                        for slot in DAY_SLOTS[len(day_landmarks):]
+                    ]
                 else:
                     morning_activity = self._get_interest_activity(destination, interests, 'morning')
                     afternoon_activity = self._get_interest_activity(destination, interests, 'afternoon')
@@ -296,6 +459,71 @@ class TravelPlanner:
             'total_estimated_cost': self._estimate_trip_cost(budget, num_people, num_days)
         }
 
+    def _group_landmarks_by_day(self, landmarks, num_days):
+        """Map each sightseeing day (2 .. num_days - 1) to the landmarks to visit that day
+
+        Day 1 keeps the headline landmark for the arrival afternoon and the last
+        day is left for departure. The next landmarks in catalog order, up to
+        one per time slot of each sightseeing day, are split into balanced
+        groups of nearby places, and the groups are ordered into a short route
+        from the headline landmark. Landmarks without coordinates go to the
+        days with the fewest landmarks.
+        """
+        sightseeing_days = list(range(2, num_days))
+        candidates = list(landmarks[1:1 + len(DAY_SLOTS) * len(sightseeing_days)])
+        if not candidates:
+            return {}
+        located = [landmark for landmark in candidates if landmark.get('coordinates')]
+        groups = []
+        if located:
+            from day_clustering import balanced_kmeans, cluster_centroids
+            from route_optimizer import optimize_order
+            coords = [landmark['coordinates'] for landmark in located]
+            k = min(len(sightseeing_days), len(located))
+            labels = balanced_kmeans(coords, k)
+            start = landmarks[0].get('coordinates')
+            day_order, _, _ = optimize_order(cluster_centroids(coords, labels, k), start=start)
+            for cluster in day_order:
+                members = [i for i, label in enumerate(labels) if label == cluster]
+                member_order, _, _ = optimize_order([coords[i] for i in members])
+                groups.append([located[members[i]] for i in member_order])
+        groups += [[] for _ in range(len(sightseeing_days) - len(groups))]
+        for landmark in candidates:
+            if not landmark.get('coordinates'):
+                min(groups, key=len).append(landmark)
+        return {day_num: group for day_num, group in zip(sightseeing_days, groups) if group}
+
+    def _nearby_restaurants(self, landmark):
+        """Catalog eating places nearest a landmark, falling back to its static ``nearby_food_spots``"""
+        if landmark.get('coordinates'):
+            from food_places import food_place_index
+            latitude, longitude = landmark['coordinates']
+            found = food_place_index().within(
+                latitude, longitude, NEARBY_RESTAURANT_RADIUS_M, limit=NEARBY_RESTAURANT_LIMIT
+            )
+            if found:
+                return [place.name for _, place in found]
+        return list(landmark.get('nearby_food_spots', ()))
+
+    def _add_nearby_restaurants(self, destination, activities):
+        """Fill ``nearby_restaurants`` on AI activities that mention a catalog landmark"""
+        landmarks_data = get_landmarks_for_destination(destination)
+        landmarks = [
+            (normalize_location(landmark['name']), landmark)
+            for landmark in (landmarks_data.get('landmarks', ()) if landmarks_data else ())
+        ]
+        for activity in activities:
+            if activity.get('nearby_restaurants'):
+                continue
+            text = normalize_location(' '.join([activity.get('name', ''), *(activity.get('specific_places') or [])]))
+            for key, landmark in landmarks:
+                if key and key in text:
+                    restaurants = self._nearby_restaurants(landmark)
+                    if restaurants:
+                        activity['nearby_restaurants'] = restaurants
+                    break
+        return activities
+
     def _get_interest_activity(self, destination, interests, time_of_day):
         # Simplified for brevity; you can expand this as needed
         default_activities = {
@@ -370,11 +598,38 @@ class TravelPlanner:
         return tips[:8]
 
     def _estimate_trip_cost(self, budget, num_people, num_days):
-        daily_estimates = {
-            'Budget ($0-$50/day)': 35,
-            'Mid-range ($50-$150/day)': 100,
-            'Luxury ($150+/day)': 200
-        }
-        daily_cost = daily_estimates.get(budget, 100)
-        total = daily_cost * num_people * num_days
-        return f"${total:,} - ${int(total * 1.2):,}"
+        return format_range(estimate_range(budget, num_people, num_days))
+
+
+def _matching_lines(text, category):
+    """Stripped, non-heading lines of text containing a keyword of ``category`` (at most FALLBACK_LIMIT)"""
+    lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and not line.startswith('#') and classify_keywords(line.lower()) & category:
+            lines.append(line)
+            if len(lines) == FALLBACK_LIMIT:
+                break
+    return lines
+
+
+def itinerary_fingerprint(destination, budget, num_people, num_days, interests):
+    """Canonical cache key for an itinerary request
+
+    Catalog aliases of a destination, interest order and the exact budget
+    label don't change the generated plan, so they don't change the key either.
+    Plans are generated under ``canonical_destination``, which is the first
+    part of the key, so every caller sharing a key gets the same text.
+    """
+    return (
+        canonical_destination(destination),
+        budget_tier(budget),
+        int(num_people),
+        int(num_days),
+        tuple(sorted(set(interests or ()))),
+    )
+
+
+def _for_caller(itinerary_data, destination):
+    """A plan built under the canonical name, labelled with the destination this caller asked for"""
+    return dict(itinerary_data, destination=destination)
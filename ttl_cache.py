@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+
+# The caches share one ``ttl`` convention: seconds to keep an entry, ``None`` to keep it until
+# it is evicted, and ``0`` not to cache it at all. ``USE_DEFAULT`` picks the cache's own ttl.
+USE_DEFAULT = object()
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a per-entry TTL
+
+    ``ttl=None`` keeps entries until they are evicted; ``ttl=0`` caches nothing.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key``, or ``default`` if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                del self._entries[key]
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+            return default
+
+    def set(self, key, value, ttl=USE_DEFAULT):
+        """Store a value; ``ttl`` overrides the default (``None`` never expires, ``0`` skips caching)"""
+        if ttl is USE_DEFAULT:
+            ttl = self.ttl
+        if (ttl is not None and ttl <= 0) or self.max_entries <= 0:
+            return
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
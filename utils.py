@@ -1,3 +1,10 @@
+def normalize_location(location_name):
+    """Normalize a location string so equivalent spellings share a lookup key"""
+    if not location_name:
+        return ""
+    cleaned = location_name.replace(",", " , ")
+    return " ".join(cleaned.casefold().split()).replace(" ,", ",").strip(" ,")
+
 def parse_budget_range(budget_selection):
     """Parse budget selection into a readable format"""
     
@@ -9,6 +16,15 @@ def parse_budget_range(budget_selection):
     
     return budget_mapping.get(budget_selection, budget_selection)
 
+def budget_tier(budget_selection):
+    """Map a budget selection to its tier name ('budget', 'mid-range' or 'luxury')"""
+    
+    selection = (budget_selection or "").lower()
+    for tier in ("budget", "mid-range", "luxury"):
+        if selection.startswith(tier):
+            return tier
+    return selection.strip() or "mid-range"
+
 def format_interests(interests_list):
     """Format interests list into readable text"""
     
@@ -39,18 +55,11 @@ def format_interests(interests_list):
         return ", ".join(formatted_interests[:-1]) + ", and " + formatted_interests[-1]
 
 def estimate_total_cost(daily_activities, budget_range, num_people, num_days):
-    """Estimate total trip cost based on activities and budget"""
-    
-    budget_values = {
-        "Budget ($0-$50/day)": 35,
-        "Mid-range ($50-$150/day)": 100,
-        "Luxury ($150+/day)": 200
-    }
+    """Estimate total trip cost from the budget tier (same figure as the planner's estimate)"""
     
-    daily_budget = budget_values.get(budget_range, 100)
-    total_cost = daily_budget * num_people * num_days
+    from cost_engine import estimate_range, format_range
     
-    return f"${total_cost:,} - ${int(total_cost * 1.3):,}"
+    return format_range(estimate_range(budget_range, num_people, num_days))
 
 def validate_user_inputs(destination, interests, num_days, num_people):
     """Validate user inputs and return error messages if any"""